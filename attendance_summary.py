@@ -0,0 +1,104 @@
+import argparse
+from datetime import date
+
+from sqlalchemy import case, delete, func, insert, select, update
+from sqlalchemy.exc import IntegrityError
+
+import sql_models
+
+# Attendance status value -> summary column
+STATUS_COLUMNS = {
+    sql_models.AttendanceStatus.PRESENT.value: "present",
+    sql_models.AttendanceStatus.ABSENT.value: "absent",
+    sql_models.AttendanceStatus.LATE.value: "late",
+    sql_models.AttendanceStatus.EXCUSED.value: "excused",
+}
+
+def count_changes(*changes):
+    """
+    Turn (status, delta) pairs into per-column deltas, e.g.
+    count_changes((old_status, -1), (new_status, +1))
+    """
+    deltas = {}
+    for status, delta in changes:
+        column = STATUS_COLUMNS[status.value]
+        deltas[column] = deltas.get(column, 0) + delta
+    return {column: delta for column, delta in deltas.items() if delta}
+
+def apply_counts(db, class_id, day, deltas):
+    """
+    Add per-column deltas to the summary row of a class and day.
+    Runs in the caller's transaction so it commits or rolls back together
+    with the attendance write.
+    """
+    if not deltas:
+        return
+
+    summary = sql_models.Attendance_Summary.__table__
+    where = (summary.c.class_id == class_id, summary.c.date == day)
+    # Relative UPDATE so concurrent writers never overwrite each other
+    increment = update(summary).where(*where).values(
+        {column: summary.c[column] + delta for column, delta in deltas.items()}
+    )
+    if db.execute(increment).rowcount:
+        return
+
+    row = {"class_id": class_id, "date": day, "present": 0, "absent": 0, "late": 0, "excused": 0}
+    row.update(deltas)
+    try:
+        # Savepoint, so losing an insert race does not abort the transaction
+        with db.begin_nested():
+            db.execute(insert(summary).values(row))
+    except IntegrityError:
+        db.execute(increment)
+
+def rebuild(db, date_from=None, date_to=None):
+    """
+    Recompute summaries from the raw attendance table with one
+    INSERT ... SELECT ... GROUP BY, optionally limited to a date range
+    """
+    summary = sql_models.Attendance_Summary.__table__
+    attendance = sql_models.Attendance
+
+    conditions = []
+    summary_conditions = []
+    if date_from:
+        conditions.append(attendance.date >= date_from)
+        summary_conditions.append(summary.c.date >= date_from)
+    if date_to:
+        conditions.append(attendance.date <= date_to)
+        summary_conditions.append(summary.c.date <= date_to)
+
+    def status_count(status):
+        return func.sum(case((attendance.status == status, 1), else_=0))
+
+    grouped = select(
+        attendance.class_id,
+        attendance.date,
+        status_count(sql_models.AttendanceStatus.PRESENT),
+        status_count(sql_models.AttendanceStatus.ABSENT),
+        status_count(sql_models.AttendanceStatus.LATE),
+        status_count(sql_models.AttendanceStatus.EXCUSED),
+    ).where(*conditions).group_by(attendance.class_id, attendance.date)
+
+    db.execute(delete(summary).where(*summary_conditions))
+    result = db.execute(insert(summary).from_select(
+        ["class_id", "date", "present", "absent", "late", "excused"], grouped
+    ))
+    return result.rowcount
+
+if __name__ == "__main__":
+    from database import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Rebuild attendance summaries from raw attendance rows")
+    parser.add_argument("--from", dest="date_from", type=date.fromisoformat)
+    parser.add_argument("--to", dest="date_to", type=date.fromisoformat)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        rows = rebuild(db, args.date_from, args.date_to)
+        db.commit()
+        print(f"Rebuilt {rows} attendance summary rows")
+    finally:
+        db.close()
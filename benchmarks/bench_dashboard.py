@@ -0,0 +1,96 @@
+"""
+Compare /dashboard/stats latency: seven COUNT queries, single query (cold),
+cached (warm) and right after a write invalidated the cache.
+
+    DATABASE_URL=sqlite:///bench_dashboard.db python benchmarks/bench_dashboard.py [--students 10000]
+
+Requires httpx (for the FastAPI test client).
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+import uuid
+from datetime import date, datetime, timedelta
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///bench_dashboard.db")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient
+
+import sql_models
+from database import engine, SessionLocal
+from bench_indexes import populate
+from main import app, dashboard_cache
+
+def seven_counts(db):
+    today = date.today()
+    return {
+        "total_students": db.query(sql_models.Student).count(),
+        "total_teachers": db.query(sql_models.Teacher).count(),
+        "total_classes": db.query(sql_models.Class).count(),
+        "total_subjects": db.query(sql_models.Subject).count(),
+        "pending_leaves": db.query(sql_models.Leave_Application).filter(
+            sql_models.Leave_Application.status == sql_models.LeaveStatus.PENDING
+        ).count(),
+        "assignments_due_today": db.query(sql_models.Assignment).filter(
+            sql_models.Assignment.dueDate >= datetime.combine(today, datetime.min.time()),
+            sql_models.Assignment.dueDate < datetime.combine(today + timedelta(days=1), datetime.min.time())
+        ).count(),
+        "lost_items": db.query(sql_models.Lost_and_Found).filter(
+            sql_models.Lost_and_Found.status == sql_models.ItemStatus.LOST
+        ).count(),
+    }
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+def main():
+    parser = argparse.ArgumentParser(description="Dashboard stats latency")
+    parser.add_argument("--students", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    sql_models.Base.metadata.drop_all(bind=engine)
+    sql_models.Base.metadata.create_all(bind=engine)
+    populate(engine, args.students, 1)
+
+    client = TestClient(app)
+    db = SessionLocal()
+
+    def cold():
+        dashboard_cache.clear()
+        client.get("/dashboard/stats")
+
+    def invalidated():
+        # A committed write to a counted table drops the cached figures
+        db.add(sql_models.Subject(subject_id=str(uuid.uuid4()), name="Bench", code=str(uuid.uuid4())[:12]))
+        db.commit()
+        started = time.perf_counter()
+        client.get("/dashboard/stats")
+        return (time.perf_counter() - started) * 1000
+
+    client.get("/dashboard/stats")
+    results = {
+        "seven COUNT queries (old)": timed(lambda: seven_counts(db), args.repeat),
+        "single query, cold": timed(cold, args.repeat),
+        "cached, warm": timed(lambda: client.get("/dashboard/stats"), args.repeat),
+        "after invalidation": [invalidated() for _ in range(args.repeat)],
+    }
+    db.close()
+
+    print(f"{'case':<28}{'p50 ms':>10}{'p99 ms':>10}")
+    for name, samples in results.items():
+        ordered = sorted(samples)
+        p99 = ordered[min(len(ordered) - 1, int(0.99 * len(ordered)))]
+        print(f"{name:<28}{statistics.median(samples):>10.3f}{p99:>10.3f}")
+    print("\nThe old query path is timed directly on a session; the other rows include HTTP handling.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""
+Benchmark the hot-path lookups with and without the secondary indexes.
+
+Builds a synthetic school (10k students, 2M attendance rows by default) in a
+scratch database, times the lookups used by create_attendance, create_student,
+create_grade, get_class_attendance_by_date and /dashboard/stats, then applies
+the index migration and times them again.
+
+    python benchmarks/bench_indexes.py [--url sqlite:///bench_indexes.db] [--students 10000] [--days 200]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+import uuid
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import MetaData, create_engine, insert, select, func
+
+import sql_models
+from migrate import add_missing_indexes
+
+CLASS_SIZE = 40
+EXAMS_PER_CLASS = 8
+INSERT_CHUNK = 50000
+
+def _ids(n):
+    return [str(uuid.uuid4()) for _ in range(n)]
+
+def _insert_chunked(conn, table, rows):
+    for start in range(0, len(rows), INSERT_CHUNK):
+        conn.execute(insert(table), rows[start:start + INSERT_CHUNK])
+
+def create_unindexed_schema(engine):
+    """
+    Create the tables without their secondary indexes, as before the index
+    migration. Nothing is dropped: on MySQL an index that backs a foreign
+    key cannot be, and InnoDB gives tables created this way their own
+    foreign key indexes, like the old schema had.
+    """
+    metadata = MetaData()
+    for table in sql_models.Base.metadata.sorted_tables:
+        table.to_metadata(metadata).indexes.clear()
+    metadata.create_all(bind=engine)
+
+def populate(engine, n_students, n_days):
+    start_day = date(2024, 6, 1)
+    n_classes = max(1, n_students // CLASS_SIZE)
+    teacher_ids = _ids(n_classes)
+    class_ids = _ids(n_classes)
+    student_ids = _ids(n_students)
+
+    with engine.begin() as conn:
+        _insert_chunked(conn, sql_models.Teacher.__table__, [
+            dict(teacher_id=t, name=f"Teacher {i}", gender=sql_models.Gender.FEMALE, phone=900000000 + i,
+                 email=f"teacher{i}@school.test", status=sql_models.Status.ACTIVE, address="-",
+                 password_hash="-", date_of_birth=date(1980, 1, 1))
+            for i, t in enumerate(teacher_ids)
+        ])
+        _insert_chunked(conn, sql_models.Class.__table__, [
+            dict(class_id=c, class_number=i // 26 + 1, section=chr(65 + i % 26), class_teacher_id=teacher_ids[i])
+            for i, c in enumerate(class_ids)
+        ])
+        _insert_chunked(conn, sql_models.Student.__table__, [
+            dict(student_id=s, name=f"Student {i}", class_id=class_ids[i % n_classes], roll_no=i // n_classes + 1,
+                 gender=sql_models.Gender.MALE, phone=800000000 + i, email=f"student{i}@school.test",
+                 status=sql_models.StudentStatus.ACTIVE, address="-", password_hash="-",
+                 date_of_birth=date(2010, 1, 1))
+            for i, s in enumerate(student_ids)
+        ])
+
+        statuses = list(sql_models.AttendanceStatus)
+        for day in range(n_days):
+            current = start_day + timedelta(days=day)
+            _insert_chunked(conn, sql_models.Attendance.__table__, [
+                dict(attendance_id=str(uuid.uuid4()), class_id=class_ids[i % n_classes], student_id=s,
+                     date=current, status=random.choice(statuses))
+                for i, s in enumerate(student_ids)
+            ])
+
+        subject_ids = _ids(EXAMS_PER_CLASS)
+        _insert_chunked(conn, sql_models.Subject.__table__, [
+            dict(subject_id=subject, name=f"Subject {k}", code=f"SUB{k}") for k, subject in enumerate(subject_ids)
+        ])
+        exam_ids = _ids(n_classes * EXAMS_PER_CLASS)
+        _insert_chunked(conn, sql_models.Exams.__table__, [
+            dict(exam_id=exam_ids[c * EXAMS_PER_CLASS + k], class_id=class_ids[c], subject_id=subject_ids[k],
+                 date=start_day, name=f"Exam {k}", total_marks=100)
+            for c in range(n_classes) for k in range(EXAMS_PER_CLASS)
+        ])
+        _insert_chunked(conn, sql_models.Grade.__table__, [
+            dict(grades_id=str(uuid.uuid4()), student_id=s, exam_id=exam_ids[(i % n_classes) * EXAMS_PER_CLASS + k],
+                 marks=50.0, grade="B")
+            for i, s in enumerate(student_ids) for k in range(EXAMS_PER_CLASS)
+        ])
+        _insert_chunked(conn, sql_models.Leave_Application.__table__, [
+            dict(leave_id=str(uuid.uuid4()), student_id=random.choice(student_ids), title="Leave",
+                 type=sql_models.LeaveType.SICK, start_date=start_day, end_date=start_day,
+                 status=random.choice(list(sql_models.LeaveStatus)), applied_at=datetime.now())
+            for _ in range(n_students * 2)
+        ])
+
+    return {
+        "class_ids": class_ids,
+        "student_ids": student_ids,
+        "exam_ids": exam_ids,
+        "days": [start_day + timedelta(days=d) for d in range(n_days)],
+    }
+
+def lookups(data):
+    A = sql_models.Attendance
+    S = sql_models.Student
+    G = sql_models.Grade
+    L = sql_models.Leave_Application
+    AS = sql_models.Assignment
+    today = datetime.combine(date.today(), datetime.min.time())
+    return {
+        "attendance duplicate check (student_id, date)": lambda: select(A.attendance_id).where(
+            A.student_id == random.choice(data["student_ids"]), A.date == random.choice(data["days"])).limit(1),
+        "class attendance by date (class_id, date)": lambda: select(A.attendance_id).where(
+            A.class_id == random.choice(data["class_ids"]), A.date == random.choice(data["days"])),
+        "roll number check (class_id, roll_no)": lambda: select(S.student_id).where(
+            S.class_id == random.choice(data["class_ids"]), S.roll_no == random.randint(1, CLASS_SIZE)).limit(1),
+        "grade duplicate check (student_id, exam_id)": lambda: select(G.grades_id).where(
+            G.student_id == random.choice(data["student_ids"]), G.exam_id == random.choice(data["exam_ids"])).limit(1),
+        "pending leaves count (status)": lambda: select(func.count()).select_from(L).where(
+            L.status == sql_models.LeaveStatus.PENDING),
+        "assignments due today (dueDate)": lambda: select(func.count()).select_from(AS).where(
+            AS.dueDate >= today, AS.dueDate < today + timedelta(days=1)),
+    }
+
+def time_lookups(engine, data, repeat):
+    results = {}
+    with engine.connect() as conn:
+        for name, build in lookups(data).items():
+            started = time.perf_counter()
+            for _ in range(repeat):
+                conn.execute(build()).all()
+            results[name] = (time.perf_counter() - started) / repeat * 1000
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--url", default="sqlite:///bench_indexes.db")
+    parser.add_argument("--students", type=int, default=10000)
+    parser.add_argument("--days", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    engine = create_engine(args.url)
+    sql_models.Base.metadata.drop_all(bind=engine)
+    create_unindexed_schema(engine)
+
+    print(f"Populating {args.students} students, {args.students * args.days} attendance rows...")
+    started = time.perf_counter()
+    data = populate(engine, args.students, args.days)
+    print(f"  done in {time.perf_counter() - started:.1f}s")
+
+    before = time_lookups(engine, data, args.repeat)
+    started = time.perf_counter()
+    created = add_missing_indexes(engine)
+    print(f"Created {len(created)} indexes in {time.perf_counter() - started:.1f}s")
+    after = time_lookups(engine, data, args.repeat)
+
+    print(f"\n{'lookup':<48}{'no index (ms)':>15}{'indexed (ms)':>15}{'speedup':>10}")
+    for name in before:
+        print(f"{name:<48}{before[name]:>15.3f}{after[name]:>15.3f}{before[name] / max(after[name], 1e-6):>9.0f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+CPU per request for 10k-row /students/filter and /attendance/filter
+responses: the default path (ORM rows, response_model validation and
+FastAPI's encoder) against FAST_JSON_RESPONSES (column select encoded
+straight to bytes with orjson, or TypeAdapter.dump_json without it).
+
+    python benchmarks/bench_json_encoding.py [--rows 10000] [--repeat 20]
+
+Requires httpx (for the FastAPI test client).
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///bench_json_encoding.db")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient
+
+import projection
+import sql_models
+from database import engine
+from bench_indexes import populate
+from main import app
+
+def cpu_per_request(client, path, repeat):
+    samples = []
+    for _ in range(repeat):
+        # process_time covers the test client's server thread as well
+        started = time.process_time()
+        response = client.post(path)
+        samples.append((time.process_time() - started) * 1000)
+        assert response.status_code == 200, response.text
+    return statistics.median(samples), len(response.content)
+
+def main():
+    parser = argparse.ArgumentParser(description="JSON encoding cost of large filter responses")
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    sql_models.Base.metadata.drop_all(bind=engine)
+    sql_models.Base.metadata.create_all(bind=engine)
+    # One day of attendance gives as many attendance rows as students
+    populate(engine, args.rows, 1)
+
+    client = TestClient(app)
+    print(f"{'endpoint':<22}{'default ms':>12}{'fast ms':>10}{'saved':>8}{'KiB':>8}")
+    for path in ("/students/filter", "/attendance/filter"):
+        projection.FAST_JSON_RESPONSES = False
+        client.post(path)
+        default, size = cpu_per_request(client, path, args.repeat)
+        projection.FAST_JSON_RESPONSES = True
+        client.post(path)
+        fast, _ = cpu_per_request(client, path, args.repeat)
+        print(f"{path:<22}{default:>12.1f}{fast:>10.1f}{1 - fast / default:>8.0%}{size / 1024:>8.0f}")
+    print("\nMedian CPU time per request, end to end: query, row loading and encoding.")
+
+if __name__ == "__main__":
+    main()
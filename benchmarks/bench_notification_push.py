@@ -0,0 +1,91 @@
+"""
+Measure notification push fan-out on the in-process broker: memory held by
+idle subscribers (one consumer task each, as /notifications/stream runs)
+and the latency from publish, called from a worker thread like
+create_notification, until every subscriber has the message.
+
+    python benchmarks/bench_notification_push.py [--subscribers 10000] [--messages 50]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import threading
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from notification_push import LocalBroker
+
+CLASS_SIZE = 40
+
+async def run(n_subscribers, n_messages):
+    broker = LocalBroker()
+    n_classes = max(1, n_subscribers // CLASS_SIZE)
+    received = []
+    done = asyncio.Event()
+    expected = 0
+
+    async def consume(subscription):
+        nonlocal expected
+        while True:
+            message = await subscription.get()
+            received.append(time.perf_counter() - message[0])
+            expected -= 1
+            if expected == 0:
+                done.set()
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    tasks = []
+    for i in range(n_subscribers):
+        subscription = broker.subscribe({"All", "Students", f"class:{i % n_classes}"})
+        tasks.append(asyncio.create_task(consume(subscription)))
+    await asyncio.sleep(0.1)
+    per_subscriber = (tracemalloc.get_traced_memory()[0] - before) / n_subscribers
+    tracemalloc.stop()
+
+    results = {}
+    for name, topic, audience in [("everyone", "All", n_subscribers), ("one class", "class:0", CLASS_SIZE)]:
+        totals = []
+        received.clear()
+        for _ in range(n_messages):
+            expected = min(audience, n_subscribers)
+            done.clear()
+            started = time.perf_counter()
+            # Publish from another thread, like the sync create_notification endpoint
+            publisher = threading.Thread(target=broker.publish, args=(topic, (started, "event")))
+            publisher.start()
+            await done.wait()
+            totals.append((time.perf_counter() - started) * 1000)
+            publisher.join()
+        results[f"{name}: last subscriber"] = totals
+        results[f"{name}: each delivery"] = [seconds * 1000 for seconds in received]
+
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    return per_subscriber, broker.stats(), results
+
+def main():
+    parser = argparse.ArgumentParser(description="Notification push fan-out")
+    parser.add_argument("--subscribers", type=int, default=10000)
+    parser.add_argument("--messages", type=int, default=50)
+    args = parser.parse_args()
+
+    per_subscriber, stats, results = asyncio.run(run(args.subscribers, args.messages))
+
+    print(f"{args.subscribers} idle subscribers, {per_subscriber / 1024:.1f} KiB each "
+          f"({per_subscriber * args.subscribers / 2 ** 20:.1f} MiB in total, Python heap only)")
+    print(f"broker: {stats}\n")
+    print(f"{'case':<32}{'p50 ms':>10}{'p99 ms':>10}")
+    for name, samples in results.items():
+        ordered = sorted(samples)
+        p99 = ordered[min(len(ordered) - 1, int(0.99 * len(ordered)))]
+        print(f"{name:<32}{statistics.median(samples):>10.3f}{p99:>10.3f}")
+    print("\nSocket writes and SSE framing are not included; the HTTP server adds them per connection.")
+
+if __name__ == "__main__":
+    main()
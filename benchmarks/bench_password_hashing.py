@@ -0,0 +1,95 @@
+"""
+Measure GET /timetable latency while teacher signups hash passwords.
+
+Runs against a live server. First it samples GET /timetable/class/{class_id}
+on its own, then again while --signups concurrent POST /teachers requests run,
+and prints p50/p99 for both phases. With hashing on the process pool the two
+phases should stay close; with inline bcrypt the p99 under signups climbs by
+hundreds of milliseconds.
+
+    uvicorn main:app --port 5000
+    python benchmarks/bench_password_hashing.py --class-id <class_id> [--base-url http://localhost:5000]
+
+Requires httpx.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+from collections import Counter
+
+import httpx
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+async def sample_gets(client, url, duration, concurrency):
+    latencies = []
+    deadline = time.perf_counter() + duration
+
+    async def worker():
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            await client.get(url)
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies
+
+async def run_signups(client, stop, concurrency):
+    # Responses by status code; only 201 is a completed signup
+    statuses = Counter()
+
+    async def worker():
+        while not stop.is_set():
+            response = await client.post("/teachers", json={
+                "name": "Bench Teacher",
+                "gender": "F",
+                # 10 digits that still fit the INT phone column
+                "phone": 1234567890,
+                "email": f"bench-{uuid.uuid4()}@school.test",
+                "address": "-",
+                "password": "correct horse battery staple",
+                "date_of_birth": "1985-01-01",
+            })
+            statuses[response.status_code] += 1
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return statuses
+
+def report(name, latencies):
+    print(f"{name:<22}{len(latencies):>8}{statistics.median(latencies):>10.1f}{percentile(latencies, 99):>10.1f}")
+
+async def main():
+    parser = argparse.ArgumentParser(description="GET latency under concurrent password hashing")
+    parser.add_argument("--base-url", default="http://localhost:5000")
+    parser.add_argument("--class-id", required=True)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--signups", type=int, default=16)
+    args = parser.parse_args()
+
+    url = f"/timetable/class/{args.class_id}"
+    limits = httpx.Limits(max_connections=args.readers + args.signups)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=60) as client:
+        idle = await sample_gets(client, url, args.duration, args.readers)
+
+        stop = asyncio.Event()
+        signups = asyncio.create_task(run_signups(client, stop, args.signups))
+        loaded = await sample_gets(client, url, args.duration, args.readers)
+        stop.set()
+        statuses = await signups
+
+        metrics = (await client.get("/metrics/password-hashing")).json()
+
+    print(f"{'phase':<22}{'requests':>8}{'p50 ms':>10}{'p99 ms':>10}")
+    report("GET idle", idle)
+    report("GET during signups", loaded)
+    rejected = {status: count for status, count in statuses.items() if status != 201}
+    print(f"\n{statuses[201]} signups completed, rejected by status: {rejected}; hashing pool: {metrics}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
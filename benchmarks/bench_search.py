@@ -0,0 +1,160 @@
+"""
+Compare name search latency at 50k people: the ILIKE '%...%' scan of the
+list filters, typeahead by ILIKE and from the trigram index, and the
+global /search box over all indexes. Also reports the index build
+time and the cost of one incremental update.
+
+    DATABASE_URL=sqlite:///bench_search.db python benchmarks/bench_search.py [--students 48000] [--teachers 2000]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+import uuid
+from datetime import date
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///bench_search.db")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import insert
+
+import sql_models
+import search_index
+from database import engine, SessionLocal
+
+# Synthetic names built from syllables: a few thousand first names and
+# surnames, so like a real school most full names are unique
+SYLLABLES = [
+    "a", "an", "ar", "be", "bi", "da", "de", "di", "el", "en", "fa", "ga", "ha", "ir", "ja", "ka", "ki",
+    "la", "li", "ma", "me", "mi", "na", "ni", "no", "or", "pa", "ra", "re", "ri", "ro", "sa", "se", "sha",
+    "si", "ta", "te", "ti", "va", "vi", "ya", "za", "zö",
+]
+
+def _names(count, syllables):
+    names = set()
+    while len(names) < count:
+        names.add("".join(random.choice(SYLLABLES) for _ in range(syllables)).capitalize())
+    return sorted(names)
+
+random.seed(7)
+FIRST_NAMES = _names(2000, 3)
+LAST_NAMES = _names(5000, 4)
+ITEMS = ["water bottle", "lunch box", "jacket", "calculator", "pencil case", "library book", "scarf", "umbrella"]
+COLOURS = ["blue", "red", "green", "black", "yellow", "grey"]
+CLASS_SIZE = 40
+INSERT_CHUNK = 10000
+
+def _person(i, domain):
+    first, last = random.choice(FIRST_NAMES), random.choice(LAST_NAMES)
+    return f"{first} {last}", f"{first.lower()}.{last.lower()}{i}@{domain}"
+
+def populate(n_students, n_teachers):
+    teacher_ids = [str(uuid.uuid4()) for _ in range(max(1, n_teachers))]
+    class_ids = [str(uuid.uuid4()) for _ in range(max(1, n_students // CLASS_SIZE))]
+    admin_id = str(uuid.uuid4())
+    with engine.begin() as conn:
+        teachers = []
+        for i, teacher_id in enumerate(teacher_ids):
+            name, email = _person(i, "staff.school.test")
+            teachers.append(dict(teacher_id=teacher_id, name=name, gender=sql_models.Gender.FEMALE, phone=9000000000 + i,
+                                 email=email, status=sql_models.Status.ACTIVE, address="-", password_hash="-",
+                                 date_of_birth=date(1980, 1, 1)))
+        conn.execute(insert(sql_models.Teacher.__table__), teachers)
+        conn.execute(insert(sql_models.Class.__table__), [
+            dict(class_id=class_id, class_number=i // 26 + 1, section=chr(65 + i % 26),
+                 class_teacher_id=teacher_ids[i % len(teacher_ids)])
+            for i, class_id in enumerate(class_ids)
+        ])
+        conn.execute(insert(sql_models.Admin.__table__), [
+            dict(admin_id=admin_id, name="Admin", gender=sql_models.Gender.FEMALE, phone=7000000000,
+                 email="admin@school.test", status=sql_models.Status.ACTIVE, address="-", password_hash="-",
+                 date_of_birth=date(1980, 1, 1))
+        ])
+        conn.execute(insert(sql_models.Lost_and_Found.__table__), [
+            dict(unique_id=str(uuid.uuid4()), admin_id=admin_id,
+                 item_name=f"{random.choice(COLOURS)} {random.choice(ITEMS)}".capitalize(),
+                 description=f"Found near room {random.randint(1, 300)}", location="Office",
+                 status=sql_models.ItemStatus.LOST)
+            for _ in range(1000)
+        ])
+        students = []
+        for i in range(n_students):
+            name, email = _person(i, "school.test")
+            students.append(dict(student_id=str(uuid.uuid4()), name=name, class_id=class_ids[i % len(class_ids)],
+                                 roll_no=i // len(class_ids) + 1,
+                                 gender=sql_models.Gender.MALE, phone=8000000000 + i, email=email,
+                                 status=sql_models.StudentStatus.ACTIVE, address="-", password_hash="-",
+                                 date_of_birth=date(2010, 1, 1)))
+        for start in range(0, len(students), INSERT_CHUNK):
+            conn.execute(insert(sql_models.Student.__table__), students[start:start + INSERT_CHUNK])
+
+def timed(fn, inputs):
+    samples = []
+    for value in inputs:
+        started = time.perf_counter()
+        fn(value)
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+def main():
+    parser = argparse.ArgumentParser(description="Name search latency")
+    parser.add_argument("--students", type=int, default=48000)
+    parser.add_argument("--teachers", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    sql_models.Base.metadata.drop_all(bind=engine)
+    sql_models.Base.metadata.create_all(bind=engine)
+    populate(args.students, args.teachers)
+
+    db = SessionLocal()
+    student = sql_models.Student
+    people = [name for name, in db.query(student.name).limit(5000)]
+    # Part of a surname, and a whole "first last" name
+    filters = [random.choice(people).split()[1][1:6] for _ in range(args.repeat // 2)]
+    filters += [random.choice(people) for _ in range(args.repeat // 2)]
+    # What has been typed so far: 1 to 8 characters of a name
+    typed = [random.choice(people)[:random.randint(1, 8)] for _ in range(args.repeat)]
+
+    started = time.perf_counter()
+    search_index.build_all()
+    build_ms = (time.perf_counter() - started) * 1000
+
+    def ilike_scan(text):
+        db.query(student).filter(student.name.ilike(f"%{text}%")).all()
+
+    def ilike_typeahead(text):
+        db.query(student.student_id, student.name).filter(student.name.ilike(f"%{text}%")).limit(10).all()
+
+    def typeahead(text):
+        search_index.students.search(db, text, 10)
+
+    def omnibox(text):
+        search_index.search_all(db, text, 10)
+
+    def update(i):
+        search_index.students.upsert(f"bench-{i}", _person(i, "school.test"))
+
+    results = {
+        "filter, ILIKE scan": timed(ilike_scan, filters),
+        "typeahead, ILIKE LIMIT 10": timed(ilike_typeahead, typed),
+        "typeahead, index": timed(typeahead, typed),
+        "global /search, all indexes": timed(omnibox, typed + ["blue", "10-c", "calc", "room 12"]),
+        "incremental update": timed(update, range(args.repeat)),
+    }
+    stats = search_index.students.stats()
+    db.close()
+
+    print(f"All indexes built in {build_ms:.0f} ms "
+          f"({stats['documents']} student documents, {stats['trigrams']} trigrams)\n")
+    print(f"{'case':<30}{'p50 ms':>10}{'p99 ms':>10}")
+    for name, samples in results.items():
+        ordered = sorted(samples)
+        p99 = ordered[min(len(ordered) - 1, int(0.99 * len(ordered)))]
+        print(f"{name:<30}{statistics.median(samples):>10.3f}{p99:>10.3f}")
+    print("\nTypeahead via ILIKE returns the first 10 matches unranked; the index ranks every match.")
+
+if __name__ == "__main__":
+    main()
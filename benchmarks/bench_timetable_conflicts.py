@@ -0,0 +1,144 @@
+"""
+Benchmark timetable conflict checks against a full school timetable.
+
+Builds a synthetic school (200 classes, 8 subjects each, 8 periods a day,
+5 days by default) and times the old check (load every slot of the class and
+day, compare in Python) against the SQL overlap query, which also covers
+teacher double-booking, with and without the (day, start_time) index.
+
+    python benchmarks/bench_timetable_conflicts.py [--url sqlite:///bench_timetable.db] [--classes 200]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+import uuid
+from datetime import date, time as dtime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+
+import sql_models
+from scheduling import find_conflict
+
+SUBJECTS = 8
+PERIODS = 8
+DAYS = list(sql_models.DayOfWeek)[:5]
+TEACHER_LOAD = 5  # classes taught per teacher and subject
+
+def _ids(n):
+    return [str(uuid.uuid4()) for _ in range(n)]
+
+def period_times(period):
+    return dtime(8 + period), dtime(8 + period, 45)
+
+def populate_timetable(engine, n_classes):
+    """
+    Classes with SUBJECTS subjects each, every subject taught by a teacher
+    shared across TEACHER_LOAD classes, and a conflict-free week of periods
+    """
+    n_teachers = SUBJECTS * -(-n_classes // TEACHER_LOAD)
+    teacher_ids = _ids(n_teachers)
+    class_ids = _ids(n_classes)
+    subject_ids = _ids(SUBJECTS)
+
+    class_subjects = []
+    for c, class_id in enumerate(class_ids):
+        for s, subject_id in enumerate(subject_ids):
+            class_subjects.append(dict(
+                class_sub_id=str(uuid.uuid4()), class_id=class_id, subject_id=subject_id,
+                subject_teacher_id=teacher_ids[(c // TEACHER_LOAD) * SUBJECTS + s]
+            ))
+
+    # Rotate periods per class so teachers shared by TEACHER_LOAD classes never clash
+    slots = []
+    for c in range(n_classes):
+        for d, day in enumerate(DAYS):
+            for period in range(PERIODS):
+                start, end = period_times(period)
+                row = class_subjects[c * SUBJECTS + (period + c + d) % SUBJECTS]
+                slots.append(dict(timetable_id=str(uuid.uuid4()), class_sub_id=row["class_sub_id"],
+                                  day=day, start_time=start, end_time=end))
+
+    with engine.begin() as conn:
+        conn.execute(insert(sql_models.Teacher.__table__), [
+            dict(teacher_id=t, name=f"Teacher {i}", gender=sql_models.Gender.FEMALE, phone=9000000000 + i,
+                 email=f"teacher{i}@school.test", status=sql_models.Status.ACTIVE, address="-",
+                 password_hash="-", date_of_birth=date(1980, 1, 1))
+            for i, t in enumerate(teacher_ids)
+        ])
+        conn.execute(insert(sql_models.Class.__table__), [
+            dict(class_id=c, class_number=i // 26 + 1, section=chr(65 + i % 26), class_teacher_id=teacher_ids[i])
+            for i, c in enumerate(class_ids)
+        ])
+        conn.execute(insert(sql_models.Subject.__table__), [
+            dict(subject_id=s, name=f"Subject {i}", code=f"SUB{i}") for i, s in enumerate(subject_ids)
+        ])
+        conn.execute(insert(sql_models.Class_Subject.__table__), class_subjects)
+        conn.execute(insert(sql_models.Timetable.__table__), slots)
+    return class_subjects
+
+def old_check(db, class_id, day, start_time, end_time):
+    slots = db.query(sql_models.Timetable).join(
+        sql_models.Class_Subject, sql_models.Class_Subject.class_sub_id == sql_models.Timetable.class_sub_id
+    ).filter(
+        sql_models.Class_Subject.class_id == class_id,
+        sql_models.Timetable.day == day
+    ).all()
+    for slot in slots:
+        if ((start_time >= slot.start_time and start_time < slot.end_time) or
+            (end_time > slot.start_time and end_time <= slot.end_time) or
+            (start_time <= slot.start_time and end_time >= slot.end_time)):
+            return slot
+    return None
+
+def time_checks(engine, class_subjects, repeat):
+    probes = []
+    for _ in range(repeat):
+        row = random.choice(class_subjects)
+        start, end = period_times(random.randrange(PERIODS))
+        probes.append((row, random.choice(DAYS), start, end))
+
+    results = {}
+    with Session(engine) as db:
+        started = time.perf_counter()
+        for row, day, start, end in probes:
+            old_check(db, row["class_id"], day, start, end)
+            db.expunge_all()
+        results["old: class slots in Python"] = (time.perf_counter() - started) / repeat * 1000
+
+        started = time.perf_counter()
+        for row, day, start, end in probes:
+            find_conflict(db, row["class_id"], row["subject_teacher_id"], day, start, end)
+        results["new: SQL overlap, class + teacher"] = (time.perf_counter() - started) / repeat * 1000
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--url", default="sqlite:///bench_timetable.db")
+    parser.add_argument("--classes", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=500)
+    args = parser.parse_args()
+
+    engine = create_engine(args.url)
+    sql_models.Base.metadata.drop_all(bind=engine)
+    sql_models.Base.metadata.create_all(bind=engine)
+    index = next(i for i in sql_models.Timetable.__table__.indexes if i.name == "ix_timetables_day_start")
+    index.drop(bind=engine)
+
+    class_subjects = populate_timetable(engine, args.classes)
+    print(f"{args.classes} classes, {args.classes * len(DAYS) * PERIODS} timetable slots")
+
+    before = time_checks(engine, class_subjects, args.repeat)
+    index.create(bind=engine)
+    after = time_checks(engine, class_subjects, args.repeat)
+
+    print(f"\n{'check':<38}{'no index (ms)':>15}{'indexed (ms)':>15}")
+    for name in before:
+        print(f"{name:<38}{before[name]:>15.3f}{after[name]:>15.3f}")
+
+if __name__ == "__main__":
+    main()
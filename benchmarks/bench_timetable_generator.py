@@ -0,0 +1,90 @@
+"""
+Benchmark the weekly timetable solver on synthetic schools.
+
+Each school has classes with 8 subjects, teachers shared between classes and
+a 5 day x 8 period grid. "full" schools book every period of every class,
+"constrained" ones add blocked teacher slots and daily limits. Every solution
+is checked for class and teacher clashes.
+
+    python benchmarks/bench_timetable_generator.py [--repeat 3]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scheduling import solve_timetable, ScheduleError
+
+DAYS = 5
+PERIODS = 8
+FULL_WEEK = [6, 6, 5, 5, 5, 5, 4, 4]
+LIGHT_WEEK = [5, 5, 5, 4, 4, 4, 4, 3]
+
+# name, classes, teachers, periods per subject, constrained
+SCHOOLS = [
+    ("small, light", 20, 30, LIGHT_WEEK, False),
+    ("small, full", 20, 28, FULL_WEEK, False),
+    ("60 classes / 80 teachers, light", 60, 80, LIGHT_WEEK, False),
+    ("60 classes / 80 teachers, full", 60, 80, FULL_WEEK, False),
+    ("60 classes / 80 teachers, constrained", 60, 80, LIGHT_WEEK, True),
+    ("120 classes / 160 teachers, full", 120, 160, FULL_WEEK, False),
+]
+
+def build_school(n_classes, n_teachers, week, constrained, rng):
+    lessons = [
+        ((c, s), c, (c * len(week) + s) % n_teachers, periods)
+        for c in range(n_classes) for s, periods in enumerate(week)
+    ]
+    options = {}
+    if constrained:
+        # A quarter of the teachers are away two periods a week; everyone teaches at most 7 a day
+        options["teacher_blocked"] = {
+            t: rng.sample([(d, p) for d in range(DAYS) for p in range(PERIODS)], 2)
+            for t in rng.sample(range(n_teachers), n_teachers // 4)
+        }
+        options["teacher_max_per_day"] = {t: 7 for t in range(n_teachers)}
+        options["max_subject_per_day"] = 2
+    return lessons, options
+
+def check(lessons, options, solution):
+    taken = set()
+    blocked = options.get("teacher_blocked", {})
+    for key, class_id, teacher_id, periods in lessons:
+        slots = solution[key]
+        assert len(slots) == periods, f"{key} got {len(slots)} of {periods} periods"
+        for slot in slots:
+            assert ("class", class_id, slot) not in taken, f"class {class_id} clash at {slot}"
+            assert ("teacher", teacher_id, slot) not in taken, f"teacher {teacher_id} clash at {slot}"
+            assert slot not in blocked.get(teacher_id, ()), f"teacher {teacher_id} blocked at {slot}"
+            taken.add(("class", class_id, slot))
+            taken.add(("teacher", teacher_id, slot))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'school':<40}{'periods':>9}{'median s':>10}{'max s':>8}{'solved':>8}")
+    for name, n_classes, n_teachers, week, constrained in SCHOOLS:
+        samples = []
+        solved = 0
+        for seed in range(args.repeat):
+            lessons, options = build_school(n_classes, n_teachers, week, constrained, random.Random(seed))
+            started = time.perf_counter()
+            try:
+                solution = solve_timetable(DAYS, PERIODS, lessons, **options)
+            except ScheduleError:
+                solution = None
+            samples.append(time.perf_counter() - started)
+            if solution is not None:
+                check(lessons, options, solution)
+                solved += 1
+        print(f"{name:<40}{n_classes * sum(week):>9}{statistics.median(samples):>10.2f}"
+              f"{max(samples):>8.2f}{solved:>5}/{args.repeat}")
+
+if __name__ == "__main__":
+    main()
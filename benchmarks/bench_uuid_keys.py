@@ -0,0 +1,99 @@
+"""
+Attendance insert throughput with random uuid4 CHAR(36) keys (the old
+scheme), time-ordered UUIDv7 CHAR(36) keys and UUIDv7 BINARY(16) keys.
+
+Each scheme gets its own attendance-shaped table (primary key, class and
+student keys, the (student_id, date) index) and is filled in batches; the
+rate is reported per stage so slowdown as the table outgrows the buffer
+pool shows up. Run it against MySQL/InnoDB for representative numbers:
+
+    python benchmarks/bench_uuid_keys.py --url mysql+pymysql://root:@localhost:3306/bench [--rows 2000000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+import uuid
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import BINARY, Column, Date, Index, MetaData, String, Table, create_engine, insert, text
+
+from ids import uuid7
+
+BATCH = 1000
+STAGES = 5
+
+SCHEMES = {
+    "uuid4 CHAR(36)": (String(36), lambda: str(uuid.uuid4())),
+    "uuid7 CHAR(36)": (String(36), lambda: str(uuid7())),
+    "uuid7 BINARY(16)": (BINARY(16), lambda: uuid7().bytes),
+}
+
+def build_table(metadata, name, key_type):
+    return Table(
+        name, metadata,
+        Column("attendance_id", key_type, primary_key=True),
+        Column("class_id", key_type, nullable=False),
+        Column("student_id", key_type, nullable=False),
+        Column("date", Date, nullable=False),
+        Column("status", String(8), nullable=False),
+        Index(f"ix_{name}_student_date", "student_id", "date"),
+    )
+
+def table_size(conn, name):
+    if conn.dialect.name != "mysql":
+        return None
+    row = conn.execute(text(
+        "SELECT data_length, index_length FROM information_schema.tables "
+        "WHERE table_schema = DATABASE() AND table_name = :name"
+    ), {"name": name}).first()
+    return row and (row.data_length + row.index_length) / 2 ** 20
+
+def run(engine, name, key_type, new_key, rows, students):
+    metadata = MetaData()
+    table = build_table(metadata, name, key_type)
+    metadata.drop_all(engine)
+    metadata.create_all(engine)
+
+    class_ids = [new_key() for _ in range(max(1, students // 40))]
+    student_ids = [(new_key(), class_ids[i % len(class_ids)]) for i in range(students)]
+    stage_rows = rows // STAGES
+    rates = []
+    day = date(2024, 6, 1)
+    with engine.connect() as conn:
+        for stage in range(STAGES):
+            started = time.perf_counter()
+            for _ in range(stage_rows // BATCH):
+                batch = []
+                for _ in range(BATCH):
+                    student_id, class_id = random.choice(student_ids)
+                    batch.append({"attendance_id": new_key(), "class_id": class_id, "student_id": student_id,
+                                  "date": day, "status": "Present"})
+                conn.execute(insert(table), batch)
+                conn.commit()
+                day += timedelta(days=1) if random.random() < 0.01 else timedelta()
+            rates.append(stage_rows / (time.perf_counter() - started))
+        size = table_size(conn, name)
+    return rates, size
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--url", default="sqlite:///bench_uuid_keys.db")
+    parser.add_argument("--rows", type=int, default=500000)
+    parser.add_argument("--students", type=int, default=10000)
+    args = parser.parse_args()
+
+    engine = create_engine(args.url)
+    print(f"{args.rows} attendance rows in batches of {BATCH}, rows/s per fifth of the load\n")
+    header = "".join(f"{f'stage {i + 1}':>11}" for i in range(STAGES))
+    print(f"{'scheme':<20}{header}{'size MiB':>10}")
+    for index, (scheme, (key_type, new_key)) in enumerate(SCHEMES.items()):
+        rates, size = run(engine, f"bench_keys_{index}", key_type, new_key, args.rows, args.students)
+        size_text = f"{size:>10.1f}" if size is not None else f"{'-':>10}"
+        print(f"{scheme:<20}{''.join(f'{rate:>11.0f}' for rate in rates)}{size_text}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+import threading
+import time
+from collections import OrderedDict, defaultdict
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+class TTLCache:
+    """
+    Thread-safe in-process cache with per-entry expiry and LRU eviction
+    once maxsize entries are stored
+    """
+    def __init__(self, maxsize=1024, ttl=60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            }
+
+# Write invalidation: callbacks registered per table name run after a
+# session commits a transaction that wrote to that table. ORM flushes and
+# Core insert/update/delete statements run through the session are tracked.
+_table_listeners = defaultdict(list)
+
+def on_tables_changed(*table_names):
+    """
+    Decorator registering a callback for commits touching any of the tables.
+    The callback receives the set of changed table names.
+    """
+    def register(callback):
+        for name in table_names:
+            _table_listeners[name].append(callback)
+        return callback
+    return register
+
+def tables_changed(table_names):
+    callbacks = []
+    for name in table_names:
+        for callback in _table_listeners.get(name, ()):
+            if callback not in callbacks:
+                callbacks.append(callback)
+    for callback in callbacks:
+        callback(set(table_names))
+
+def _pending_tables(session):
+    return session.info.setdefault("changed_tables", set())
+
+@event.listens_for(Session, "after_flush")
+def _track_flush(session, flush_context):
+    tables = _pending_tables(session)
+    for instance in list(session.new) + list(session.dirty) + list(session.deleted):
+        table = getattr(instance, "__table__", None)
+        if table is not None:
+            tables.add(table.name)
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_statement(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        table = getattr(orm_execute_state.statement, "table", None)
+        if table is not None:
+            _pending_tables(orm_execute_state.session).add(table.name)
+
+@event.listens_for(Session, "after_commit")
+def _notify_commit(session):
+    tables = session.info.pop("changed_tables", None)
+    if tables:
+        tables_changed(tables)
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back(session):
+    session.info.pop("changed_tables", None)
@@ -1,17 +1,67 @@
+import os
+
 from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
+from starlette.concurrency import run_in_threadpool
+
+import pool_metrics
 
 # MySQL connection string for XAMPP
 # Default XAMPP MySQL credentials: username="root", password="" (empty)
-# You can adjust these values as needed
-SQLALCHEMY_DATABASE_URL = "mysql+pymysql://root:@localhost:3306/school_sphere"
+# Override with the DATABASE_URL environment variable
+SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL", "mysql+pymysql://root:@localhost:3306/school_sphere")
+
+# Connection pool settings. pool_recycle stays below MySQL's wait_timeout
+# so idle connections are replaced before the server drops them.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 10))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 30))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "1").lower() in ("1", "true", "yes")
+
+# Async engine for the hot read endpoints, switched on with USE_ASYNC_DB=1.
+# Needs an async driver: aiomysql for MySQL, or aiosqlite
+# ("sqlite+aiosqlite:///./test.db") for local testing.
+USE_ASYNC_DB = os.getenv("USE_ASYNC_DB", "0").lower() in ("1", "true", "yes")
+ASYNC_SQLALCHEMY_DATABASE_URL = os.getenv(
+    "ASYNC_DATABASE_URL", "mysql+aiomysql://root:@localhost:3306/school_sphere"
+)
+
+def engine_options(url, pool_class):
+    options = {"pool_pre_ping": DB_POOL_PRE_PING, "pool_recycle": DB_POOL_RECYCLE}
+    # SQLite (used for local testing) keeps its own single-connection pools
+    if not url.startswith("sqlite"):
+        options.update(
+            poolclass=pool_metrics.timed_pool_class(pool_class),
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_timeout=DB_POOL_TIMEOUT,
+        )
+    return options
 
 engine = create_engine(
-    SQLALCHEMY_DATABASE_URL
+    SQLALCHEMY_DATABASE_URL,
+    **engine_options(SQLALCHEMY_DATABASE_URL, QueuePool)
 )
+pool_metrics.instrument(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+async_engine = None
+AsyncSessionLocal = None
+if USE_ASYNC_DB:
+    from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+
+    async_engine = create_async_engine(
+        ASYNC_SQLALCHEMY_DATABASE_URL,
+        **engine_options(ASYNC_SQLALCHEMY_DATABASE_URL, AsyncAdaptedQueuePool)
+    )
+    pool_metrics.instrument(async_engine.sync_engine)
+    AsyncSessionLocal = sessionmaker(
+        async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+    )
+
 Base = declarative_base()
 
 def get_db():
@@ -20,3 +70,27 @@ def get_db():
         yield db
     finally:
         db.close()
+
+async def get_async_db():
+    """
+    Session for async endpoints: an AsyncSession when USE_ASYNC_DB is on,
+    otherwise a regular Session. Run statements through execute() so the
+    endpoint works with either.
+    """
+    if AsyncSessionLocal is not None:
+        async with AsyncSessionLocal() as db:
+            yield db
+    else:
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            await run_in_threadpool(db.close)
+
+async def execute(db, statement):
+    """
+    Execute a statement without blocking the event loop
+    """
+    if AsyncSessionLocal is not None:
+        return await db.execute(statement)
+    return await run_in_threadpool(db.execute, statement)
@@ -0,0 +1,64 @@
+import os
+
+from sqlalchemy import select
+
+import sql_models
+from cache import TTLCache, on_tables_changed
+
+# Referenced rows checked by the write endpoints. They rarely change, so
+# lookups are served from memory; any committed write to a table drops that
+# table's entries, and the TTL bounds staleness from other processes.
+ENTITY_CACHE_TTL = float(os.getenv("ENTITY_CACHE_TTL", 300))
+ENTITY_CACHE_SIZE = int(os.getenv("ENTITY_CACHE_SIZE", 10000))
+
+# Table name -> cached columns, primary key first
+ENTITIES = {
+    "classes": (
+        sql_models.Class.class_id, sql_models.Class.class_number,
+        sql_models.Class.section, sql_models.Class.class_teacher_id
+    ),
+    "subjects": (sql_models.Subject.subject_id, sql_models.Subject.name, sql_models.Subject.code),
+    "teachers": (sql_models.Teacher.teacher_id, sql_models.Teacher.name),
+    "class_subjects": (
+        sql_models.Class_Subject.class_sub_id, sql_models.Class_Subject.class_id,
+        sql_models.Class_Subject.subject_id, sql_models.Class_Subject.subject_teacher_id
+    ),
+}
+
+caches = {table: TTLCache(maxsize=ENTITY_CACHE_SIZE, ttl=ENTITY_CACHE_TTL) for table in ENTITIES}
+
+@on_tables_changed(*ENTITIES)
+def invalidate_entities(tables):
+    for table in tables & caches.keys():
+        caches[table].clear()
+
+def lookup(db, table, key):
+    """
+    Cached row of the entity's key columns, or None if it does not exist.
+    Misses are not cached, so a newly created entity is found right away.
+    """
+    if key is None:
+        return None
+    cache = caches[table]
+    row = cache.get(key)
+    if row is None:
+        columns = ENTITIES[table]
+        row = db.execute(select(*columns).where(columns[0] == key)).first()
+        if row is not None:
+            cache.set(key, row)
+    return row
+
+def get_class(db, class_id):
+    return lookup(db, "classes", class_id)
+
+def get_subject(db, subject_id):
+    return lookup(db, "subjects", subject_id)
+
+def get_teacher(db, teacher_id):
+    return lookup(db, "teachers", teacher_id)
+
+def get_class_subject(db, class_sub_id):
+    return lookup(db, "class_subjects", class_sub_id)
+
+def entity_cache_stats():
+    return {table: cache.stats() for table, cache in caches.items()}
@@ -0,0 +1,92 @@
+import os
+import statistics
+from array import array
+from bisect import bisect_left, bisect_right
+
+from sqlalchemy import select
+
+import sql_models
+from cache import TTLCache
+
+HISTOGRAM_BINS = 10
+
+# Computed analytics per exam_id. Entries are dropped by the grade and exam
+# write endpoints (invalidate), the TTL only bounds staleness from writes
+# made outside the API.
+EXAM_ANALYTICS_CACHE_TTL = float(os.getenv("EXAM_ANALYTICS_CACHE_TTL", 300))
+analytics_cache = TTLCache(maxsize=256, ttl=EXAM_ANALYTICS_CACHE_TTL)
+
+def invalidate(exam_id):
+    analytics_cache.delete(exam_id)
+
+def fetch_marks(db, exam_id):
+    """
+    Load all marks of an exam with one query, as parallel student_id and
+    float arrays
+    """
+    rows = db.execute(
+        select(sql_models.Grade.student_id, sql_models.Grade.marks)
+        .where(sql_models.Grade.exam_id == exam_id)
+    ).all()
+    return [row.student_id for row in rows], array("d", (row.marks for row in rows))
+
+def histogram(marks, total_marks, bins=HISTOGRAM_BINS):
+    """
+    Count marks in equal-width bins over 0..total_marks; the last bin
+    includes total_marks. Without a positive total_marks there is nothing
+    to divide, so all marks go in one bin.
+    """
+    if total_marks <= 0:
+        return [{"lower": 0.0, "upper": float(total_marks), "count": len(marks)}]
+    width = total_marks / bins
+    counts = [0] * bins
+    for mark in marks:
+        counts[min(int(mark / width), bins - 1)] += 1
+    return [
+        {"lower": round(i * width, 2), "upper": round((i + 1) * width, 2), "count": count}
+        for i, count in enumerate(counts)
+    ]
+
+def compute(exam_id, total_marks, student_ids, marks, bins=HISTOGRAM_BINS):
+    """
+    Rank (1 = highest, ties share a rank), percentile rank and summary
+    statistics for one exam. Every student is placed with two binary searches
+    over the sorted marks, so the whole exam is O(n log n).
+    """
+    ordered = sorted(marks)
+    count = len(ordered)
+
+    students = []
+    for student_id, mark in zip(student_ids, marks):
+        below = bisect_left(ordered, mark)
+        equal = bisect_right(ordered, mark) - below
+        students.append({
+            "student_id": student_id,
+            "marks": mark,
+            "rank": count - below - equal + 1,
+            "percentile": round(100 * (below + 0.5 * equal) / count, 2),
+        })
+    students.sort(key=lambda row: (row["rank"], row["student_id"]))
+
+    mean = statistics.fmean(ordered) if count else None
+    return {
+        "exam_id": exam_id,
+        "total_marks": total_marks,
+        "count": count,
+        "mean": round(mean, 2) if count else None,
+        "median": statistics.median(ordered) if count else None,
+        "std_dev": round(statistics.pstdev(ordered, mean), 2) if count else None,
+        "min": ordered[0] if count else None,
+        "max": ordered[-1] if count else None,
+        "mean_percentage": round(100 * mean / total_marks, 2) if count and total_marks > 0 else None,
+        "histogram": histogram(ordered, total_marks, bins),
+        "students": students,
+    }
+
+def exam_analytics(db, exam):
+    result = analytics_cache.get(exam.exam_id)
+    if result is None:
+        student_ids, marks = fetch_marks(db, exam.exam_id)
+        result = compute(exam.exam_id, exam.total_marks, student_ids, marks)
+        analytics_cache.set(exam.exam_id, result)
+    return result
@@ -0,0 +1,63 @@
+import csv
+import io
+import json
+from datetime import date, datetime, time
+
+from database import SessionLocal
+
+# Rows fetched per server-side batch and encoded per response chunk
+EXPORT_BATCH_SIZE = 1000
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+def _encode_value(value):
+    if hasattr(value, "value"):
+        return value.value
+    if isinstance(value, (date, datetime, time)):
+        return value.isoformat()
+    return value
+
+def stream_export(build_query, export_format):
+    """
+    Generator that streams the rows of a column query as NDJSON or CSV.
+
+    build_query receives a session and returns a query selecting plain columns
+    (not ORM entities), so no objects pile up in the identity map. Rows are read
+    with a server-side cursor in batches of EXPORT_BATCH_SIZE and each batch is
+    encoded and yielded as one chunk, keeping memory flat for any range.
+    """
+    # The request-scoped session is closed before a streaming body is sent,
+    # so the export owns a session for as long as the generator runs
+    db = SessionLocal()
+    try:
+        query = build_query(db).yield_per(EXPORT_BATCH_SIZE)
+        names = [column["name"] for column in query.column_descriptions]
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer) if export_format == "csv" else None
+        if writer:
+            writer.writerow(names)
+
+        pending = 0
+        for row in query:
+            values = [_encode_value(value) for value in row]
+            if writer:
+                writer.writerow(values)
+            else:
+                buffer.write(json.dumps(dict(zip(names, values))))
+                buffer.write("\n")
+
+            pending += 1
+            if pending == EXPORT_BATCH_SIZE:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate(0)
+                pending = 0
+
+        if buffer.tell():
+            yield buffer.getvalue()
+    finally:
+        db.close()
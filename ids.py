@@ -0,0 +1,65 @@
+import os
+import threading
+import time
+import uuid
+
+from sqlalchemy import String
+from sqlalchemy.types import BINARY, TypeDecorator
+
+# Store keys as BINARY(16) instead of CHAR(36) text. Changes the schema, so
+# switch it on for new databases, or copy an existing one across with
+# `python migrate.py --copy-from <old database url>`.
+BINARY_UUID_KEYS = os.getenv("BINARY_UUID_KEYS", "0").lower() in ("1", "true", "yes")
+
+_lock = threading.Lock()
+_last_ms = 0
+_counter = 0
+
+def uuid7():
+    """
+    Time-ordered UUID (RFC 9562 version 7): 48-bit millisecond timestamp,
+    a 12-bit counter keeping keys from one process in order within the same
+    millisecond, then 62 random bits
+    """
+    global _last_ms, _counter
+    with _lock:
+        ms = time.time_ns() // 1_000_000
+        if ms > _last_ms:
+            _last_ms = ms
+            _counter = int.from_bytes(os.urandom(2), "big") & 0x7FF
+        else:
+            # Same millisecond (or the clock went back): keep counting
+            _counter += 1
+            if _counter > 0xFFF:
+                _last_ms += 1
+                _counter = 0
+        ms, counter = _last_ms, _counter
+    random_bits = int.from_bytes(os.urandom(8), "big") & ((1 << 62) - 1)
+    return uuid.UUID(int=(ms << 80) | (0x7 << 76) | (counter << 64) | (0b10 << 62) | random_bits)
+
+class UUIDKey(TypeDecorator):
+    """
+    UUID key column that always reads and writes canonical strings, stored
+    as CHAR(36) text or, with BINARY_UUID_KEYS, as 16 raw bytes
+    """
+    impl = String(36)
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if BINARY_UUID_KEYS:
+            return dialect.type_descriptor(BINARY(16))
+        return dialect.type_descriptor(String(36))
+
+    def process_bind_param(self, value, dialect):
+        if value is None or not BINARY_UUID_KEYS:
+            return value
+        try:
+            return uuid.UUID(str(value)).bytes
+        except ValueError:
+            # Not a UUID, so it cannot match any stored key; NULL never compares equal
+            return None
+
+    def process_result_value(self, value, dialect):
+        if value is None or not BINARY_UUID_KEYS:
+            return value
+        return str(uuid.UUID(bytes=bytes(value)))
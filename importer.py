@@ -0,0 +1,226 @@
+import csv
+import os
+import shutil
+import tempfile
+import threading
+import uuid
+from datetime import datetime, timedelta
+
+from pydantic import ValidationError
+from sqlalchemy import tuple_
+
+from database import SessionLocal
+import sql_models
+from models import StudentCreate, TeacherCreate
+from security import hash_passwords
+
+# Rows validated, hashed and inserted together
+IMPORT_BATCH_SIZE = 500
+# Keep the job status small even when a whole file is bad
+MAX_REPORTED_ERRORS = 1000
+# Finished jobs are forgotten this long after they end
+FINISHED_JOB_TTL = timedelta(hours=24)
+
+_jobs = {}
+_jobs_lock = threading.Lock()
+
+def create_job(kind: str) -> dict:
+    job = {
+        "job_id": str(uuid.uuid4()),
+        "kind": kind,
+        "status": "pending",
+        "processed": 0,
+        "created": 0,
+        "failed": 0,
+        "errors": [],
+        "started_at": datetime.now(),
+        "finished_at": None,
+    }
+    with _jobs_lock:
+        expired = datetime.now() - FINISHED_JOB_TTL
+        for job_id in [key for key, old in _jobs.items() if old["finished_at"] and old["finished_at"] < expired]:
+            del _jobs[job_id]
+        _jobs[job["job_id"]] = job
+    return dict(job)
+
+def get_job(job_id: str):
+    with _jobs_lock:
+        job = _jobs.get(job_id)
+        return dict(job, errors=list(job["errors"])) if job else None
+
+def _update_job(job_id: str, **changes):
+    with _jobs_lock:
+        _jobs[job_id].update(changes)
+
+def _record_errors(job_id: str, processed: int, created: int, errors: list):
+    with _jobs_lock:
+        job = _jobs[job_id]
+        job["processed"] += processed
+        job["created"] += created
+        job["failed"] += len(errors)
+        room = MAX_REPORTED_ERRORS - len(job["errors"])
+        if room > 0:
+            job["errors"].extend(errors[:room])
+
+def save_upload(upload) -> str:
+    """
+    Copy an uploaded file to disk so it can be parsed after the request ends
+    """
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".csv") as tmp:
+        shutil.copyfileobj(upload.file, tmp)
+        return tmp.name
+
+def _parse_row(model, row):
+    # Empty cells mean "not given" so model defaults apply
+    data = {key.strip(): value.strip() for key, value in row.items() if key and value and value.strip()}
+    return model(**data)
+
+def _error(line, detail):
+    return {"line": line, "detail": detail}
+
+def _import_student_batch(db, batch, state):
+    errors = []
+    emails = {student.email for _, student in batch}
+    taken_emails = {
+        row.email for row in db.query(sql_models.Student.email).filter(sql_models.Student.email.in_(emails))
+    }
+
+    unknown_classes = {student.class_id for _, student in batch} - state["classes"]
+    if unknown_classes:
+        state["classes"].update(
+            row.class_id for row in db.query(sql_models.Class.class_id).filter(
+                sql_models.Class.class_id.in_(unknown_classes)
+            )
+        )
+
+    pairs = {(student.class_id, student.roll_no) for _, student in batch}
+    taken_rolls = {
+        (row.class_id, row.roll_no) for row in db.query(
+            sql_models.Student.class_id, sql_models.Student.roll_no
+        ).filter(tuple_(sql_models.Student.class_id, sql_models.Student.roll_no).in_(pairs))
+    }
+
+    accepted = []
+    # This batch's emails and rolls; they join state once it is committed
+    claimed = {"emails": set(), "rolls": set()}
+    for line, student in batch:
+        roll = (student.class_id, student.roll_no)
+        if student.email in taken_emails or student.email in state["emails"] or student.email in claimed["emails"]:
+            errors.append(_error(line, "Email already registered"))
+        elif student.class_id not in state["classes"]:
+            errors.append(_error(line, "Class not found"))
+        elif roll in taken_rolls or roll in state["rolls"] or roll in claimed["rolls"]:
+            errors.append(_error(line, "Roll number already exists in this class"))
+        else:
+            claimed["emails"].add(student.email)
+            claimed["rolls"].add(roll)
+            accepted.append(student)
+
+    hashes = hash_passwords([student.password for student in accepted])
+    rows = [
+        {
+            "student_id": sql_models.generate_uuid(),
+            "name": student.name,
+            "class_id": student.class_id,
+            "roll_no": student.roll_no,
+            "gender": sql_models.Gender(student.gender.value),
+            "phone": student.phone,
+            "email": student.email,
+            "status": sql_models.StudentStatus(student.status.value),
+            "profile_pic": student.profile_pic,
+            "address": student.address,
+            "password_hash": password_hash,
+            "date_of_birth": student.date_of_birth,
+            "created_at": datetime.now(),
+        }
+        for student, password_hash in zip(accepted, hashes)
+    ]
+    return sql_models.Student.__table__, rows, errors, claimed
+
+def _import_teacher_batch(db, batch, state):
+    errors = []
+    emails = {teacher.email for _, teacher in batch}
+    taken_emails = {
+        row.email for row in db.query(sql_models.Teacher.email).filter(sql_models.Teacher.email.in_(emails))
+    }
+
+    accepted = []
+    # This batch's emails; they join state once it is committed
+    claimed = {"emails": set()}
+    for line, teacher in batch:
+        if teacher.email in taken_emails or teacher.email in state["emails"] or teacher.email in claimed["emails"]:
+            errors.append(_error(line, "Email already registered"))
+        else:
+            claimed["emails"].add(teacher.email)
+            accepted.append(teacher)
+
+    hashes = hash_passwords([teacher.password for teacher in accepted])
+    rows = [
+        {
+            "teacher_id": sql_models.generate_uuid(),
+            "name": teacher.name,
+            "gender": sql_models.Gender(teacher.gender.value),
+            "phone": teacher.phone,
+            "email": teacher.email,
+            "status": sql_models.Status(teacher.status.value),
+            "profile_pic": teacher.profile_pic,
+            "address": teacher.address,
+            "password_hash": password_hash,
+            "date_of_birth": teacher.date_of_birth,
+            "created_at": datetime.now(),
+        }
+        for teacher, password_hash in zip(accepted, hashes)
+    ]
+    return sql_models.Teacher.__table__, rows, errors, claimed
+
+def _run_import(job_id, path, model, import_batch):
+    _update_job(job_id, status="running")
+    # Emails and (class_id, roll_no) pairs inserted so far from the file, and known classes
+    state = {"emails": set(), "rolls": set(), "classes": set()}
+    db = SessionLocal()
+
+    def flush(batch, parse_errors):
+        table, rows, errors, claimed = import_batch(db, batch, state) if batch else (None, [], [], {})
+        errors = parse_errors + errors
+        if rows:
+            try:
+                # One multi-row INSERT per batch
+                db.execute(table.insert(), rows)
+                db.commit()
+                for key, values in claimed.items():
+                    state[key] |= values
+            except Exception as e:
+                db.rollback()
+                rejected = {error["line"] for error in errors}
+                errors += [
+                    _error(line, f"Failed to insert row: {str(e)}") for line, _ in batch if line not in rejected
+                ]
+                rows = []
+        _record_errors(job_id, len(batch) + len(parse_errors), len(rows), errors)
+
+    try:
+        with open(path, newline="", encoding="utf-8-sig") as handle:
+            batch, parse_errors = [], []
+            # Line 1 is the header
+            for line, row in enumerate(csv.DictReader(handle), start=2):
+                try:
+                    batch.append((line, _parse_row(model, row)))
+                except (ValidationError, TypeError) as e:
+                    parse_errors.append(_error(line, str(e)))
+                if len(batch) + len(parse_errors) >= IMPORT_BATCH_SIZE:
+                    flush(batch, parse_errors)
+                    batch, parse_errors = [], []
+            flush(batch, parse_errors)
+        _update_job(job_id, status="done", finished_at=datetime.now())
+    except Exception as e:
+        _update_job(job_id, status="failed", finished_at=datetime.now())
+        _record_errors(job_id, 0, 0, [_error(None, f"Import aborted: {str(e)}")])
+    finally:
+        db.close()
+        os.remove(path)
+
+def run_student_import(job_id: str, path: str):
+    _run_import(job_id, path, StudentCreate, _import_student_batch)
+
+def run_teacher_import(job_id: str, path: str):
+    _run_import(job_id, path, TeacherCreate, _import_teacher_batch)
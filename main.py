@@ -1,9 +1,20 @@
-from fastapi import FastAPI, Depends, HTTPException, Query, Body
+from fastapi import FastAPI, Depends, HTTPException, Query, Body, BackgroundTasks, File, UploadFile, Request, Header, Response
 from sqlalchemy.orm import Session
-from sqlalchemy import or_, and_
-from database import get_db, engine
+from sqlalchemy import or_, and_, update, bindparam, select, func, case, cast, Integer
+from database import get_db, get_async_db, execute, engine, async_engine, SessionLocal
+from pool_metrics import pool_stats
+from cache import TTLCache, on_tables_changed
+import attendance_summary
+import exam_analytics
+import entity_cache
+import notification_feed
+import notification_push
+import query_profiler
+import search_index
+from response_cache import ResponseCache, response_cache_stats
+from scheduling import find_conflict, conflict_detail, solve_timetable, ScheduleError
 import sql_models
-from typing import List, Optional
+from typing import List, Optional, Union
 from models import (
     # Existing models
     Student as StudentModel, StudentCreate, StudentFilter,
@@ -11,8 +22,10 @@ from models import (
     Class as ClassModel, ClassFilter, ClassCreate,
     Subject as SubjectModel, SubjectFilter, SubjectCreate,
     Attendance as AttendanceModel, AttendanceFilter, AttendanceCreate,
+    AttendanceBulkCreate, BulkResult, ImportJob, AttendanceSummary as AttendanceSummaryModel,
+    AttendanceReport, ExamAnalytics, TimetableGenerate, TimetableGenerateResult, NotificationFeed,
     Exams as ExamsModel, ExamFilter, ExamsCreate,
-    Grade as GradeModel, GradeFilter, GradeCreate,
+    Grade as GradeModel, GradeFilter, GradeCreate, GradeBulkCreate,
     Assignment as AssignmentModel, AssignmentFilter, AssignmentCreate,
     Feedback as FeedbackModel, FeedbackFilter, FeedbackCreate,
     Leave_Application as LeaveApplicationModel, LeaveApplicationFilter, LeaveApplicationCreate,
@@ -30,18 +43,37 @@ from models import (
     # Import enum classes
     ItemStatus, LeaveStatus, Gender, StudentStatus, Status, AttendanceStatus,
     DayOfWeek, AssignmentType, NotificationType, RecipientType, CreatorType,
-    LeaveType, FeedbackType
+    LeaveType, FeedbackType, ExportFormat, SearchEntity, SearchHit,
+    Page
 )
-from passlib.context import CryptContext 
-import uuid
+from pagination import keyset_paginate, decode_cursor, MAX_PAGE_SIZE
+from projection import parse_fields, select_fields, json_response
+from export import stream_export, MEDIA_TYPES
+from fastapi.responses import StreamingResponse
+from security import shutdown_hash_pool, hash_password_async, verify_password_async, hash_pool_stats
+from fastapi.concurrency import run_in_threadpool
+from importer import create_job, get_job, save_upload, run_student_import, run_teacher_import
+import logging
+import os
+import time
 from datetime import datetime, date, timedelta
 
-# Password hashing configuration
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 sql_models.Base.metadata.create_all(bind=engine)
 
+logger = logging.getLogger(__name__)
+
 app = FastAPI(title="SchoolSphere API")
+if query_profiler.QUERY_PROFILER:
+    app.add_middleware(query_profiler.QueryProfilerMiddleware)
+
+@app.on_event("startup")
+def startup():
+    # Build the search indexes now rather than on the first search
+    search_index.build_all()
+
+@app.on_event("shutdown")
+def shutdown():
+    shutdown_hash_pool()
 
 @app.get("/")
 def read_root():
@@ -52,19 +84,11 @@ def read_root():
 def about() -> dict[str, str]:
     return {"message": "This is the about page."}
 
-# Get students with filters
-@app.post("/students/filter", response_model=List[StudentModel])
-def filter_students(
-    filters: Optional[StudentFilter] = None,
-    db: Session = Depends(get_db)
-):
+# Shared filter helpers, used by the filter and export routes
+def apply_student_filters(query, filters: Optional[StudentFilter]):
     """
-    Get students with optional filters.
-    If no filters are provided, returns all students.
+    Apply optional student filters to a query over the students table
     """
-    query = db.query(sql_models.Student)
-    
-    # Apply filters if provided
     if filters:
         if filters.student_id:
             query = query.filter(sql_models.Student.student_id == filters.student_id)
@@ -80,21 +104,97 @@ def filter_students(
             query = query.filter(sql_models.Student.email.ilike(f'%{filters.email}%'))
         if filters.status:
             query = query.filter(sql_models.Student.status == filters.status)
+    return query
+
+def apply_attendance_filters(query, filters: Optional[AttendanceFilter]):
+    """
+    Apply optional attendance filters to a query over the attendances table
+    """
+    if filters:
+        if filters.attendance_id:
+            query = query.filter(sql_models.Attendance.attendance_id == filters.attendance_id)
+        if filters.class_id:
+            query = query.filter(sql_models.Attendance.class_id == filters.class_id)
+        if filters.student_id:
+            query = query.filter(sql_models.Attendance.student_id == filters.student_id)
+        if filters.date:
+            query = query.filter(sql_models.Attendance.date == filters.date)
+        if filters.date_from:
+            query = query.filter(sql_models.Attendance.date >= filters.date_from)
+        if filters.date_to:
+            query = query.filter(sql_models.Attendance.date <= filters.date_to)
+        if filters.status:
+            query = query.filter(sql_models.Attendance.status == filters.status)
+    return query
+
+def apply_grade_filters(query, filters: Optional[GradeFilter]):
+    """
+    Apply optional grade filters to a query over the grades table
+    """
+    if filters:
+        if filters.grades_id:
+            query = query.filter(sql_models.Grade.grades_id == filters.grades_id)
+        if filters.student_id:
+            query = query.filter(sql_models.Grade.student_id == filters.student_id)
+        if filters.exam_id:
+            query = query.filter(sql_models.Grade.exam_id == filters.exam_id)
+        if filters.grade:
+            query = query.filter(sql_models.Grade.grade == filters.grade)
+    return query
+
+# Get students with filters
+@app.post("/students/filter", response_model=Union[List[StudentModel], Page[StudentModel]])
+def filter_students(
+    filters: Optional[StudentFilter] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size, enables cursor pagination"),
+    after: Optional[str] = Query(None, description="next_cursor returned by the previous page"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. name,roll_no,status"),
+    db: Session = Depends(get_db)
+):
+    """
+    Get students with optional filters.
+    If no filters are provided, returns all students.
+    When limit is given, returns a page of students and a next_cursor instead.
+    With fields, only those columns are read and returned.
+    """
+    names = parse_fields(fields, StudentModel)
+    
+    query = db.query(sql_models.Student)
     
-    students = query.all()
-    return students
+    query = apply_student_filters(query, filters)
+    
+    sort_key = [sql_models.Student.student_id]
+    if names:
+        query = select_fields(query, sql_models.Student, names, sort_key)
+    
+    # Cursor pagination is opt-in so existing clients keep getting a plain list
+    if limit:
+        result = keyset_paginate(query, sort_key, limit, after)
+    else:
+        result = query.all()
+    
+    if names:
+        return json_response(StudentModel, result, names)
+    return result
 
 # Add a student route
 @app.post("/students", response_model=StudentModel, status_code=201)
-def create_student(student: StudentCreate, db: Session = Depends(get_db)):
+async def create_student(student: StudentCreate, db: Session = Depends(get_db)):
     """
     Create a new student in the database
     """
+    # bcrypt runs on the process pool; the database work runs in the threadpool.
+    # Rejected requests never reach the hashing step.
+    await run_in_threadpool(_validate_student, student, db)
+    password_hash = await hash_password_async(student.password)
+    return await run_in_threadpool(_insert_student, student, password_hash, db)
+
+def _validate_student(student: StudentCreate, db: Session):
     db_student = db.query(sql_models.Student).filter(sql_models.Student.email == student.email).first()
     if db_student:
         raise HTTPException(status_code=400, detail="Email already registered")
     
-    class_check = db.query(sql_models.Class).filter(sql_models.Class.class_id == student.class_id).first()
+    class_check = entity_cache.get_class(db, student.class_id)
     if not class_check:
         raise HTTPException(status_code=404, detail="Class not found")
     
@@ -105,8 +205,12 @@ def create_student(student: StudentCreate, db: Session = Depends(get_db)):
     if roll_check:
         raise HTTPException(status_code=400, detail="Roll number already exists in this class")
     
+    # Don't hold a pooled connection while the password is hashed
+    db.rollback()
+
+def _insert_student(student: StudentCreate, password_hash: str, db: Session):
     new_student = sql_models.Student(
-        student_id=str(uuid.uuid4()),
+        student_id=sql_models.generate_uuid(),
         name=student.name,
         class_id=student.class_id,
         roll_no=student.roll_no,
@@ -116,7 +220,7 @@ def create_student(student: StudentCreate, db: Session = Depends(get_db)):
         status=student.status,
         profile_pic=student.profile_pic,
         address=student.address,
-        password_hash=pwd_context.hash(student.password),
+        password_hash=password_hash,
         date_of_birth=student.date_of_birth
     )
     
@@ -129,16 +233,48 @@ def create_student(student: StudentCreate, db: Session = Depends(get_db)):
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Failed to create student: {str(e)}")
 
+# Import students from CSV
+@app.post("/students/import", response_model=ImportJob, status_code=202)
+def import_students(background_tasks: BackgroundTasks, file: UploadFile = File(...)):
+    """
+    Import students from a CSV file with a header row of StudentCreate fields.
+    The file is processed in the background in batches: emails, classes and
+    roll numbers are checked per batch, passwords are hashed on a process pool
+    and rows are inserted with multi-row INSERTs. Poll /imports/{job_id} for progress.
+    """
+    path = save_upload(file)
+    job = create_job("students")
+    background_tasks.add_task(run_student_import, job["job_id"], path)
+    return job
+
+# Get import job status
+@app.get("/imports/{job_id}", response_model=ImportJob)
+def get_import_job(job_id: str):
+    """
+    Get progress and row errors of a CSV import
+    """
+    job = get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    return job
+
 # Filter teachers
-@app.post("/teachers/filter", response_model=List[TeacherModel])
+@app.post("/teachers/filter", response_model=Union[List[TeacherModel], Page[TeacherModel]])
 def filter_teachers(
     filters: Optional[TeacherFilter] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size, enables cursor pagination"),
+    after: Optional[str] = Query(None, description="next_cursor returned by the previous page"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. name,roll_no,status"),
     db: Session = Depends(get_db)
 ):
     """
     Get teachers with optional filters.
     If no filters are provided, returns all teachers.
+    When limit is given, returns a page of teachers and a next_cursor instead.
+    With fields, only those columns are read and returned.
     """
+    names = parse_fields(fields, TeacherModel)
+    
     query = db.query(sql_models.Teacher)
     
     # Apply filters if provided
@@ -154,23 +290,45 @@ def filter_teachers(
         if filters.status:
             query = query.filter(sql_models.Teacher.status == filters.status)
     
-    teachers = query.all()
-    return teachers
+    sort_key = [sql_models.Teacher.teacher_id]
+    if names:
+        query = select_fields(query, sql_models.Teacher, names, sort_key)
+    
+    # Cursor pagination is opt-in so existing clients keep getting a plain list
+    if limit:
+        result = keyset_paginate(query, sort_key, limit, after)
+    else:
+        result = query.all()
+    
+    if names:
+        return json_response(TeacherModel, result, names)
+    return result
 
 # Create teacher
 @app.post("/teachers", response_model=TeacherModel, status_code=201)
-def create_teacher(teacher: TeacherCreate, db: Session = Depends(get_db)):
+async def create_teacher(teacher: TeacherCreate, db: Session = Depends(get_db)):
     """
     Create a new teacher in the database
     """
+    # bcrypt runs on the process pool; the database work runs in the threadpool.
+    # Rejected requests never reach the hashing step.
+    await run_in_threadpool(_validate_teacher, teacher, db)
+    password_hash = await hash_password_async(teacher.password)
+    return await run_in_threadpool(_insert_teacher, teacher, password_hash, db)
+
+def _validate_teacher(teacher: TeacherCreate, db: Session):
     # Check if email already exists
     db_teacher = db.query(sql_models.Teacher).filter(sql_models.Teacher.email == teacher.email).first()
     if db_teacher:
         raise HTTPException(status_code=400, detail="Email already registered")
     
+    # Don't hold a pooled connection while the password is hashed
+    db.rollback()
+
+def _insert_teacher(teacher: TeacherCreate, password_hash: str, db: Session):
     # Create new teacher object
     new_teacher = sql_models.Teacher(
-        teacher_id=str(uuid.uuid4()),
+        teacher_id=sql_models.generate_uuid(),
         name=teacher.name,
         gender=teacher.gender,
         phone=teacher.phone,
@@ -178,7 +336,7 @@ def create_teacher(teacher: TeacherCreate, db: Session = Depends(get_db)):
         status=teacher.status,
         profile_pic=teacher.profile_pic,
         address=teacher.address,
-        password_hash=pwd_context.hash(teacher.password),
+        password_hash=password_hash,
         date_of_birth=teacher.date_of_birth
     )
     
@@ -192,15 +350,30 @@ def create_teacher(teacher: TeacherCreate, db: Session = Depends(get_db)):
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Failed to create teacher: {str(e)}")
 
+# Import teachers from CSV
+@app.post("/teachers/import", response_model=ImportJob, status_code=202)
+def import_teachers(background_tasks: BackgroundTasks, file: UploadFile = File(...)):
+    """
+    Import teachers from a CSV file with a header row of TeacherCreate fields.
+    Works like /students/import; poll /imports/{job_id} for progress.
+    """
+    path = save_upload(file)
+    job = create_job("teachers")
+    background_tasks.add_task(run_teacher_import, job["job_id"], path)
+    return job
+
 # Filter classes
-@app.post("/classes/filter", response_model=List[ClassModel])
+@app.post("/classes/filter", response_model=Union[List[ClassModel], Page[ClassModel]])
 def filter_classes(
     filters: Optional[ClassFilter] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size, enables cursor pagination"),
+    after: Optional[str] = Query(None, description="next_cursor returned by the previous page"),
     db: Session = Depends(get_db)
 ):
     """
     Get classes with optional filters.
     If no filters are provided, returns all classes.
+    When limit is given, returns a page of classes and a next_cursor instead.
     """
     query = db.query(sql_models.Class)
     
@@ -215,6 +388,10 @@ def filter_classes(
         if filters.class_teacher_id:
             query = query.filter(sql_models.Class.class_teacher_id == filters.class_teacher_id)
     
+    # Cursor pagination is opt-in so existing clients keep getting a plain list
+    if limit:
+        return keyset_paginate(query, [sql_models.Class.class_id], limit, after)
+    
     classes = query.all()
     return classes
 
@@ -240,7 +417,7 @@ def create_class(class_data: ClassCreate, db: Session = Depends(get_db)):
     
     # Create new class
     new_class = sql_models.Class(
-        class_id=str(uuid.uuid4()),
+        class_id=sql_models.generate_uuid(),
         class_number=class_data.class_number,
         section=class_data.section,
         class_teacher_id=class_data.class_teacher_id
@@ -256,15 +433,22 @@ def create_class(class_data: ClassCreate, db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=f"Failed to create class: {str(e)}")
 
 # Filter subjects
-@app.post("/subjects/filter", response_model=List[SubjectModel])
+@app.post("/subjects/filter", response_model=Union[List[SubjectModel], Page[SubjectModel]])
 def filter_subjects(
     filters: Optional[SubjectFilter] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size, enables cursor pagination"),
+    after: Optional[str] = Query(None, description="next_cursor returned by the previous page"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. name,roll_no,status"),
     db: Session = Depends(get_db)
 ):
     """
     Get subjects with optional filters.
     If no filters are provided, returns all subjects.
+    When limit is given, returns a page of subjects and a next_cursor instead.
+    With fields, only those columns are read and returned.
     """
+    names = parse_fields(fields, SubjectModel)
+    
     query = db.query(sql_models.Subject)
     
     # Apply filters if provided
@@ -276,8 +460,19 @@ def filter_subjects(
         if filters.code:
             query = query.filter(sql_models.Subject.code == filters.code)
     
-    subjects = query.all()
-    return subjects
+    sort_key = [sql_models.Subject.subject_id]
+    if names:
+        query = select_fields(query, sql_models.Subject, names, sort_key)
+    
+    # Cursor pagination is opt-in so existing clients keep getting a plain list
+    if limit:
+        result = keyset_paginate(query, sort_key, limit, after)
+    else:
+        result = query.all()
+    
+    if names:
+        return json_response(SubjectModel, result, names)
+    return result
 
 # Create subject
 @app.post("/subjects", response_model=SubjectModel, status_code=201)
@@ -292,7 +487,7 @@ def create_subject(subject: SubjectCreate, db: Session = Depends(get_db)):
     
     # Create new subject
     new_subject = sql_models.Subject(
-        subject_id=str(uuid.uuid4()),
+        subject_id=sql_models.generate_uuid(),
         name=subject.name,
         code=subject.code
     )
@@ -307,36 +502,39 @@ def create_subject(subject: SubjectCreate, db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=f"Failed to create subject: {str(e)}")
 
 # Filter attendance
-@app.post("/attendance/filter", response_model=List[AttendanceModel])
+@app.post("/attendance/filter", response_model=Union[List[AttendanceModel], Page[AttendanceModel]])
 def filter_attendance(
     filters: Optional[AttendanceFilter] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size, enables cursor pagination"),
+    after: Optional[str] = Query(None, description="next_cursor returned by the previous page"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. name,roll_no,status"),
     db: Session = Depends(get_db)
 ):
     """
     Get attendance records with optional filters.
     If no filters are provided, returns all attendance records.
+    When limit is given, returns a page of attendance records and a next_cursor instead.
+    With fields, only those columns are read and returned.
     """
+    names = parse_fields(fields, AttendanceModel)
+    
     query = db.query(sql_models.Attendance)
     
-    # Apply filters if provided
-    if filters:
-        if filters.attendance_id:
-            query = query.filter(sql_models.Attendance.attendance_id == filters.attendance_id)
-        if filters.class_id:
-            query = query.filter(sql_models.Attendance.class_id == filters.class_id)
-        if filters.student_id:
-            query = query.filter(sql_models.Attendance.student_id == filters.student_id)
-        if filters.date:
-            query = query.filter(sql_models.Attendance.date == filters.date)
-        if filters.date_from:
-            query = query.filter(sql_models.Attendance.date >= filters.date_from)
-        if filters.date_to:
-            query = query.filter(sql_models.Attendance.date <= filters.date_to)
-        if filters.status:
-            query = query.filter(sql_models.Attendance.status == filters.status)
+    query = apply_attendance_filters(query, filters)
     
-    attendance_records = query.all()
-    return attendance_records
+    sort_key = [sql_models.Attendance.date, sql_models.Attendance.attendance_id]
+    if names:
+        query = select_fields(query, sql_models.Attendance, names, sort_key)
+    
+    # Cursor pagination is opt-in so existing clients keep getting a plain list
+    if limit:
+        result = keyset_paginate(query, sort_key, limit, after)
+    else:
+        result = query.all()
+    
+    if names:
+        return json_response(AttendanceModel, result, names)
+    return result
 
 # Create attendance record
 @app.post("/attendance", response_model=AttendanceModel, status_code=201)
@@ -345,7 +543,7 @@ def create_attendance(attendance: AttendanceCreate, db: Session = Depends(get_db
     Create a new attendance record in the database
     """
     # Check if class exists
-    class_check = db.query(sql_models.Class).filter(sql_models.Class.class_id == attendance.class_id).first()
+    class_check = entity_cache.get_class(db, attendance.class_id)
     if not class_check:
         raise HTTPException(status_code=404, detail="Class not found")
     
@@ -367,7 +565,7 @@ def create_attendance(attendance: AttendanceCreate, db: Session = Depends(get_db
     
     # Create new attendance record
     new_attendance = sql_models.Attendance(
-        attendance_id=str(uuid.uuid4()),
+        attendance_id=sql_models.generate_uuid(),
         class_id=attendance.class_id,
         student_id=attendance.student_id,
         date=attendance.date,
@@ -376,6 +574,10 @@ def create_attendance(attendance: AttendanceCreate, db: Session = Depends(get_db
     
     try:
         db.add(new_attendance)
+        attendance_summary.apply_counts(
+            db, attendance.class_id, attendance.date,
+            attendance_summary.count_changes((attendance.status, 1))
+        )
         db.commit()
         db.refresh(new_attendance)
         return new_attendance
@@ -383,16 +585,97 @@ def create_attendance(attendance: AttendanceCreate, db: Session = Depends(get_db
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Failed to create attendance record: {str(e)}")
 
+# Mark attendance for a whole class
+@app.post("/attendance/bulk", response_model=BulkResult)
+def create_attendance_bulk(bulk: AttendanceBulkCreate, db: Session = Depends(get_db)):
+    """
+    Create attendance records for many students of one class on one date.
+    Validation is done with set-based queries and all valid rows are inserted
+    in a single transaction. Invalid rows are reported per entry.
+    """
+    # Check if class exists
+    class_check = entity_cache.get_class(db, bulk.class_id)
+    if not class_check:
+        raise HTTPException(status_code=404, detail="Class not found")
+    
+    student_ids = {entry.student_id for entry in bulk.entries}
+    
+    # Students from the request that belong to the class, in one query
+    class_members = {
+        row.student_id for row in db.query(sql_models.Student.student_id).filter(
+            sql_models.Student.class_id == bulk.class_id,
+            sql_models.Student.student_id.in_(student_ids)
+        )
+    }
+    
+    # Students that already have attendance on this date, in one query
+    already_marked = {
+        row.student_id for row in db.query(sql_models.Attendance.student_id).filter(
+            sql_models.Attendance.student_id.in_(student_ids),
+            sql_models.Attendance.date == bulk.date
+        )
+    }
+    
+    results = []
+    rows = []
+    seen = set()
+    for entry in bulk.entries:
+        if entry.student_id in seen:
+            detail = "Duplicate entry for this student in the request"
+        elif entry.student_id not in class_members:
+            detail = "Student not found in this class"
+        elif entry.student_id in already_marked:
+            detail = "Attendance record for this student on this date already exists"
+        else:
+            detail = None
+        seen.add(entry.student_id)
+        
+        if detail:
+            results.append({"student_id": entry.student_id, "success": False, "detail": detail})
+            continue
+        
+        attendance_id = sql_models.generate_uuid()
+        rows.append({
+            "attendance_id": attendance_id,
+            "class_id": bulk.class_id,
+            "student_id": entry.student_id,
+            "date": bulk.date,
+            "status": sql_models.AttendanceStatus(entry.status.value)
+        })
+        results.append({"student_id": entry.student_id, "success": True, "id": attendance_id})
+    
+    if rows:
+        try:
+            # One multi-row INSERT instead of one round trip per student
+            db.execute(sql_models.Attendance.__table__.insert(), rows)
+            attendance_summary.apply_counts(
+                db, bulk.class_id, bulk.date,
+                attendance_summary.count_changes(*((row["status"], 1) for row in rows))
+            )
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            raise HTTPException(status_code=500, detail=f"Failed to create attendance records: {str(e)}")
+    
+    return {"created": len(rows), "failed": len(results) - len(rows), "results": results}
+
 # Filter exams
-@app.post("/exams/filter", response_model=List[ExamsModel])
+@app.post("/exams/filter", response_model=Union[List[ExamsModel], Page[ExamsModel]])
 def filter_exams(
     filters: Optional[ExamFilter] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size, enables cursor pagination"),
+    after: Optional[str] = Query(None, description="next_cursor returned by the previous page"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. name,roll_no,status"),
     db: Session = Depends(get_db)
 ):
     """
     Get exams with optional filters.
     If no filters are provided, returns all exams.
+    When limit is given, returns a page of exams and a next_cursor instead.
+    With fields, only those columns are read and returned.
     """
+    names = parse_fields(fields, ExamsModel)
+    
     query = db.query(sql_models.Exams)
     
     # Apply filters if provided
@@ -412,8 +695,19 @@ def filter_exams(
         if filters.date_to:
             query = query.filter(sql_models.Exams.date <= filters.date_to)
     
-    exams = query.all()
-    return exams
+    sort_key = [sql_models.Exams.date, sql_models.Exams.exam_id]
+    if names:
+        query = select_fields(query, sql_models.Exams, names, sort_key)
+    
+    # Cursor pagination is opt-in so existing clients keep getting a plain list
+    if limit:
+        result = keyset_paginate(query, sort_key, limit, after)
+    else:
+        result = query.all()
+    
+    if names:
+        return json_response(ExamsModel, result, names)
+    return result
 
 # Create exam
 @app.post("/exams", response_model=ExamsModel, status_code=201)
@@ -422,18 +716,18 @@ def create_exam(exam: ExamsCreate, db: Session = Depends(get_db)):
     Create a new exam in the database
     """
     # Validate class exists
-    class_check = db.query(sql_models.Class).filter(sql_models.Class.class_id == exam.class_id).first()
+    class_check = entity_cache.get_class(db, exam.class_id)
     if not class_check:
         raise HTTPException(status_code=404, detail="Class not found")
     
     # Validate subject exists
-    subject_check = db.query(sql_models.Subject).filter(sql_models.Subject.subject_id == exam.subject_id).first()
+    subject_check = entity_cache.get_subject(db, exam.subject_id)
     if not subject_check:
         raise HTTPException(status_code=404, detail="Subject not found")
     
     # Create new exam
     new_exam = sql_models.Exams(
-        exam_id=str(uuid.uuid4()),
+        exam_id=sql_models.generate_uuid(),
         class_id=exam.class_id,
         subject_id=exam.subject_id,
         date=exam.date,
@@ -480,7 +774,7 @@ def create_grade(grade: GradeCreate, db: Session = Depends(get_db)):
     
     # Create new grade
     new_grade = sql_models.Grade(
-        grades_id=str(uuid.uuid4()),
+        grades_id=sql_models.generate_uuid(),
         student_id=grade.student_id,
         exam_id=grade.exam_id,
         marks=grade.marks,
@@ -490,12 +784,112 @@ def create_grade(grade: GradeCreate, db: Session = Depends(get_db)):
     try:
         db.add(new_grade)
         db.commit()
+        exam_analytics.invalidate(grade.exam_id)
         db.refresh(new_grade)
         return new_grade
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Failed to create grade: {str(e)}")
 
+# Enter grades for a whole exam
+@app.post("/exams/{exam_id}/grades/bulk", response_model=BulkResult)
+def create_grades_bulk(exam_id: str, bulk: GradeBulkCreate, db: Session = Depends(get_db)):
+    """
+    Create (or, with upsert, overwrite) grades for many students of one exam.
+    The exam is loaded once, students are validated against the exam's class
+    in one query and all rows are written in a single transaction.
+    Invalid rows are reported per entry.
+    """
+    # Validate exam exists
+    exam_check = db.query(sql_models.Exams.class_id, sql_models.Exams.total_marks).filter(
+        sql_models.Exams.exam_id == exam_id
+    ).first()
+    if not exam_check:
+        raise HTTPException(status_code=404, detail="Exam not found")
+    
+    student_ids = {entry.student_id for entry in bulk.entries}
+    
+    # Students from the request that belong to the exam's class, in one query
+    class_members = {
+        row.student_id for row in db.query(sql_models.Student.student_id).filter(
+            sql_models.Student.class_id == exam_check.class_id,
+            sql_models.Student.student_id.in_(student_ids)
+        )
+    }
+    
+    # Grades already recorded for this exam, in one query
+    existing_grades = {
+        row.student_id: row.grades_id for row in db.query(
+            sql_models.Grade.student_id, sql_models.Grade.grades_id
+        ).filter(
+            sql_models.Grade.exam_id == exam_id,
+            sql_models.Grade.student_id.in_(student_ids)
+        )
+    }
+    
+    # Check marks against total marks for all rows in one pass
+    over_total = [entry.marks > exam_check.total_marks for entry in bulk.entries]
+    
+    results = []
+    new_rows = []
+    updated_rows = []
+    seen = set()
+    for entry, too_high in zip(bulk.entries, over_total):
+        if entry.student_id in seen:
+            detail = "Duplicate entry for this student in the request"
+        elif entry.student_id not in class_members:
+            detail = "Student not found in this exam's class"
+        elif too_high:
+            detail = f"Marks cannot exceed total marks for the exam ({exam_check.total_marks})"
+        elif entry.student_id in existing_grades and not bulk.upsert:
+            detail = "Grade already exists for this student and exam"
+        else:
+            detail = None
+        seen.add(entry.student_id)
+        
+        if detail:
+            results.append({"student_id": entry.student_id, "success": False, "detail": detail})
+            continue
+        
+        if entry.student_id in existing_grades:
+            grades_id = existing_grades[entry.student_id]
+            updated_rows.append({"b_grades_id": grades_id, "b_marks": entry.marks, "b_grade": entry.grade})
+        else:
+            grades_id = sql_models.generate_uuid()
+            new_rows.append({
+                "grades_id": grades_id,
+                "student_id": entry.student_id,
+                "exam_id": exam_id,
+                "marks": entry.marks,
+                "grade": entry.grade
+            })
+        results.append({"student_id": entry.student_id, "success": True, "id": grades_id})
+    
+    if new_rows or updated_rows:
+        grades_table = sql_models.Grade.__table__
+        try:
+            if new_rows:
+                db.execute(grades_table.insert(), new_rows)
+            if updated_rows:
+                db.execute(
+                    update(grades_table)
+                    .where(grades_table.c.grades_id == bindparam("b_grades_id"))
+                    .values(marks=bindparam("b_marks"), grade=bindparam("b_grade")),
+                    updated_rows
+                )
+            db.commit()
+            exam_analytics.invalidate(exam_id)
+        except Exception as e:
+            db.rollback()
+            raise HTTPException(status_code=500, detail=f"Failed to save grades: {str(e)}")
+    
+    return {
+        "created": len(new_rows),
+        "updated": len(updated_rows),
+        "failed": len(results) - len(new_rows) - len(updated_rows),
+        "results": results
+    }
+
 # Create assignment
 @app.post("/assignments", response_model=AssignmentModel, status_code=201)
 def create_assignment(assignment: AssignmentCreate, db: Session = Depends(get_db)):
@@ -503,13 +897,13 @@ def create_assignment(assignment: AssignmentCreate, db: Session = Depends(get_db
     Create a new assignment in the database
     """
     # Validate class_subject exists
-    class_sub_check = db.query(sql_models.Class_Subject).filter(sql_models.Class_Subject.class_sub_id == assignment.class_sub_id).first()
+    class_sub_check = entity_cache.get_class_subject(db, assignment.class_sub_id)
     if not class_sub_check:
         raise HTTPException(status_code=404, detail="Class subject relation not found")
     
     # Create new assignment
     new_assignment = sql_models.Assignment(
-        assignment_id=str(uuid.uuid4()),
+        assignment_id=sql_models.generate_uuid(),
         class_sub_id=assignment.class_sub_id,
         title=assignment.title,
         dueDate=assignment.dueDate,
@@ -552,7 +946,7 @@ def create_assignment_grading(grading: Assignment_gradingCreate, db: Session = D
     
     # Create new assignment grading
     new_grading = sql_models.Assignment_grading(
-        grading_id=str(uuid.uuid4()),
+        grading_id=sql_models.generate_uuid(),
         assignment_id=grading.assignment_id,
         student_id=grading.student_id,
         feedback=grading.feedback,
@@ -572,18 +966,29 @@ def create_assignment_grading(grading: Assignment_gradingCreate, db: Session = D
 
 # Create admin
 @app.post("/admins", response_model=AdminModel, status_code=201)
-def create_admin(admin: AdminCreate, db: Session = Depends(get_db)):
+async def create_admin(admin: AdminCreate, db: Session = Depends(get_db)):
     """
     Create a new admin in the database
     """
+    # bcrypt runs on the process pool; the database work runs in the threadpool.
+    # Rejected requests never reach the hashing step.
+    await run_in_threadpool(_validate_admin, admin, db)
+    password_hash = await hash_password_async(admin.password)
+    return await run_in_threadpool(_insert_admin, admin, password_hash, db)
+
+def _validate_admin(admin: AdminCreate, db: Session):
     # Check if email already exists
     db_admin = db.query(sql_models.Admin).filter(sql_models.Admin.email == admin.email).first()
     if db_admin:
         raise HTTPException(status_code=400, detail="Email already registered")
     
+    # Don't hold a pooled connection while the password is hashed
+    db.rollback()
+
+def _insert_admin(admin: AdminCreate, password_hash: str, db: Session):
     # Create new admin
     new_admin = sql_models.Admin(
-        admin_id=str(uuid.uuid4()),
+        admin_id=sql_models.generate_uuid(),
         name=admin.name,
         gender=admin.gender,
         phone=admin.phone,
@@ -591,7 +996,7 @@ def create_admin(admin: AdminCreate, db: Session = Depends(get_db)):
         status=admin.status,
         profile_pic=admin.profile_pic,
         address=admin.address,
-        password_hash=pwd_context.hash(admin.password),
+        password_hash=password_hash,
         date_of_birth=admin.date_of_birth
     )
     
@@ -611,17 +1016,17 @@ def create_class_subject(class_subject: Class_SubjectCreate, db: Session = Depen
     Create a new class subject relation in the database
     """
     # Validate class exists
-    class_check = db.query(sql_models.Class).filter(sql_models.Class.class_id == class_subject.class_id).first()
+    class_check = entity_cache.get_class(db, class_subject.class_id)
     if not class_check:
         raise HTTPException(status_code=404, detail="Class not found")
     
     # Validate subject exists
-    subject_check = db.query(sql_models.Subject).filter(sql_models.Subject.subject_id == class_subject.subject_id).first()
+    subject_check = entity_cache.get_subject(db, class_subject.subject_id)
     if not subject_check:
         raise HTTPException(status_code=404, detail="Subject not found")
     
     # Validate teacher exists
-    teacher_check = db.query(sql_models.Teacher).filter(sql_models.Teacher.teacher_id == class_subject.subject_teacher_id).first()
+    teacher_check = entity_cache.get_teacher(db, class_subject.subject_teacher_id)
     if not teacher_check:
         raise HTTPException(status_code=404, detail="Teacher not found")
     
@@ -635,7 +1040,7 @@ def create_class_subject(class_subject: Class_SubjectCreate, db: Session = Depen
     
     # Create new class subject relation
     new_class_subject = sql_models.Class_Subject(
-        class_sub_id=str(uuid.uuid4()),
+        class_sub_id=sql_models.generate_uuid(),
         class_id=class_subject.class_id,
         subject_id=class_subject.subject_id,
         subject_teacher_id=class_subject.subject_teacher_id
@@ -657,32 +1062,21 @@ def create_timetable_entry(timetable: TimetableCreate, db: Session = Depends(get
     Create a new timetable entry in the database
     """
     # Validate class subject relation exists
-    class_sub_check = db.query(sql_models.Class_Subject).filter(sql_models.Class_Subject.class_sub_id == timetable.class_sub_id).first()
+    class_sub_check = entity_cache.get_class_subject(db, timetable.class_sub_id)
     if not class_sub_check:
         raise HTTPException(status_code=404, detail="Class subject relation not found")
     
-    # Check for time slot conflicts for the same class on the same day
-    class_id = class_sub_check.class_id
-    
-    # Get all timetable entries for this class on the same day
-    conflicting_slots = db.query(sql_models.Timetable).join(
-        sql_models.Class_Subject, sql_models.Class_Subject.class_sub_id == sql_models.Timetable.class_sub_id
-    ).filter(
-        sql_models.Class_Subject.class_id == class_id,
-        sql_models.Timetable.day == timetable.day
-    ).all()
-    
-    # Check for time conflicts
-    for slot in conflicting_slots:
-        # Overlap check: if the new entry starts during an existing slot or ends during an existing slot
-        if ((timetable.start_time >= slot.start_time and timetable.start_time < slot.end_time) or
-            (timetable.end_time > slot.start_time and timetable.end_time <= slot.end_time) or
-            (timetable.start_time <= slot.start_time and timetable.end_time >= slot.end_time)):
-            raise HTTPException(status_code=400, detail="Time slot conflicts with an existing entry")
+    # Check for overlapping slots of the same class or the same teacher on that day
+    conflict = find_conflict(
+        db, class_sub_check.class_id, class_sub_check.subject_teacher_id,
+        timetable.day, timetable.start_time, timetable.end_time
+    )
+    if conflict:
+        raise HTTPException(status_code=400, detail=conflict_detail(conflict, class_sub_check.class_id))
     
     # Create new timetable entry
     new_timetable = sql_models.Timetable(
-        timetable_id=str(uuid.uuid4()),
+        timetable_id=sql_models.generate_uuid(),
         class_sub_id=timetable.class_sub_id,
         day=timetable.day,
         start_time=timetable.start_time,
@@ -698,6 +1092,133 @@ def create_timetable_entry(timetable: TimetableCreate, db: Session = Depends(get
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Failed to create timetable entry: {str(e)}")
 
+# Generate a weekly timetable
+@app.post("/timetable/generate", response_model=TimetableGenerateResult, status_code=201)
+def generate_timetable(
+    request: TimetableGenerate,
+    response: Response,
+    dry_run: bool = Query(False, description="Solve and return the timetable without saving it"),
+    db: Session = Depends(get_db)
+):
+    """
+    Build a clash-free weekly timetable for every class in the request.
+    Existing entries of those classes are replaced in one transaction;
+    slots their teachers already teach in other classes are kept free.
+    A dry run creates nothing and answers 200 instead of 201.
+    """
+    started = time.perf_counter()
+    
+    # Solve on the grid in time order; position maps request indexes to it
+    order = sorted(range(len(request.periods)), key=lambda index: request.periods[index].start_time)
+    position = {original: index for index, original in enumerate(order)}
+    periods = [request.periods[index] for index in order]
+    for previous, current in zip(periods, periods[1:]):
+        if current.start_time < previous.end_time:
+            raise HTTPException(status_code=400, detail="Periods must not overlap")
+    if len(set(request.days)) != len(request.days):
+        raise HTTPException(status_code=400, detail="Duplicate day in the request")
+    
+    requirements = {}
+    for lesson in request.lessons:
+        if lesson.class_sub_id in requirements:
+            raise HTTPException(status_code=400, detail=f"Duplicate lesson for class subject {lesson.class_sub_id}")
+        requirements[lesson.class_sub_id] = lesson.periods_per_week
+    
+    # Validate class subject relations exist, in one query
+    class_subjects = db.query(
+        sql_models.Class_Subject.class_sub_id,
+        sql_models.Class_Subject.class_id,
+        sql_models.Class_Subject.subject_teacher_id
+    ).filter(sql_models.Class_Subject.class_sub_id.in_(requirements)).all()
+    missing = set(requirements) - {row.class_sub_id for row in class_subjects}
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Class subject relation not found: {', '.join(sorted(missing))}")
+    
+    class_ids = {row.class_id for row in class_subjects}
+    teacher_ids = {row.subject_teacher_id for row in class_subjects}
+    day_index = {day.value: index for index, day in enumerate(request.days)}
+    
+    teacher_blocked = {}
+    teacher_max_per_day = {}
+    for constraint in request.teacher_constraints:
+        for slot in constraint.unavailable:
+            if slot.day.value not in day_index or slot.period >= len(periods):
+                raise HTTPException(status_code=400, detail=f"Unavailable slot outside the grid for teacher {constraint.teacher_id}")
+            teacher_blocked.setdefault(constraint.teacher_id, []).append(
+                (day_index[slot.day.value], position[slot.period])
+            )
+        if constraint.max_periods_per_day:
+            teacher_max_per_day[constraint.teacher_id] = constraint.max_periods_per_day
+    
+    # Periods the teachers already teach in classes outside this request
+    busy = db.query(
+        sql_models.Timetable.day,
+        sql_models.Timetable.start_time,
+        sql_models.Timetable.end_time,
+        sql_models.Class_Subject.subject_teacher_id
+    ).join(
+        sql_models.Class_Subject, sql_models.Class_Subject.class_sub_id == sql_models.Timetable.class_sub_id
+    ).filter(
+        sql_models.Class_Subject.subject_teacher_id.in_(teacher_ids),
+        sql_models.Class_Subject.class_id.notin_(class_ids)
+    ).all()
+    for row in busy:
+        if row.day.value not in day_index:
+            continue
+        for index, period in enumerate(periods):
+            if period.start_time < row.end_time and period.end_time > row.start_time:
+                teacher_blocked.setdefault(row.subject_teacher_id, []).append((day_index[row.day.value], index))
+    
+    lessons = [
+        (row.class_sub_id, row.class_id, row.subject_teacher_id, requirements[row.class_sub_id])
+        for row in class_subjects
+    ]
+    try:
+        solution = solve_timetable(
+            len(request.days), len(periods), lessons,
+            teacher_blocked=teacher_blocked,
+            teacher_max_per_day=teacher_max_per_day,
+            max_subject_per_day=request.max_subject_periods_per_day
+        )
+    except ScheduleError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    
+    rows = [
+        {
+            "timetable_id": sql_models.generate_uuid(),
+            "class_sub_id": class_sub_id,
+            "day": sql_models.DayOfWeek(request.days[day].value),
+            "start_time": periods[period].start_time,
+            "end_time": periods[period].end_time
+        }
+        for class_sub_id, slots in solution.items() for day, period in slots
+    ]
+    
+    replaced = 0
+    if dry_run:
+        response.status_code = 200
+    else:
+        try:
+            scheduled = select(sql_models.Class_Subject.class_sub_id).where(
+                sql_models.Class_Subject.class_id.in_(class_ids)
+            )
+            replaced = db.query(sql_models.Timetable).filter(
+                sql_models.Timetable.class_sub_id.in_(scheduled)
+            ).delete(synchronize_session=False)
+            db.execute(sql_models.Timetable.__table__.insert(), rows)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            raise HTTPException(status_code=500, detail=f"Failed to save timetable: {str(e)}")
+    
+    return {
+        "created": 0 if dry_run else len(rows),
+        "replaced": replaced,
+        "classes": len(class_ids),
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+        "entries": rows
+    }
+
 # Create notification
 @app.post("/notifications", response_model=NotificationModel, status_code=201)
 def create_notification(notification: NotificationCreate, db: Session = Depends(get_db)):
@@ -706,7 +1227,7 @@ def create_notification(notification: NotificationCreate, db: Session = Depends(
     """
     # Validate class ID if recipient is specific class
     if notification.recipient == 'Specific Class':
-        class_check = db.query(sql_models.Class).filter(sql_models.Class.class_id == notification.class_id).first()
+        class_check = entity_cache.get_class(db, notification.class_id)
         if not class_check:
             raise HTTPException(status_code=404, detail="Class not found")
     
@@ -716,19 +1237,19 @@ def create_notification(notification: NotificationCreate, db: Session = Depends(
         if not admin_check:
             raise HTTPException(status_code=404, detail="Admin not found")
     elif notification.creator_type == 'Teacher' and notification.teacher_id:
-        teacher_check = db.query(sql_models.Teacher).filter(sql_models.Teacher.teacher_id == notification.teacher_id).first()
+        teacher_check = entity_cache.get_teacher(db, notification.teacher_id)
         if not teacher_check:
             raise HTTPException(status_code=404, detail="Teacher not found")
     
     # Create new notification
     new_notification = sql_models.Notification(
-        notification_id=str(uuid.uuid4()),
+        notification_id=sql_models.generate_uuid(),
         title=notification.title,
         content=notification.content,
-        type=notification.type,
-        recipient=notification.recipient,
+        type=sql_models.NotificationType(notification.type.value),
+        recipient=sql_models.RecipientType(notification.recipient.value),
         class_id=notification.class_id,
-        creator_type=notification.creator_type,
+        creator_type=sql_models.CreatorType(notification.creator_type.value),
         admin_id=notification.admin_id,
         teacher_id=notification.teacher_id
     )
@@ -737,10 +1258,137 @@ def create_notification(notification: NotificationCreate, db: Session = Depends(
         db.add(new_notification)
         db.commit()
         db.refresh(new_notification)
-        return new_notification
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Failed to create notification: {str(e)}")
+    
+    # The notification is committed either way; clients that missed the push
+    # get it from the feed or when their stream reconnects
+    try:
+        notification_push.publish_notification(new_notification)
+    except Exception:
+        logger.exception("Failed to push notification %s", new_notification.notification_id)
+    return new_notification
+
+# Notification feed of a student or teacher
+@app.get("/notifications/feed", response_model=NotificationFeed)
+def get_notification_feed(
+    student_id: Optional[str] = Query(None, description="Feed of this student"),
+    teacher_id: Optional[str] = Query(None, description="Feed of this teacher"),
+    limit: int = Query(notification_feed.DEFAULT_FEED_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    before: Optional[str] = Query(None, description="before cursor of the previous page, for older notifications"),
+    since: Optional[str] = Query(None, description="since cursor of an earlier response, for newer notifications"),
+    db: Session = Depends(get_db)
+):
+    """
+    Get the notifications addressed to a student (everyone, all students,
+    their class) or a teacher (everyone, all teachers, classes they teach),
+    newest first. Page back with before; poll for new ones with since.
+    """
+    audience = _notification_audience(db, student_id, teacher_id)
+    return notification_feed.feed(db, audience, limit, before, since)
+
+def _notification_audience(db: Session, student_id: Optional[str], teacher_id: Optional[str]):
+    if (student_id is None) == (teacher_id is None):
+        raise HTTPException(status_code=400, detail="Give exactly one of student_id and teacher_id")
+    
+    if student_id:
+        student = db.query(sql_models.Student.class_id).filter(sql_models.Student.student_id == student_id).first()
+        if not student:
+            raise HTTPException(status_code=404, detail="Student not found")
+        return notification_feed.student_audience(student)
+    
+    if not entity_cache.get_teacher(db, teacher_id):
+        raise HTTPException(status_code=404, detail="Teacher not found")
+    return notification_feed.teacher_audience(teacher_id)
+
+# Live notifications of a student or teacher as Server-Sent Events
+@app.get("/notifications/stream")
+async def stream_notifications(
+    student_id: Optional[str] = Query(None, description="Notifications of this student"),
+    teacher_id: Optional[str] = Query(None, description="Notifications of this teacher"),
+    last_event_id: Optional[str] = Header(None, description="Sent by EventSource when reconnecting")
+):
+    """
+    Stream notifications to a student or teacher as they are created.
+    Each event id is a feed cursor: on reconnect, missed notifications are
+    sent first. Idle connections hold no database connection or thread.
+    """
+    audience, topics = await run_in_threadpool(_stream_audience, student_id, teacher_id)
+    if last_event_id:
+        try:
+            decode_cursor(last_event_id, notification_feed.SORT_KEY)
+        except HTTPException:
+            # Not a feed cursor (e.g. from before a feed order change): start from now
+            last_event_id = None
+    
+    async def events():
+        # Subscribed once the body is streamed, so a client gone before then
+        # leaves nothing behind; and before reading the feed, so no
+        # notification falls in between
+        subscription = notification_push.broker.subscribe(topics)
+        try:
+            since = last_event_id or await run_in_threadpool(_feed_head)
+            while True:
+                # Missed notifications, then whatever the last wake-up was
+                # for, a page at a time
+                more = True
+                while more:
+                    page, since, more = await run_in_threadpool(_feed_page, audience, since)
+                    for _, event in page:
+                        yield event
+                message = await subscription.get()
+                while message == notification_push.PING:
+                    yield ": keep-alive\n\n"
+                    message = await subscription.get()
+                if message is None:
+                    # Too slow to keep up; the client reconnects with Last-Event-ID
+                    break
+                # A live message only wakes the stream up: notifications are
+                # published after commit, so a lower feed_seq can arrive after
+                # a higher one. The feed returns both in commit order, and
+                # anything committed before the published one is readable.
+                # Messages queued meanwhile are covered by the same read.
+                while not subscription.queue.empty():
+                    if subscription.queue.get_nowait() is None:
+                        return
+        finally:
+            notification_push.broker.unsubscribe(subscription)
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+def _stream_audience(student_id: Optional[str], teacher_id: Optional[str]):
+    db = SessionLocal()
+    try:
+        audience = _notification_audience(db, student_id, teacher_id)
+        return audience, notification_push.audience_topics(db, audience)
+    finally:
+        db.close()
+
+def _feed_head():
+    db = SessionLocal()
+    try:
+        return notification_feed.head(db)
+    finally:
+        db.close()
+
+def _feed_page(audience, since: str):
+    """
+    Events of the next page of notifications after since, oldest first,
+    with the since cursor to continue from and whether more follow
+    """
+    db = SessionLocal()
+    try:
+        page = notification_feed.feed(db, audience, MAX_PAGE_SIZE, since=since)
+        # Pages of newer notifications come newest first
+        events = [notification_push.message(row) for row in reversed(page["items"])]
+        return events, page["since"], page["more_since"]
+    finally:
+        db.close()
 
 # Create leave application
 @app.post("/leave-applications", response_model=LeaveApplicationModel, status_code=201)
@@ -755,7 +1403,7 @@ def create_leave_application(leave: LeaveApplicationCreate, db: Session = Depend
     
     # Create new leave application
     new_leave = sql_models.Leave_Application(
-        leave_id=str(uuid.uuid4()),
+        leave_id=sql_models.generate_uuid(),
         student_id=leave.student_id,
         title=leave.title,
         type=leave.type,
@@ -786,13 +1434,13 @@ def create_feedback(feedback: FeedbackCreate, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Student not found")
     
     # Validate teacher exists
-    teacher_check = db.query(sql_models.Teacher).filter(sql_models.Teacher.teacher_id == feedback.teacher_id).first()
+    teacher_check = entity_cache.get_teacher(db, feedback.teacher_id)
     if not teacher_check:
         raise HTTPException(status_code=404, detail="Teacher not found")
     
     # Create new feedback
     new_feedback = sql_models.Feedback(
-        feedback_id=str(uuid.uuid4()),
+        feedback_id=sql_models.generate_uuid(),
         student_id=feedback.student_id,
         teacher_id=feedback.teacher_id,
         title=feedback.title,
@@ -828,7 +1476,7 @@ def create_extra_credit(extra_credit: ExtraCreditCreate, db: Session = Depends(g
     
     # Create new extra credit
     new_extra_credit = sql_models.Extra_Credit(
-        credit_id=str(uuid.uuid4()),
+        credit_id=sql_models.generate_uuid(),
         student_id=extra_credit.student_id,
         admin_id=extra_credit.admin_id,
         grade=extra_credit.grade
@@ -856,7 +1504,7 @@ def create_lost_found(item: LostAndFoundCreate, db: Session = Depends(get_db)):
     
     # Create new lost and found item
     new_item = sql_models.Lost_and_Found(
-        unique_id=str(uuid.uuid4()),
+        unique_id=sql_models.generate_uuid(),
         admin_id=item.admin_id,
         item_name=item.item_name,
         description=item.description,
@@ -902,7 +1550,7 @@ def update_student(
     
     # Class validation
     if student_update.class_id is not None:
-        class_check = db.query(sql_models.Class).filter(sql_models.Class.class_id == student_update.class_id).first()
+        class_check = entity_cache.get_class(db, student_update.class_id)
         if not class_check:
             raise HTTPException(status_code=404, detail="Class not found")
     
@@ -991,9 +1639,7 @@ def update_class(
     
     # Teacher validation
     if class_update.class_teacher_id is not None:
-        teacher_check = db.query(sql_models.Teacher).filter(
-            sql_models.Teacher.teacher_id == class_update.class_teacher_id
-        ).first()
+        teacher_check = entity_cache.get_teacher(db, class_update.class_teacher_id)
         if not teacher_check:
             raise HTTPException(status_code=404, detail="Teacher not found")
     
@@ -1084,12 +1730,19 @@ def update_attendance(
     if not db_attendance:
         raise HTTPException(status_code=404, detail="Attendance record not found")
     
+    old_status = db_attendance.status
+    
     # Update attendance attributes
     update_data = attendance_update.model_dump(exclude_unset=True)
     for key, value in update_data.items():
         setattr(db_attendance, key, value)
     
     try:
+        if attendance_update.status is not None:
+            attendance_summary.apply_counts(
+                db, db_attendance.class_id, db_attendance.date,
+                attendance_summary.count_changes((old_status, -1), (attendance_update.status, 1))
+            )
         db.commit()
         db.refresh(db_attendance)
         return db_attendance
@@ -1112,35 +1765,30 @@ def update_timetable(
     if not db_timetable:
         raise HTTPException(status_code=404, detail="Timetable entry not found")
     
-    # Get the class_id for conflict checking
-    class_sub = db.query(sql_models.Class_Subject).filter(
+    # Get the class and teacher for conflict checking
+    class_sub = db.query(
+        sql_models.Class_Subject.class_id, sql_models.Class_Subject.subject_teacher_id
+    ).filter(
         sql_models.Class_Subject.class_sub_id == db_timetable.class_sub_id
     ).first()
-    class_id = class_sub.class_id if class_sub else None
     
-    if class_id:
+    if class_sub:
         # Check for time conflicts if day, start_time, or end_time is updated
         if timetable_update.day is not None or timetable_update.start_time is not None or timetable_update.end_time is not None:
             new_day = timetable_update.day if timetable_update.day is not None else db_timetable.day
             new_start_time = timetable_update.start_time if timetable_update.start_time is not None else db_timetable.start_time
             new_end_time = timetable_update.end_time if timetable_update.end_time is not None else db_timetable.end_time
             
-            # Find potentially conflicting slots for the same class on the same day
-            conflicting_slots = db.query(sql_models.Timetable).join(
-                sql_models.Class_Subject, 
-                sql_models.Class_Subject.class_sub_id == sql_models.Timetable.class_sub_id
-            ).filter(
-                sql_models.Class_Subject.class_id == class_id,
-                sql_models.Timetable.day == new_day,
-                sql_models.Timetable.timetable_id != timetable_id
-            ).all()
+            if new_end_time <= new_start_time:
+                raise HTTPException(status_code=400, detail="End time must be after start time")
             
-            # Check for overlapping time slots
-            for slot in conflicting_slots:
-                if ((new_start_time >= slot.start_time and new_start_time < slot.end_time) or
-                    (new_end_time > slot.start_time and new_end_time <= slot.end_time) or
-                    (new_start_time <= slot.start_time and new_end_time >= slot.end_time)):
-                    raise HTTPException(status_code=400, detail="Time slot conflicts with an existing entry")
+            # Overlapping slots of the same class or teacher, other than this one
+            conflict = find_conflict(
+                db, class_sub.class_id, class_sub.subject_teacher_id,
+                new_day, new_start_time, new_end_time, exclude_id=timetable_id
+            )
+            if conflict:
+                raise HTTPException(status_code=400, detail=conflict_detail(conflict, class_sub.class_id))
     
     # Update timetable attributes
     update_data = timetable_update.model_dump(exclude_unset=True)
@@ -1177,6 +1825,8 @@ def update_exam(
     
     try:
         db.commit()
+        # total_marks feeds the histogram and mean percentage
+        exam_analytics.invalidate(exam_id)
         db.refresh(db_exam)
         return db_exam
     except Exception as e:
@@ -1211,6 +1861,7 @@ def update_grade(
     
     try:
         db.commit()
+        exam_analytics.invalidate(db_grade.exam_id)
         db.refresh(db_grade)
         return db_grade
     except Exception as e:
@@ -1579,6 +2230,10 @@ def delete_attendance(
     
     try:
         db.delete(db_attendance)
+        attendance_summary.apply_counts(
+            db, db_attendance.class_id, db_attendance.date,
+            attendance_summary.count_changes((db_attendance.status, -1))
+        )
         db.commit()
         return None
     except Exception as e:
@@ -1651,6 +2306,7 @@ def delete_grade(
     try:
         db.delete(db_grade)
         db.commit()
+        exam_analytics.invalidate(db_grade.exam_id)
         return None
     except Exception as e:
         db.rollback()
@@ -1881,6 +2537,40 @@ def delete_lost_found(
 
 # Additional useful routes
 
+def _search_hit(entity, doc_id, texts):
+    return {"type": entity, "id": doc_id, "name": texts[0], "detail": texts[1] if len(texts) > 1 else None}
+
+# Global search box over students, teachers, subjects, classes and lost and found
+@app.get("/search", response_model=List[SearchHit])
+def search(
+    q: str = Query(..., min_length=1, description="Text typed so far"),
+    types: Optional[List[SearchEntity]] = Query(None, description="Only search these types"),
+    limit: int = Query(search_index.DEFAULT_SEARCH_LIMIT, ge=1, le=50),
+    db: Session = Depends(get_db)
+):
+    """
+    Get the best matches of every type, ranked together and tagged with
+    their type, from the in-process search indexes. Names starting with q
+    rank first.
+    """
+    names = {entity.value for entity in types} if types else None
+    return [_search_hit(*hit) for hit in search_index.search_all(db, q, limit, names)]
+
+# Typeahead search over one type
+@app.get("/search/{entity}", response_model=List[SearchHit])
+def search_entities(
+    entity: SearchEntity,
+    q: str = Query(..., min_length=1, description="Text typed so far; matches names and emails (subject codes)"),
+    limit: int = Query(search_index.DEFAULT_SEARCH_LIMIT, ge=1, le=50),
+    db: Session = Depends(get_db)
+):
+    """
+    Get the best matches for a typeahead box, served from the in-process
+    search index. Names starting with q rank first.
+    """
+    hits = search_index.INDEXES[entity.value].search(db, q, limit)
+    return [_search_hit(entity.value, doc_id, texts) for doc_id, texts in hits]
+
 # Get student by ID
 @app.get("/students/{student_id}", response_model=StudentModel)
 def get_student(
@@ -1909,50 +2599,73 @@ def get_teacher(
         raise HTTPException(status_code=404, detail="Teacher not found")
     return db_teacher
 
+# Cached JSON responses of slow-changing GET routes, dropped on writes to the listed tables
+class_responses = ResponseCache("class", ClassModel, ["classes"])
+class_students_responses = ResponseCache("class_students", List[StudentModel], ["students", "classes"])
+subject_responses = ResponseCache("subject", SubjectModel, ["subjects"])
+class_timetable_responses = ResponseCache(
+    "class_timetable", List[TimetableModel], ["timetables", "class_subjects", "classes"]
+)
+
 # Get class by ID
 @app.get("/classes/{class_id}", response_model=ClassModel)
 def get_class(
     class_id: str,
+    request: Request,
     db: Session = Depends(get_db)
 ):
     """
     Get a class by ID
     """
+    cached = class_responses.get(request, class_id)
+    if cached is not None:
+        return cached
+    
     db_class = db.query(sql_models.Class).filter(sql_models.Class.class_id == class_id).first()
     if not db_class:
         raise HTTPException(status_code=404, detail="Class not found")
-    return db_class
+    return class_responses.put(request, class_id, db_class)
 
 # Get students by class ID
 @app.get("/classes/{class_id}/students", response_model=List[StudentModel])
-def get_students_by_class(
+async def get_students_by_class(
     class_id: str,
-    db: Session = Depends(get_db)
+    request: Request,
+    db: Session = Depends(get_async_db)
 ):
     """
     Get all students in a specific class
     """
+    cached = class_students_responses.get(request, class_id)
+    if cached is not None:
+        return cached
+    
     # Check if class exists
-    db_class = db.query(sql_models.Class).filter(sql_models.Class.class_id == class_id).first()
+    db_class = (await execute(db, select(sql_models.Class.class_id).where(sql_models.Class.class_id == class_id))).first()
     if not db_class:
         raise HTTPException(status_code=404, detail="Class not found")
     
-    students = db.query(sql_models.Student).filter(sql_models.Student.class_id == class_id).all()
-    return students
+    students = (await execute(db, select(sql_models.Student).where(sql_models.Student.class_id == class_id))).scalars().all()
+    return class_students_responses.put(request, class_id, students)
 
 # Get subject by ID
 @app.get("/subjects/{subject_id}", response_model=SubjectModel)
 def get_subject(
     subject_id: str,
+    request: Request,
     db: Session = Depends(get_db)
 ):
     """
     Get a subject by ID
     """
+    cached = subject_responses.get(request, subject_id)
+    if cached is not None:
+        return cached
+    
     db_subject = db.query(sql_models.Subject).filter(sql_models.Subject.subject_id == subject_id).first()
     if not db_subject:
         raise HTTPException(status_code=404, detail="Subject not found")
-    return db_subject
+    return subject_responses.put(request, subject_id, db_subject)
 
 # Get attendance for a specific student on a specific date
 @app.get("/attendance/student/{student_id}/date/{date_value}", response_model=List[AttendanceModel])
@@ -1978,48 +2691,167 @@ def get_student_attendance_by_date(
 
 # Get attendance for a class on a specific date
 @app.get("/attendance/class/{class_id}/date/{date_value}", response_model=List[AttendanceModel])
-def get_class_attendance_by_date(
+async def get_class_attendance_by_date(
     class_id: str,
     date_value: date,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_async_db)
 ):
     """
     Get attendance records for all students in a class on a specific date
     """
     # Check if class exists
-    db_class = db.query(sql_models.Class).filter(sql_models.Class.class_id == class_id).first()
+    db_class = (await execute(db, select(sql_models.Class.class_id).where(sql_models.Class.class_id == class_id))).first()
     if not db_class:
         raise HTTPException(status_code=404, detail="Class not found")
     
-    attendance = db.query(sql_models.Attendance).filter(
+    attendance = (await execute(db, select(sql_models.Attendance).where(
         sql_models.Attendance.class_id == class_id,
         sql_models.Attendance.date == date_value
-    ).all()
+    ))).scalars().all()
     
     return attendance
 
+# Get daily attendance summaries
+@app.get("/attendance/summary", response_model=List[AttendanceSummaryModel])
+def get_attendance_summary(
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    class_id: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Get present/absent/late/excused counts per class per day.
+    Reads the maintained summary table, not the raw attendance rows.
+    """
+    query = db.query(sql_models.Attendance_Summary)
+    if class_id:
+        query = query.filter(sql_models.Attendance_Summary.class_id == class_id)
+    if date_from:
+        query = query.filter(sql_models.Attendance_Summary.date >= date_from)
+    if date_to:
+        query = query.filter(sql_models.Attendance_Summary.date <= date_to)
+    
+    return query.order_by(sql_models.Attendance_Summary.date, sql_models.Attendance_Summary.class_id).all()
+
+# Attendance percentage report for a class
+@app.get("/attendance/report/class/{class_id}", response_model=AttendanceReport)
+def get_class_attendance_report(
+    class_id: str,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    late_weight: float = Query(1.0, ge=0, le=1, description="Credit given for a LATE day"),
+    excused_weight: float = Query(0.0, ge=0, le=1, description="Credit given for an EXCUSED day"),
+    db: Session = Depends(get_db)
+):
+    """
+    Get per-student and class attendance rates over a date range.
+    Counts come from one GROUP BY over attendance; LATE and EXCUSED days
+    count as late_weight and excused_weight of a present day.
+    """
+    # Check if class exists
+    db_class = entity_cache.get_class(db, class_id)
+    if not db_class:
+        raise HTTPException(status_code=404, detail="Class not found")
+    
+    join_conditions = [
+        sql_models.Attendance.student_id == sql_models.Student.student_id,
+        sql_models.Attendance.class_id == class_id
+    ]
+    if date_from:
+        join_conditions.append(sql_models.Attendance.date >= date_from)
+    if date_to:
+        join_conditions.append(sql_models.Attendance.date <= date_to)
+    
+    def status_count(status):
+        # MySQL returns SUM() as DECIMAL, which cannot be weighted by a float
+        return cast(func.coalesce(func.sum(case((sql_models.Attendance.status == status, 1), else_=0)), 0), Integer)
+    
+    # Students without records are kept by the outer join
+    rows = db.query(
+        sql_models.Student.student_id,
+        sql_models.Student.name,
+        sql_models.Student.roll_no,
+        func.count(sql_models.Attendance.attendance_id).label("total_days"),
+        status_count(sql_models.AttendanceStatus.PRESENT).label("present"),
+        status_count(sql_models.AttendanceStatus.ABSENT).label("absent"),
+        status_count(sql_models.AttendanceStatus.LATE).label("late"),
+        status_count(sql_models.AttendanceStatus.EXCUSED).label("excused")
+    ).outerjoin(
+        sql_models.Attendance, and_(*join_conditions)
+    ).filter(
+        sql_models.Student.class_id == class_id
+    ).group_by(
+        sql_models.Student.student_id, sql_models.Student.name, sql_models.Student.roll_no
+    ).order_by(sql_models.Student.roll_no).all()
+    
+    def weighted_days(row):
+        return row.present + row.late * late_weight + row.excused * excused_weight
+    
+    students = []
+    for row in rows:
+        rate = round(100 * weighted_days(row) / row.total_days, 2) if row.total_days else None
+        students.append({**row._asdict(), "attendance_rate": rate})
+    
+    total_days = sum(row.total_days for row in rows)
+    class_rate = round(100 * sum(weighted_days(row) for row in rows) / total_days, 2) if total_days else None
+    
+    return {
+        "class_id": class_id,
+        "date_from": date_from,
+        "date_to": date_to,
+        "late_weight": late_weight,
+        "excused_weight": excused_weight,
+        "class_rate": class_rate,
+        "students": students
+    }
+
+# Exam results analytics
+@app.get("/exams/{exam_id}/analytics", response_model=ExamAnalytics)
+def get_exam_analytics(exam_id: str, db: Session = Depends(get_db)):
+    """
+    Get rank, percentile, summary statistics and a marks histogram for an exam.
+    All marks are loaded with one query and the result is cached per exam
+    until a grade of the exam changes.
+    """
+    # Check if exam exists
+    exam = db.query(sql_models.Exams.exam_id, sql_models.Exams.total_marks).filter(
+        sql_models.Exams.exam_id == exam_id
+    ).first()
+    if not exam:
+        raise HTTPException(status_code=404, detail="Exam not found")
+    
+    try:
+        return exam_analytics.exam_analytics(db, exam)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to compute exam analytics: {str(e)}")
+
 # Get timetable for a specific class
 @app.get("/timetable/class/{class_id}", response_model=List[TimetableModel])
-def get_class_timetable(
+async def get_class_timetable(
     class_id: str,
-    db: Session = Depends(get_db)
+    request: Request,
+    db: Session = Depends(get_async_db)
 ):
     """
     Get all timetable entries for a specific class
     """
+    cached = class_timetable_responses.get(request, class_id)
+    if cached is not None:
+        return cached
+    
     # Check if class exists
-    db_class = db.query(sql_models.Class).filter(sql_models.Class.class_id == class_id).first()
+    db_class = (await execute(db, select(sql_models.Class.class_id).where(sql_models.Class.class_id == class_id))).first()
     if not db_class:
         raise HTTPException(status_code=404, detail="Class not found")
     
-    timetable = db.query(sql_models.Timetable).join(
+    timetable = (await execute(db, select(sql_models.Timetable).join(
         sql_models.Class_Subject, 
         sql_models.Class_Subject.class_sub_id == sql_models.Timetable.class_sub_id
-    ).filter(
+    ).where(
         sql_models.Class_Subject.class_id == class_id
-    ).all()
+    ))).scalars().all()
     
-    return timetable
+    return class_timetable_responses.put(request, class_id, timetable)
 
 # Get all assignments for a specific class
 @app.get("/assignments/class/{class_id}", response_model=List[AssignmentModel])
@@ -2060,7 +2892,7 @@ def get_pending_leave_applications(
 
 # Change password route for students
 @app.put("/students/{student_id}/change-password", status_code=204)
-def change_student_password(
+async def change_student_password(
     student_id: str,
     old_password: str = Body(...),
     new_password: str = Body(...),
@@ -2070,27 +2902,29 @@ def change_student_password(
     Change a student's password
     """
     # Check if student exists
-    db_student = db.query(sql_models.Student).filter(sql_models.Student.student_id == student_id).first()
+    db_student = await run_in_threadpool(
+        lambda: db.query(sql_models.Student).filter(sql_models.Student.student_id == student_id).first()
+    )
     if not db_student:
         raise HTTPException(status_code=404, detail="Student not found")
     
     # Verify old password
-    if not pwd_context.verify(old_password, db_student.password_hash):
+    if not await verify_password_async(old_password, db_student.password_hash):
         raise HTTPException(status_code=400, detail="Incorrect old password")
     
     # Update password
-    db_student.password_hash = pwd_context.hash(new_password)
+    db_student.password_hash = await hash_password_async(new_password)
     
     try:
-        db.commit()
+        await run_in_threadpool(db.commit)
         return None
     except Exception as e:
-        db.rollback()
+        await run_in_threadpool(db.rollback)
         raise HTTPException(status_code=500, detail=f"Failed to change password: {str(e)}")
 
 # Change password route for teachers
 @app.put("/teachers/{teacher_id}/change-password", status_code=204)
-def change_teacher_password(
+async def change_teacher_password(
     teacher_id: str,
     old_password: str = Body(...),
     new_password: str = Body(...),
@@ -2100,48 +2934,244 @@ def change_teacher_password(
     Change a teacher's password
     """
     # Check if teacher exists
-    db_teacher = db.query(sql_models.Teacher).filter(sql_models.Teacher.teacher_id == teacher_id).first()
+    db_teacher = await run_in_threadpool(
+        lambda: db.query(sql_models.Teacher).filter(sql_models.Teacher.teacher_id == teacher_id).first()
+    )
     if not db_teacher:
         raise HTTPException(status_code=404, detail="Teacher not found")
     
     # Verify old password
-    if not pwd_context.verify(old_password, db_teacher.password_hash):
+    if not await verify_password_async(old_password, db_teacher.password_hash):
         raise HTTPException(status_code=400, detail="Incorrect old password")
     
     # Update password
-    db_teacher.password_hash = pwd_context.hash(new_password)
+    db_teacher.password_hash = await hash_password_async(new_password)
     
     try:
-        db.commit()
+        await run_in_threadpool(db.commit)
         return None
     except Exception as e:
-        db.rollback()
+        await run_in_threadpool(db.rollback)
         raise HTTPException(status_code=500, detail=f"Failed to change password: {str(e)}")
 
 # Dashboard summary stats
+
+# Every admin app polls the dashboard, so the figures are cached briefly and
+# dropped as soon as a commit touches one of the counted tables
+DASHBOARD_CACHE_TTL = float(os.getenv("DASHBOARD_CACHE_TTL", 30))
+dashboard_cache = TTLCache(maxsize=4, ttl=DASHBOARD_CACHE_TTL)
+# Bumped on invalidation, so figures read before a write are not stored
+# after that write cleared the cache
+dashboard_cache_version = 0
+
+@on_tables_changed(
+    "students", "teachers", "classes", "subjects",
+    "leave_applications", "assignments", "lost_and_found"
+)
+def invalidate_dashboard_stats(tables):
+    global dashboard_cache_version
+    dashboard_cache_version += 1
+    dashboard_cache.clear()
+
+def dashboard_stats_statement(today: date):
+    """
+    All dashboard figures as scalar subqueries of a single SELECT
+    """
+    def count(model, *conditions):
+        return select(func.count()).select_from(model).where(*conditions).scalar_subquery()
+    
+    return select(
+        count(sql_models.Student).label("total_students"),
+        count(sql_models.Teacher).label("total_teachers"),
+        count(sql_models.Class).label("total_classes"),
+        count(sql_models.Subject).label("total_subjects"),
+        count(
+            sql_models.Leave_Application,
+            sql_models.Leave_Application.status == LeaveStatus.PENDING
+        ).label("pending_leaves"),
+        count(
+            sql_models.Assignment,
+            sql_models.Assignment.dueDate >= datetime.combine(today, datetime.min.time()),
+            sql_models.Assignment.dueDate < datetime.combine(today + timedelta(days=1), datetime.min.time())
+        ).label("assignments_due_today"),
+        count(
+            sql_models.Lost_and_Found,
+            sql_models.Lost_and_Found.status == ItemStatus.LOST
+        ).label("lost_items"),
+    )
+
 @app.get("/dashboard/stats")
-def get_dashboard_stats(db: Session = Depends(get_db)):
+async def get_dashboard_stats(db: Session = Depends(get_async_db)):
     """
     Get summary statistics for dashboard
     """
     today = date.today()
+    # "Due today" changes at midnight, so the day is part of the key
+    stats = dashboard_cache.get(today)
+    if stats is not None:
+        return stats
+    version = dashboard_cache_version
+    
     try:
-        stats = {
-            "total_students": db.query(sql_models.Student).count(),
-            "total_teachers": db.query(sql_models.Teacher).count(),
-            "total_classes": db.query(sql_models.Class).count(),
-            "total_subjects": db.query(sql_models.Subject).count(),
-            "pending_leaves": db.query(sql_models.Leave_Application).filter(
-                sql_models.Leave_Application.status == LeaveStatus.PENDING
-            ).count(),
-            "assignments_due_today": db.query(sql_models.Assignment).filter(
-                sql_models.Assignment.dueDate >= datetime.combine(today, datetime.min.time()),
-                sql_models.Assignment.dueDate < datetime.combine(today + timedelta(days=1), datetime.min.time())
-            ).count(),
-            "lost_items": db.query(sql_models.Lost_and_Found).filter(
-                sql_models.Lost_and_Found.status == ItemStatus.LOST
-            ).count(),
-        }
+        row = (await execute(db, dashboard_stats_statement(today))).one()
+        stats = dict(row._mapping)
+        if version == dashboard_cache_version:
+            dashboard_cache.set(today, stats)
         return stats
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to retrieve dashboard stats: {str(e)}")
+
+# Streaming export routes
+
+def _export_response(build_query, export_format: ExportFormat, name: str):
+    fmt = export_format.value
+    return StreamingResponse(
+        stream_export(build_query, fmt),
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{fmt}"'}
+    )
+
+# Export students
+@app.post("/students/export")
+def export_students(
+    filters: Optional[StudentFilter] = None,
+    export_format: ExportFormat = Query(ExportFormat.NDJSON, alias="format"),
+):
+    """
+    Stream students matching the filters as NDJSON or CSV.
+    Password hashes are never exported.
+    """
+    def build_query(db: Session):
+        query = db.query(
+            sql_models.Student.student_id,
+            sql_models.Student.name,
+            sql_models.Student.class_id,
+            sql_models.Student.roll_no,
+            sql_models.Student.gender,
+            sql_models.Student.phone,
+            sql_models.Student.email,
+            sql_models.Student.status,
+            sql_models.Student.address,
+            sql_models.Student.date_of_birth,
+            sql_models.Student.created_at
+        )
+        return apply_student_filters(query, filters).order_by(sql_models.Student.student_id)
+    
+    return _export_response(build_query, export_format, "students")
+
+# Export attendance
+@app.post("/attendance/export")
+def export_attendance(
+    filters: Optional[AttendanceFilter] = None,
+    export_format: ExportFormat = Query(ExportFormat.NDJSON, alias="format"),
+):
+    """
+    Stream attendance records matching the filters as NDJSON or CSV.
+    Use this instead of /attendance/filter for end-of-term exports.
+    """
+    def build_query(db: Session):
+        query = db.query(
+            sql_models.Attendance.attendance_id,
+            sql_models.Attendance.class_id,
+            sql_models.Attendance.student_id,
+            sql_models.Attendance.date,
+            sql_models.Attendance.status
+        )
+        return apply_attendance_filters(query, filters).order_by(
+            sql_models.Attendance.date, sql_models.Attendance.attendance_id
+        )
+    
+    return _export_response(build_query, export_format, "attendance")
+
+# Export grades
+@app.post("/grades/export")
+def export_grades(
+    filters: Optional[GradeFilter] = None,
+    export_format: ExportFormat = Query(ExportFormat.NDJSON, alias="format"),
+):
+    """
+    Stream grades matching the filters as NDJSON or CSV
+    """
+    def build_query(db: Session):
+        query = db.query(
+            sql_models.Grade.grades_id,
+            sql_models.Grade.student_id,
+            sql_models.Grade.exam_id,
+            sql_models.Grade.marks,
+            sql_models.Grade.grade
+        )
+        return apply_grade_filters(query, filters).order_by(sql_models.Grade.grades_id)
+    
+    return _export_response(build_query, export_format, "grades")
+
+# Password hashing pool metrics
+@app.get("/metrics/password-hashing")
+def get_password_hashing_metrics():
+    """
+    Get queue depth and throughput of the password hashing process pool
+    """
+    return hash_pool_stats()
+
+# Entity lookup cache metrics
+@app.get("/metrics/entity-cache")
+def get_entity_cache_metrics():
+    """
+    Get size and hit/miss counters of the class, subject, teacher and
+    class subject lookup caches
+    """
+    return entity_cache.entity_cache_stats()
+
+# Search index metrics
+@app.get("/metrics/search-index")
+def get_search_index_metrics():
+    """
+    Get document and trigram counts and the age of each search index
+    """
+    return search_index.search_index_stats()
+
+# Notification push metrics
+@app.get("/metrics/notification-push")
+def get_notification_push_metrics():
+    """
+    Get open notification streams and published/delivered/dropped counters
+    """
+    return notification_push.broker.stats()
+
+# Response cache metrics
+@app.get("/metrics/response-cache")
+def get_response_cache_metrics():
+    """
+    Get size and hit/miss counters of the cached GET routes
+    """
+    return response_cache_stats()
+
+# Database connection pool metrics
+@app.get("/metrics/db-pool")
+def get_db_pool_metrics():
+    """
+    Get connection pool occupancy, checkout wait and hold time histograms
+    and connection lifetimes
+    """
+    metrics = {"sync": pool_stats(engine)}
+    if async_engine is not None:
+        metrics["async"] = pool_stats(async_engine.sync_engine)
+    return metrics
+
+# SQL profile routes, only registered with QUERY_PROFILER=1
+if query_profiler.QUERY_PROFILER:
+    # Per-request SQL profiles
+    @app.get("/debug/queries")
+    def get_query_profiles():
+        """
+        Get query count and SQL time per route, statements repeated within a
+        request (N+1 suspects) and the most recent sampled requests
+        """
+        return query_profiler.collector.snapshot()
+
+    # Reset SQL profiles
+    @app.delete("/debug/queries", status_code=204)
+    def clear_query_profiles():
+        """
+        Drop the collected SQL profiles
+        """
+        query_profiler.collector.clear()
@@ -0,0 +1,150 @@
+import argparse
+
+from sqlalchemy import MetaData, Table, create_engine, insert, inspect, select, text, update
+from sqlalchemy.orm import Session
+
+from database import engine
+import sql_models
+import attendance_summary
+import notification_feed
+
+# Schema migrations for databases created before a change to sql_models.
+# create_all() only creates missing tables, so anything added to an existing
+# table (indexes, columns) has to be applied here. Every step is idempotent
+# and safe to run on a fresh database too.
+
+def add_missing_indexes(bind=engine):
+    """
+    Create every index declared in sql_models that the database does not have yet
+    """
+    inspector = inspect(bind)
+    existing_tables = set(inspector.get_table_names())
+    created = []
+
+    for table in sql_models.Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            # create_all() will build the table together with its indexes
+            continue
+
+        existing_indexes = {index["name"] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing_indexes:
+                index.create(bind=bind)
+                created.append(index.name)
+
+    return created
+
+def build_attendance_summaries(bind=engine):
+    """
+    Fill the attendance summary table from existing attendance rows, once
+    """
+    with Session(bind=bind) as db:
+        if db.query(sql_models.Attendance_Summary).first():
+            return []
+        rows = attendance_summary.rebuild(db)
+        db.commit()
+    return [f"{rows} summary rows"] if rows else []
+
+def add_notification_feed_sequence(bind=engine):
+    """
+    Add notifications.feed_seq and number existing notifications in
+    created_at order, continuing the feed counter from there
+    """
+    applied = []
+    inspector = inspect(bind)
+    columns = {column["name"] for column in inspector.get_columns("notifications")}
+    if "feed_seq" not in columns:
+        with bind.begin() as conn:
+            conn.execute(text("ALTER TABLE notifications ADD COLUMN feed_seq BIGINT NULL"))
+        applied.append("notifications.feed_seq")
+    # The feed index on created_at is replaced by one on feed_seq
+    reflected = Table("notifications", MetaData(), autoload_with=bind)
+    for index in reflected.indexes:
+        if index.name == "ix_notifications_recipient_class_created":
+            index.drop(bind=bind)
+            applied.append(f"dropped {index.name}")
+
+    notification = sql_models.Notification
+    with Session(bind=bind) as db:
+        missing = db.scalars(
+            select(notification.notification_id)
+            .where(notification.feed_seq.is_(None))
+            .order_by(notification.created_at, notification.notification_id)
+        ).all()
+        if missing:
+            first = notification_feed.next_sequence(db, notification.__tablename__, len(missing))
+            # Bulk UPDATE by primary key
+            db.execute(update(notification), [
+                {"notification_id": notification_id, "feed_seq": first + offset}
+                for offset, notification_id in enumerate(missing)
+            ])
+            db.commit()
+            applied.append(f"{len(missing)} notifications numbered")
+    return applied
+
+MIGRATIONS = [
+    # Before the indexes, which include the new column
+    ("Add the notification feed sequence", add_notification_feed_sequence),
+    ("Add secondary and composite indexes", add_missing_indexes),
+    ("Build attendance summaries", build_attendance_summaries),
+]
+
+COPY_BATCH_SIZE = 5000
+
+def copy_database(source_url, bind=engine, batch_size=COPY_BATCH_SIZE):
+    """
+    Copy every table of an existing database into the (empty) configured one.
+    This is the path to BINARY(16) keys: point DATABASE_URL at a new database,
+    set BINARY_UUID_KEYS=1 and copy the old CHAR(36) database across. Keys are
+    converted by the column type; existing uuid4 keys stay valid, new rows
+    get time-ordered UUIDv7 keys.
+    """
+    source = create_engine(source_url)
+    source_metadata = MetaData()
+    source_metadata.reflect(bind=source)
+    copied = []
+
+    with source.connect() as source_conn, bind.begin() as conn:
+        for table in sql_models.Base.metadata.sorted_tables:
+            if table.name not in source_metadata.tables:
+                continue
+            if conn.execute(select(table).limit(1)).first():
+                raise RuntimeError(f"Target table {table.name} is not empty")
+
+            source_table = source_metadata.tables[table.name]
+            names = [column.name for column in table.columns if column.name in source_table.c]
+            # Parents come before children in sorted_tables, so foreign keys resolve
+            result = source_conn.execution_options(yield_per=batch_size).execute(
+                select(*(source_table.c[name] for name in names))
+            )
+            rows = 0
+            for batch in result.partitions():
+                conn.execute(insert(table), [dict(zip(names, row)) for row in batch])
+                rows += len(batch)
+            copied.append(f"{table.name}: {rows} rows")
+
+    source.dispose()
+    return copied
+
+def run_migrations(bind=engine):
+    for description, step in MIGRATIONS:
+        print(f"Running migration: {description}")
+        result = step(bind)
+        if result:
+            print(f"  applied: {', '.join(result)}")
+        else:
+            print("  nothing to do")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Migrate the database to the current schema")
+    parser.add_argument("--copy-from", metavar="DATABASE_URL",
+                        help="copy an existing database into the configured one first")
+    args = parser.parse_args()
+
+    sql_models.Base.metadata.create_all(bind=engine)
+    if args.copy_from:
+        print(f"Copying data from {args.copy_from}")
+        for line in copy_database(args.copy_from):
+            print(f"  {line}")
+    run_migrations()
+    print("Migrations complete!")
@@ -1,7 +1,8 @@
-from typing import Optional, List
+from typing import Optional, List, Generic, TypeVar
 from pydantic import BaseModel, Field, EmailStr, field_validator
 from enum import Enum
 from datetime import datetime, date, time
+import datetime as dt
 
 # Enum definitions
 class Gender(str, Enum):
@@ -77,6 +78,17 @@ class ItemStatus(str, Enum):
     LOST = "Lost"
     FOUND = "Found"
 
+class ExportFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+class SearchEntity(str, Enum):
+    STUDENTS = "students"
+    TEACHERS = "teachers"
+    SUBJECTS = "subjects"
+    CLASSES = "classes"
+    LOST_AND_FOUND = "lost_and_found"
+
 # Teacher model
 class Teacher(BaseModel):
     teacher_id: str = Field(..., description="Unique identifier for the teacher")
@@ -191,6 +203,61 @@ class Attendance(BaseModel):
     date: date
     status: AttendanceStatus
 
+# Attendance_Summary model
+class AttendanceSummary(BaseModel):
+    class_id: str = Field(..., description="Foreign key to classes")
+    date: date
+    present: int
+    absent: int
+    late: int
+    excused: int
+
+# Attendance percentage report models
+class StudentAttendanceRate(BaseModel):
+    student_id: str
+    name: str
+    roll_no: int
+    total_days: int
+    present: int
+    absent: int
+    late: int
+    excused: int
+    attendance_rate: Optional[float] = Field(None, description="Weighted percentage, null without records")
+
+class AttendanceReport(BaseModel):
+    class_id: str
+    date_from: Optional[date] = None
+    date_to: Optional[date] = None
+    late_weight: float
+    excused_weight: float
+    class_rate: Optional[float] = Field(None, description="Weighted percentage over all records of the class")
+    students: List[StudentAttendanceRate]
+
+# Exam analytics models
+class ExamStudentResult(BaseModel):
+    student_id: str
+    marks: float
+    rank: int = Field(..., description="1 for the highest marks, ties share a rank")
+    percentile: float
+
+class HistogramBin(BaseModel):
+    lower: float
+    upper: float
+    count: int
+
+class ExamAnalytics(BaseModel):
+    exam_id: str
+    total_marks: int
+    count: int
+    mean: Optional[float] = None
+    median: Optional[float] = None
+    std_dev: Optional[float] = None
+    min: Optional[float] = None
+    max: Optional[float] = None
+    mean_percentage: Optional[float] = None
+    histogram: List[HistogramBin]
+    students: List[ExamStudentResult]
+
 # Timetable model
 class Timetable(BaseModel):
     timetable_id: str = Field(..., description="Unique identifier for timetable entry")
@@ -206,6 +273,13 @@ class Timetable(BaseModel):
             raise ValueError('End time must be after start time')
         return v
 
+class TimetableGenerateResult(BaseModel):
+    created: int
+    replaced: int = Field(..., description="Existing entries of the scheduled classes that were removed")
+    classes: int
+    elapsed_ms: float
+    entries: List[Timetable]
+
 # Exams model
 class Exams(BaseModel):
     exam_id: str = Field(..., description="Unique identifier for exam")
@@ -295,6 +369,16 @@ class Notification(BaseModel):
             raise ValueError('Teacher ID is required when creator is Teacher')
         return v
 
+# Notification as listed in a feed, with its content
+class NotificationFeedItem(Notification):
+    content: str
+
+class NotificationFeed(BaseModel):
+    items: List[NotificationFeedItem]
+    before: Optional[str] = Field(None, description="Cursor for the next older page, null when there is none")
+    since: Optional[str] = Field(None, description="Cursor to poll for notifications newer than these")
+    more_since: bool = Field(False, description="More newer notifications are waiting, poll again right away")
+
 # Leave_Application model
 class Leave_Application(BaseModel):
     leave_id: str = Field(..., description="Unique identifier for leave application")
@@ -341,6 +425,21 @@ class Lost_and_Found(BaseModel):
     date_reported: date = Field(default_factory=date.today)
     status: ItemStatus
 
+# Page of results returned by filter endpoints when cursor pagination is requested
+T = TypeVar("T")
+
+class Page(BaseModel, Generic[T]):
+    items: List[T]
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page, null on the last page")
+
+# Search result: name is the student, teacher or subject name, "10-A" for
+# a class or the item name; detail is the email, subject code or item description
+class SearchHit(BaseModel):
+    type: SearchEntity
+    id: str
+    name: str
+    detail: Optional[str] = None
+
 # Filter models for POST requests
 class StudentFilter(BaseModel):
     student_id: Optional[str] = None
@@ -374,8 +473,9 @@ class AttendanceFilter(BaseModel):
     class_id: Optional[str] = None
     student_id: Optional[str] = None
     date: Optional[date] = None
-    date_from: Optional[date] = None
-    date_to: Optional[date] = None
+    # 'date' above shadows the type inside the class body
+    date_from: Optional[dt.date] = None
+    date_to: Optional[dt.date] = None
     status: Optional[AttendanceStatus] = None
 
 class ExamFilter(BaseModel):
@@ -383,8 +483,9 @@ class ExamFilter(BaseModel):
     class_id: Optional[str] = None
     subject_id: Optional[str] = None
     date: Optional[date] = None
-    date_from: Optional[date] = None
-    date_to: Optional[date] = None
+    # 'date' above shadows the type inside the class body
+    date_from: Optional[dt.date] = None
+    date_to: Optional[dt.date] = None
     name: Optional[str] = None
 
 class GradeFilter(BaseModel):
@@ -484,6 +585,15 @@ class AttendanceCreate(BaseModel):
     date: date
     status: AttendanceStatus
 
+class AttendanceBulkEntry(BaseModel):
+    student_id: str
+    status: AttendanceStatus
+
+class AttendanceBulkCreate(BaseModel):
+    class_id: str
+    date: date
+    entries: List[AttendanceBulkEntry] = Field(..., min_length=1)
+
 class TimetableCreate(BaseModel):
     class_sub_id: str
     day: DayOfWeek
@@ -497,6 +607,40 @@ class TimetableCreate(BaseModel):
             raise ValueError('End time must be after start time')
         return v
 
+class TimetablePeriod(BaseModel):
+    start_time: time
+    end_time: time
+    
+    @field_validator('end_time')
+    @classmethod
+    def validate_end_time(cls, v, values):
+        if 'start_time' in values.data and v <= values.data['start_time']:
+            raise ValueError('End time must be after start time')
+        return v
+
+class LessonRequirement(BaseModel):
+    class_sub_id: str
+    periods_per_week: int = Field(..., gt=0)
+
+class PeriodSlot(BaseModel):
+    day: DayOfWeek
+    period: int = Field(..., ge=0, description="Index into the request's periods")
+
+class TeacherConstraint(BaseModel):
+    teacher_id: str
+    unavailable: List[PeriodSlot] = []
+    max_periods_per_day: Optional[int] = Field(None, gt=0)
+
+class TimetableGenerate(BaseModel):
+    days: List[DayOfWeek] = Field(
+        default=[DayOfWeek.MONDAY, DayOfWeek.TUESDAY, DayOfWeek.WEDNESDAY, DayOfWeek.THURSDAY, DayOfWeek.FRIDAY],
+        min_length=1
+    )
+    periods: List[TimetablePeriod] = Field(..., min_length=1)
+    lessons: List[LessonRequirement] = Field(..., min_length=1)
+    teacher_constraints: List[TeacherConstraint] = []
+    max_subject_periods_per_day: Optional[int] = Field(None, gt=0)
+
 class ExamsCreate(BaseModel):
     class_id: str
     subject_id: str
@@ -510,6 +654,15 @@ class GradeCreate(BaseModel):
     marks: float = Field(..., ge=0)
     grade: str = Field(..., max_length=2)
 
+class GradeBulkEntry(BaseModel):
+    student_id: str
+    marks: float = Field(..., ge=0)
+    grade: str = Field(..., max_length=2)
+
+class GradeBulkCreate(BaseModel):
+    entries: List[GradeBulkEntry] = Field(..., min_length=1)
+    upsert: bool = Field(False, description="Overwrite existing grades instead of rejecting them")
+
 class AssignmentCreate(BaseModel):
     class_sub_id: str
     title: str = Field(..., max_length=255)
@@ -592,6 +745,35 @@ class LostAndFoundCreate(BaseModel):
     location: str = Field(..., max_length=255)
     status: ItemStatus
 
+# Results of bulk create endpoints, one row per submitted entry
+class BulkRowResult(BaseModel):
+    student_id: str
+    success: bool
+    id: Optional[str] = Field(None, description="ID of the created record")
+    detail: Optional[str] = Field(None, description="Why the row was rejected")
+
+class BulkResult(BaseModel):
+    created: int
+    updated: int = 0
+    failed: int
+    results: List[BulkRowResult]
+
+# Status of a background CSV import
+class ImportRowError(BaseModel):
+    line: Optional[int] = Field(None, description="CSV line number, header is line 1")
+    detail: str
+
+class ImportJob(BaseModel):
+    job_id: str
+    kind: str
+    status: str = Field(..., description="pending, running, done or failed")
+    processed: int
+    created: int
+    failed: int
+    errors: List[ImportRowError] = []
+    started_at: datetime
+    finished_at: Optional[datetime] = None
+
 # Update models for entities
 class StudentUpdate(BaseModel):
     name: Optional[str] = None
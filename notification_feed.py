@@ -0,0 +1,136 @@
+from sqlalchemy import event, func, insert, select, union, union_all, update
+from sqlalchemy.orm import Session, aliased
+
+import sql_models
+from pagination import encode_cursor, decode_cursor, MAX_PAGE_SIZE
+
+DEFAULT_FEED_SIZE = 20
+
+Notification = sql_models.Notification
+RecipientType = sql_models.RecipientType
+
+# Feed order is commit order, newest first. created_at and the UUIDv7 keys
+# come from the clocks of the writing processes, so a notification committed
+# late could sort behind a since cursor a client already has.
+SORT_KEY = [Notification.feed_seq]
+
+def next_sequence(db, name, count=1):
+    """
+    Reserve count values of a named counter and return the first one. The
+    counter row stays locked until the transaction ends, so a concurrent
+    writer waits for this one to commit before it gets higher values.
+    """
+    table = sql_models.Sequence.__table__
+    increment = update(table).where(table.c.name == name).values(value=table.c.value + count)
+    if db.execute(increment).rowcount == 0:
+        # First use: create the counter, unless a concurrent writer just did
+        db.execute(
+            insert(table).values(name=name, value=0)
+            .prefix_with("IGNORE", dialect="mysql")
+            .prefix_with("OR IGNORE", dialect="sqlite")
+        )
+        db.execute(increment)
+    return db.execute(select(table.c.value).where(table.c.name == name)).scalar_one() - count + 1
+
+@event.listens_for(Session, "before_flush")
+def _assign_feed_sequence(session, flush_context, instances):
+    new = [obj for obj in session.new if isinstance(obj, Notification) and obj.feed_seq is None]
+    if new:
+        first = next_sequence(session, Notification.__tablename__, len(new))
+        for offset, notification in enumerate(new):
+            notification.feed_seq = first + offset
+
+def student_audience(student):
+    """
+    (recipient, class_ids) pairs a student receives: everyone, all students
+    and notifications for the student's class
+    """
+    return [
+        (RecipientType.ALL, None),
+        (RecipientType.STUDENTS, None),
+        (RecipientType.SPECIFIC_CLASS, [student.class_id]),
+    ]
+
+def teacher_audience(teacher_id):
+    """
+    (recipient, class_ids) pairs a teacher receives. Classes are the ones
+    the teacher is class teacher of or teaches a subject in, resolved by
+    a subquery.
+    """
+    classes = union(
+        select(sql_models.Class.class_id).where(sql_models.Class.class_teacher_id == teacher_id),
+        select(sql_models.Class_Subject.class_id).where(sql_models.Class_Subject.subject_teacher_id == teacher_id),
+    )
+    return [
+        (RecipientType.ALL, None),
+        (RecipientType.TEACHERS, None),
+        (RecipientType.SPECIFIC_CLASS, select(classes.subquery().c.class_id)),
+    ]
+
+def _after(values):
+    return Notification.feed_seq > values[0]
+
+def _before(values):
+    return Notification.feed_seq < values[0]
+
+def feed(db, audience, limit=DEFAULT_FEED_SIZE, before=None, since=None):
+    """
+    One page of an audience's notifications, newest first.
+
+    Every (recipient, class_ids) branch is its own range read on the
+    (recipient, class_id, feed_seq) index, limited to
+    one page, and the branches are merged with UNION ALL in one statement.
+    before pages back in time; since returns only newer notifications,
+    oldest of them first when there are more than a page, so polling never
+    skips any.
+    """
+    limit = min(limit, MAX_PAGE_SIZE)
+    conditions = []
+    if before:
+        conditions.append(_before(decode_cursor(before, SORT_KEY)))
+    if since:
+        conditions.append(_after(decode_cursor(since, SORT_KEY)))
+    # Polling reads upwards from since, paging reads downwards from before
+    ascending = since is not None
+    order = SORT_KEY if ascending else [column.desc() for column in SORT_KEY]
+
+    branches = []
+    for recipient, class_ids in audience:
+        if class_ids is None:
+            # class_id IS NULL keeps feed_seq in the index range; the
+            # (normally empty) rest is read separately
+            class_conditions = [Notification.class_id.is_(None), Notification.class_id.is_not(None)]
+        else:
+            class_conditions = [Notification.class_id.in_(class_ids)]
+        for class_condition in class_conditions:
+            branch = select(Notification).where(Notification.recipient == recipient, class_condition, *conditions)
+            # Fetch one extra row to know whether another page exists
+            branches.append(select(branch.order_by(*order).limit(limit + 1).subquery()))
+
+    merged = aliased(Notification, union_all(*branches).subquery())
+    merged_order = [getattr(merged, column.key) for column in SORT_KEY]
+    if not ascending:
+        merged_order = [column.desc() for column in merged_order]
+    rows = db.scalars(select(merged).order_by(*merged_order).limit(limit + 1)).all()
+
+    more = len(rows) > limit
+    rows = rows[:limit]
+    if ascending:
+        rows.reverse()
+
+    return {
+        "items": rows,
+        # Older page; when polling, older items were returned before
+        "before": encode_cursor(rows[-1], SORT_KEY) if more and not ascending else None,
+        # Poll with this for anything newer than what was returned
+        "since": encode_cursor(rows[0], SORT_KEY) if rows else since,
+        "more_since": more and ascending,
+    }
+
+def head(db):
+    """
+    since cursor of the newest notification of any audience, for following
+    the feed from now on
+    """
+    latest = db.scalar(select(func.max(Notification.feed_seq)))
+    return encode_cursor(Notification(feed_seq=latest or 0), SORT_KEY)
@@ -0,0 +1,153 @@
+import asyncio
+import importlib
+import os
+from collections import defaultdict
+
+import sql_models
+import notification_feed
+from models import NotificationFeedItem
+from pagination import encode_cursor
+
+# Pushes committed notifications to open /notifications/stream connections.
+# Connections subscribe to topics (recipient type, or class:<id>) on a
+# broker. The default broker is in-process, so it only reaches clients of
+# the worker that created the notification; multi-worker deployments plug
+# in a shared one (e.g. Redis pub/sub) with NOTIFICATION_BROKER=module:Class.
+NOTIFICATION_BROKER = os.getenv("NOTIFICATION_BROKER", "")
+# Messages buffered per connection before a slow client is disconnected;
+# it catches up from Last-Event-ID when it reconnects
+NOTIFICATION_QUEUE_SIZE = int(os.getenv("NOTIFICATION_QUEUE_SIZE", 64))
+# Seconds between SSE keep-alive comments on an idle connection
+NOTIFICATION_KEEPALIVE = float(os.getenv("NOTIFICATION_KEEPALIVE", 15))
+
+# Delivered to idle subscriptions every NOTIFICATION_KEEPALIVE seconds
+PING = "ping"
+
+def topic(recipient, class_id=None):
+    if recipient == sql_models.RecipientType.SPECIFIC_CLASS:
+        return f"class:{class_id}"
+    return recipient.value
+
+def audience_topics(db, audience):
+    """
+    Topics of a notification_feed audience; class ids given as a subquery
+    are resolved here
+    """
+    topics = set()
+    for recipient, class_ids in audience:
+        if class_ids is None:
+            topics.add(topic(recipient))
+        else:
+            class_ids = class_ids if isinstance(class_ids, list) else db.scalars(class_ids).all()
+            topics.update(topic(recipient, class_id) for class_id in class_ids)
+    return topics
+
+def message(notification):
+    """
+    (feed position, SSE event) of a notification. The event id is the feed
+    cursor, so Last-Event-ID resumes the feed where the client left off.
+    """
+    cursor = encode_cursor(notification, notification_feed.SORT_KEY)
+    data = NotificationFeedItem.model_validate(notification, from_attributes=True).model_dump_json()
+    return notification.feed_seq, f"id: {cursor}\nevent: notification\ndata: {data}\n\n"
+
+class Subscription:
+    def __init__(self, topics, maxsize):
+        self.topics = topics
+        self.queue = asyncio.Queue(maxsize)
+
+    async def get(self):
+        """
+        Next message: a published one, PING, or None once the broker
+        dropped the subscription
+        """
+        return await self.queue.get()
+
+class LocalBroker:
+    """
+    In-process broker. Subscriptions live on the event loop; publish may be
+    called from any thread (sync endpoints run in the threadpool) and hands
+    the whole fan-out to the loop with one call. A replacement broker needs
+    the same subscribe, unsubscribe, publish and stats methods, and has to
+    deliver PING to idle subscriptions.
+    """
+    def __init__(self, queue_size=NOTIFICATION_QUEUE_SIZE, keepalive=NOTIFICATION_KEEPALIVE):
+        self.queue_size = queue_size
+        self.keepalive = keepalive
+        self.published = 0
+        self.delivered = 0
+        self.dropped = 0
+        self._topics = defaultdict(set)
+        self._subscriptions = set()
+        self._loop = None
+
+    def subscribe(self, topics):
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            # One timer for all connections instead of one per connection
+            loop.call_later(self.keepalive, self._ping, loop)
+        subscription = Subscription(frozenset(topics), self.queue_size)
+        for name in subscription.topics:
+            self._topics[name].add(subscription)
+        self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        if subscription not in self._subscriptions:
+            return
+        self._subscriptions.discard(subscription)
+        for name in subscription.topics:
+            subscribers = self._topics[name]
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._topics[name]
+
+    def _ping(self, loop):
+        if loop is not self._loop:
+            return
+        for subscription in self._subscriptions:
+            if subscription.queue.empty():
+                subscription.queue.put_nowait(PING)
+        loop.call_later(self.keepalive, self._ping, loop)
+
+    def publish(self, name, message):
+        loop = self._loop
+        if loop is not None and not loop.is_closed():
+            self.published += 1
+            loop.call_soon_threadsafe(self._deliver, name, message)
+
+    def _deliver(self, name, message):
+        for subscription in list(self._topics.get(name, ())):
+            try:
+                subscription.queue.put_nowait(message)
+                self.delivered += 1
+            except asyncio.QueueFull:
+                self.unsubscribe(subscription)
+                self.dropped += 1
+                while not subscription.queue.empty():
+                    subscription.queue.get_nowait()
+                subscription.queue.put_nowait(None)
+
+    def stats(self):
+        return {
+            "subscriptions": len(self._subscriptions),
+            "topics": len(self._topics),
+            "published": self.published,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+        }
+
+def _load_broker(path):
+    if not path:
+        return LocalBroker()
+    module_name, _, class_name = path.partition(":")
+    return getattr(importlib.import_module(module_name), class_name)()
+
+broker = _load_broker(NOTIFICATION_BROKER)
+
+def publish_notification(notification):
+    """
+    Push a committed notification to its subscribers
+    """
+    broker.publish(topic(notification.recipient, notification.class_id), message(notification))
@@ -0,0 +1,82 @@
+import base64
+import json
+from datetime import date, datetime, time
+
+from fastapi import HTTPException
+from sqlalchemy import and_, or_
+
+# Upper bound for a single page, whatever the client asks for
+MAX_PAGE_SIZE = 1000
+
+def _to_json(value):
+    # Enums and dates are not JSON serializable as-is
+    if hasattr(value, "value"):
+        return value.value
+    if isinstance(value, (date, datetime, time)):
+        return value.isoformat()
+    return value
+
+def _from_json(column, value):
+    if value is None:
+        return None
+    python_type = column.type.python_type
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is date:
+        return date.fromisoformat(value)
+    if python_type is time:
+        return time.fromisoformat(value)
+    if python_type is int:
+        return int(value)
+    return value
+
+def encode_cursor(row, columns):
+    """
+    Build an opaque cursor from the sort key values of the last row of a page
+    """
+    values = [_to_json(getattr(row, column.key)) for column in columns]
+    raw = json.dumps(values, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor, columns):
+    """
+    Turn a cursor produced by encode_cursor back into sort key values
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError("cursor does not match sort key")
+        return [_from_json(column, value) for column, value in zip(columns, values)]
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+
+def keyset_paginate(query, columns, limit, after=None):
+    """
+    Apply keyset pagination to a query.
+
+    Rows are ordered by the given columns (the last one must be unique) and
+    only rows strictly after the cursor are read, so every page costs the same
+    index range scan no matter how deep it is. Returns a dict with the page
+    items and the cursor for the next page (None on the last page).
+    """
+    limit = min(limit, MAX_PAGE_SIZE)
+
+    if after:
+        values = decode_cursor(after, columns)
+        # Expanded row-value comparison: (a, b) > (x, y)  <=>  a > x OR (a = x AND b > y)
+        conditions = []
+        for i, column in enumerate(columns):
+            equal_prefix = [columns[j] == values[j] for j in range(i)]
+            conditions.append(and_(*equal_prefix, column > values[i]))
+        query = query.filter(or_(*conditions))
+
+    # Fetch one extra row to know whether another page exists
+    rows = query.order_by(*columns).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1], columns)
+
+    return {"items": rows, "next_cursor": next_cursor}
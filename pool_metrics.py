@@ -0,0 +1,151 @@
+import threading
+import time
+import weakref
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+# Histogram bucket upper bounds
+WAIT_BUCKETS_MS = [1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000]
+HOLD_BUCKETS_MS = [1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000, 30000]
+LIFETIME_BUCKETS_S = [1, 10, 60, 300, 900, 1800, 3600, 14400]
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        index = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                index = i
+                break
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.total += value
+            self.max = max(self.max, value)
+
+    def snapshot(self):
+        with self._lock:
+            labels = [f"<={bound}" for bound in self.buckets] + [f">{self.buckets[-1]}"]
+            return {
+                "count": self.count,
+                "sum": round(self.total, 3),
+                "mean": round(self.total / self.count, 3) if self.count else 0.0,
+                "max": round(self.max, 3),
+                "buckets": dict(zip(labels, self.counts)),
+            }
+
+class PoolMetrics:
+    def __init__(self):
+        self.checkout_wait_ms = Histogram(WAIT_BUCKETS_MS)
+        self.checkout_hold_ms = Histogram(HOLD_BUCKETS_MS)
+        self.connection_lifetime_s = Histogram(LIFETIME_BUCKETS_S)
+        self.timeouts = 0
+        self.connects = 0
+        self.closes = 0
+
+# Metrics per engine, so they survive engine.dispose() replacing the pool
+_metrics = weakref.WeakKeyDictionary()
+
+def metrics_for(engine) -> PoolMetrics:
+    metrics = _metrics.get(engine)
+    if metrics is None:
+        metrics = _metrics[engine] = PoolMetrics()
+    return metrics
+
+class _TimedPool:
+    """
+    Queue pool mixin timing how long callers wait for a connection.
+    SQLAlchemy has no event fired before a checkout starts, so the wait is
+    measured around the pool's internal get.
+    """
+    # Set by instrument(); handed on to the pool that replaces this one
+    metrics = None
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+    def _do_get(self):
+        if self.metrics is None:
+            return super()._do_get()
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            self.metrics.timeouts += 1
+            raise
+        finally:
+            self.metrics.checkout_wait_ms.observe((time.perf_counter() - started) * 1000)
+
+def timed_pool_class(pool_class=QueuePool):
+    """
+    Subclass a queue pool to time checkout waits, see _TimedPool
+    """
+    return type(f"Timed{pool_class.__name__}", (_TimedPool, pool_class), {})
+
+def instrument(engine):
+    """
+    Attach pool event listeners that track connection hold time and lifetime.
+    They are registered on the engine, so a recreated pool keeps them.
+    """
+    metrics = metrics_for(engine)
+    if isinstance(engine.pool, _TimedPool):
+        engine.pool.metrics = metrics
+
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        connection_record.info["connected_at"] = time.monotonic()
+        metrics.connects += 1
+
+    @event.listens_for(engine, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        connection_record.info["checked_out_at"] = time.monotonic()
+
+    @event.listens_for(engine, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        checked_out_at = connection_record.info.pop("checked_out_at", None) if connection_record else None
+        if checked_out_at is not None:
+            metrics.checkout_hold_ms.observe((time.monotonic() - checked_out_at) * 1000)
+
+    @event.listens_for(engine, "close")
+    def on_close(dbapi_connection, connection_record):
+        connected_at = connection_record.info.get("connected_at") if connection_record else None
+        if connected_at is not None:
+            metrics.connection_lifetime_s.observe(time.monotonic() - connected_at)
+        metrics.closes += 1
+
+def pool_stats(engine) -> dict:
+    """
+    Current pool occupancy plus the collected histograms
+    """
+    pool = engine.pool
+    metrics = metrics_for(engine)
+    stats = {"pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        stats.update({
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow_in_use": max(pool.overflow(), 0),
+            "max_overflow": pool._max_overflow,
+            "timeout": pool.timeout(),
+        })
+    stats.update({
+        "timeouts": metrics.timeouts,
+        "connects": metrics.connects,
+        "closes": metrics.closes,
+        "checkout_wait_ms": metrics.checkout_wait_ms.snapshot(),
+        "checkout_hold_ms": metrics.checkout_hold_ms.snapshot(),
+        "connection_lifetime_s": metrics.connection_lifetime_s.snapshot(),
+    })
+    return stats
@@ -0,0 +1,77 @@
+import os
+from functools import lru_cache
+from typing import List
+
+from fastapi import HTTPException, Response
+from pydantic import TypeAdapter, create_model
+
+from models import Page
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Fast path for the filter endpoints' full responses: select plain columns
+# instead of ORM rows and encode them straight to JSON bytes with orjson
+# (TypeAdapter.dump_json without it), instead of response_model validation
+# and FastAPI's encoder. The output is byte for byte the same; it is opt-in
+# while clients are checked against it.
+FAST_JSON_RESPONSES = os.getenv("FAST_JSON_RESPONSES", "0").lower() in ("1", "true", "yes")
+
+def parse_fields(fields, model):
+    """
+    Turn a comma-separated fields parameter into a tuple of field names of
+    model. Without fields this is every field when the fast path is on, and
+    None (whole ORM rows through the response_model) otherwise.
+    """
+    if fields is None:
+        return tuple(model.model_fields) if FAST_JSON_RESPONSES else None
+    names = tuple(dict.fromkeys(name.strip() for name in fields.split(",") if name.strip()))
+    unknown = [name for name in names if name not in model.model_fields]
+    if unknown or not names:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(unknown)}" if unknown else "No fields requested"
+        )
+    return names
+
+@lru_cache(maxsize=None)
+def _adapters(model, names):
+    if names != tuple(model.model_fields):
+        # Same field definitions as the full model, restricted to names
+        model = create_model(
+            f"{model.__name__}Projection",
+            **{name: (model.model_fields[name].annotation, model.model_fields[name]) for name in names}
+        )
+    return TypeAdapter(List[model]), TypeAdapter(Page[model])
+
+def select_fields(query, entity, names, extra_columns=()):
+    """
+    Select only the requested columns (and extra ones such as the sort key)
+    instead of whole ORM rows
+    """
+    columns = [getattr(entity, name) for name in names]
+    columns += [column for column in extra_columns if column.key not in names]
+    return query.with_entities(*columns)
+
+def _rows_as_dicts(rows, names):
+    # Extra columns come after the requested ones, so zip drops them
+    return [dict(zip(names, row)) for row in rows]
+
+def json_response(model, result, names):
+    """
+    Encode a list or a page of rows from select_fields as JSON holding only
+    names. Field names map one to one to columns on the models used here.
+    """
+    if orjson is not None:
+        if isinstance(result, dict):
+            content = {"items": _rows_as_dicts(result["items"], names), "next_cursor": result["next_cursor"]}
+        else:
+            content = _rows_as_dicts(result, names)
+        body = orjson.dumps(content)
+    else:
+        items_adapter, page_adapter = _adapters(model, names)
+        adapter = page_adapter if isinstance(result, dict) else items_adapter
+        body = adapter.dump_json(adapter.validate_python(result, from_attributes=True), by_alias=True)
+    return Response(content=body, media_type="application/json")
@@ -0,0 +1,195 @@
+import os
+import random
+import re
+import threading
+import time
+from collections import Counter, deque
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Per-request SQL profile: statement count, SQL time, slowest statement and
+# statements repeated within the request (the N+1 pattern of lazy loads in
+# a loop). Off by default: profiles contain SQL text and timings, so turn it
+# on only where GET /debug/queries is not reachable by API clients.
+# QUERY_PROFILER=1 profiles requests and registers GET/DELETE /debug/queries
+QUERY_PROFILER = os.getenv("QUERY_PROFILER", "0").lower() in ("1", "true", "yes")
+# QUERY_PROFILE_SERVER_TIMING=1 also adds a Server-Timing header to responses
+QUERY_PROFILE_SERVER_TIMING = os.getenv("QUERY_PROFILE_SERVER_TIMING", "0").lower() in ("1", "true", "yes")
+# Fraction of requests kept for /debug/queries
+QUERY_PROFILE_SAMPLE_RATE = float(os.getenv("QUERY_PROFILE_SAMPLE_RATE", 1.0))
+# Number of recent request profiles kept
+QUERY_PROFILE_HISTORY = int(os.getenv("QUERY_PROFILE_HISTORY", 200))
+# Runs of the same statement in one request from which it counts as repeated
+QUERY_REPEAT_THRESHOLD = int(os.getenv("QUERY_REPEAT_THRESHOLD", 5))
+STATEMENT_PREVIEW = 500
+
+_current = ContextVar("query_profile", default=None)
+
+# Expanded IN lists differ in length only: IN (?, ?, ?) -> IN (...)
+_PLACEHOLDER = r"(?:\?|%s|%\(\w+\)s|:\w+)"
+_PLACEHOLDER_LIST = re.compile(rf"\(\s*{_PLACEHOLDER}(?:\s*,\s*{_PLACEHOLDER})*\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+def statement_pattern(statement):
+    return _PLACEHOLDER_LIST.sub("(...)", _WHITESPACE.sub(" ", statement).strip())
+
+class QueryProfile:
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.slowest_ms = 0.0
+        self.slowest = None
+        self.statements = Counter()
+
+    def record(self, statement, elapsed_ms):
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.statements[statement] += 1
+        if elapsed_ms > self.slowest_ms:
+            self.slowest_ms = elapsed_ms
+            self.slowest = statement
+
+    def repeated(self):
+        """
+        Statement patterns run at least QUERY_REPEAT_THRESHOLD times,
+        most frequent first
+        """
+        patterns = Counter()
+        for statement, count in self.statements.items():
+            patterns[statement_pattern(statement)] += count
+        return [(pattern, count) for pattern, count in patterns.most_common() if count >= QUERY_REPEAT_THRESHOLD]
+
+    def server_timing(self):
+        metrics = [f'db;dur={self.total_ms:.2f};desc="{self.count} queries"']
+        if self.slowest is not None:
+            metrics.append(f"db-slowest;dur={self.slowest_ms:.2f}")
+        repeated = self.repeated()
+        if repeated:
+            metrics.append(f'db-repeated;desc="{len(repeated)} statements, up to {repeated[0][1]}x"')
+        return ", ".join(metrics)
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = _current.get()
+    started = conn.info.get("query_started")
+    if profile is not None and started:
+        profile.record(statement, (time.perf_counter() - started.pop()) * 1000)
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(exception_context):
+    # after_cursor_execute does not run for a failed statement
+    conn = exception_context.connection
+    started = conn.info.get("query_started") if conn is not None else None
+    if started:
+        started.pop()
+
+class ProfileCollector:
+    """
+    Recent sampled request profiles and per-route totals
+    """
+    def __init__(self, history=QUERY_PROFILE_HISTORY):
+        self.recent = deque(maxlen=history)
+        self.routes = {}
+        self._lock = threading.Lock()
+
+    def add(self, method, route, status, profile):
+        repeated = profile.repeated()
+        with self._lock:
+            self.recent.append({
+                "method": method,
+                "route": route,
+                "status": status,
+                "queries": profile.count,
+                "sql_ms": round(profile.total_ms, 3),
+                "slowest_ms": round(profile.slowest_ms, 3),
+                "slowest": profile.slowest[:STATEMENT_PREVIEW] if profile.slowest else None,
+                "repeated": [{"statement": pattern[:STATEMENT_PREVIEW], "count": count} for pattern, count in repeated],
+            })
+            totals = self.routes.setdefault(f"{method} {route}", {
+                "requests": 0, "queries": 0, "max_queries": 0, "sql_ms": 0.0, "with_repeats": 0, "repeated": Counter(),
+            })
+            totals["requests"] += 1
+            totals["queries"] += profile.count
+            totals["max_queries"] = max(totals["max_queries"], profile.count)
+            totals["sql_ms"] += profile.total_ms
+            if repeated:
+                totals["with_repeats"] += 1
+                totals["repeated"].update(pattern for pattern, _ in repeated)
+
+    def snapshot(self):
+        with self._lock:
+            routes = {}
+            for name, totals in self.routes.items():
+                routes[name] = {
+                    "requests": totals["requests"],
+                    "mean_queries": round(totals["queries"] / totals["requests"], 2),
+                    "max_queries": totals["max_queries"],
+                    "mean_sql_ms": round(totals["sql_ms"] / totals["requests"], 3),
+                    "requests_with_repeats": totals["with_repeats"],
+                    # Patterns and the number of requests they repeated in
+                    "repeated": [
+                        {"statement": pattern[:STATEMENT_PREVIEW], "requests": count}
+                        for pattern, count in totals["repeated"].most_common(5)
+                    ],
+                }
+            # Routes with the most queries per request first
+            routes = dict(sorted(routes.items(), key=lambda item: -item[1]["mean_queries"]))
+            return {
+                "sample_rate": QUERY_PROFILE_SAMPLE_RATE,
+                "repeat_threshold": QUERY_REPEAT_THRESHOLD,
+                "routes": routes,
+                "recent": list(self.recent),
+            }
+
+    def clear(self):
+        with self._lock:
+            self.recent.clear()
+            self.routes.clear()
+
+collector = ProfileCollector()
+
+class QueryProfilerMiddleware:
+    """
+    ASGI middleware profiling the SQL run while handling each request. The
+    Server-Timing header covers statements run before the response starts;
+    those of a streamed body are still collected.
+    """
+    def __init__(self, app, server_timing=QUERY_PROFILE_SERVER_TIMING):
+        self.app = app
+        self.server_timing = server_timing
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        profile = QueryProfile()
+        token = _current.set(profile)
+        # Kept when an unhandled error ends the request before a response
+        status = 500
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if self.server_timing:
+                    headers = list(message.get("headers", []))
+                    headers.append((b"server-timing", profile.server_timing().encode()))
+                    message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            if random.random() < QUERY_PROFILE_SAMPLE_RATE:
+                # The router stores the matched route in the scope
+                route = getattr(scope.get("route"), "path", scope["path"])
+                collector.add(scope["method"], route, status, profile)
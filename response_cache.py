@@ -0,0 +1,76 @@
+import hashlib
+import os
+
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+
+from cache import TTLCache, on_tables_changed
+
+RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", 300))
+RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", 2048))
+
+# name -> ResponseCache, for the metrics endpoint
+response_caches = {}
+
+def make_etag(body):
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+def etag_matches(request, etag):
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison, so W/ prefixes are ignored
+    return any(tag.strip().removeprefix("W/") == etag for tag in header.split(","))
+
+class ResponseCache:
+    """
+    Encoded JSON bodies of one GET route, keyed by its parameters, with a
+    strong ETag per body. Any committed write to one of the route's tables
+    drops every entry.
+    """
+    def __init__(self, name, response_type, tables, maxsize=RESPONSE_CACHE_SIZE, ttl=RESPONSE_CACHE_TTL):
+        self.name = name
+        self.adapter = TypeAdapter(response_type)
+        self.entries = TTLCache(maxsize=maxsize, ttl=ttl)
+        # Bumped on invalidation, so a response built from rows read before a
+        # write is not stored after that write cleared the cache
+        self.version = 0
+        on_tables_changed(*tables)(self.invalidate)
+        response_caches[name] = self
+
+    def invalidate(self, tables=None):
+        self.version += 1
+        self.entries.clear()
+
+    def respond(self, request, body, etag):
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if etag_matches(request, etag):
+            return Response(status_code=304, headers=headers)
+        return Response(content=body, media_type="application/json", headers=headers)
+
+    def get(self, request: Request, key):
+        """
+        Cached response for key (304 if the client has it), or None
+        """
+        entry = self.entries.get(key)
+        if entry is None:
+            request.state.response_cache_version = self.version
+            return None
+        return self.respond(request, *entry)
+
+    def put(self, request: Request, key, value):
+        """
+        Encode value (ORM objects or dicts) like the route's response_model
+        would, store it unless the cache was invalidated since get(), and
+        return the response
+        """
+        body = self.adapter.dump_json(self.adapter.validate_python(value, from_attributes=True))
+        etag = make_etag(body)
+        if getattr(request.state, "response_cache_version", None) == self.version:
+            self.entries.set(key, (body, etag))
+        return self.respond(request, body, etag)
+
+def response_cache_stats():
+    return {name: cache.entries.stats() for name, cache in response_caches.items()}
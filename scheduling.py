@@ -0,0 +1,301 @@
+import random
+
+from sqlalchemy import or_, select
+
+import sql_models
+
+def find_conflict(db, class_id, teacher_id, day, start_time, end_time, exclude_id=None):
+    """
+    Return the first timetable slot overlapping [start_time, end_time) on day
+    that belongs to the same class or is taught by the same teacher, or None.
+    One round trip; the day/start_time index narrows the scan to slots
+    starting before end_time.
+    """
+    timetable = sql_models.Timetable
+    class_subject = sql_models.Class_Subject
+    statement = select(
+        timetable.timetable_id,
+        class_subject.class_id,
+        class_subject.subject_teacher_id
+    ).join(
+        class_subject, class_subject.class_sub_id == timetable.class_sub_id
+    ).where(
+        timetable.day == day,
+        timetable.start_time < end_time,
+        timetable.end_time > start_time,
+        or_(class_subject.class_id == class_id, class_subject.subject_teacher_id == teacher_id)
+    )
+    if exclude_id is not None:
+        statement = statement.where(timetable.timetable_id != exclude_id)
+    return db.execute(statement.limit(1)).first()
+
+def conflict_detail(conflict, class_id):
+    if conflict.class_id == class_id:
+        return "Time slot conflicts with an existing entry"
+    return "Teacher is already teaching another class in this time slot"
+
+# Weekly timetable solver. Slots are numbered day * n_periods + period and
+# every set of slots is an int bitmask, so intersecting the class, teacher and
+# per-day limits of a lesson is a handful of integer ANDs.
+#
+# Lessons are classes' edges to teachers and slots are colours, which makes a
+# clash-free timetable a bipartite edge colouring. Periods are placed most
+# constrained lesson first; when a lesson has no slot left, an alternating
+# (Kempe) chain of lessons is swapped between two slots to free one, which
+# always succeeds without the extra constraints (Konig's theorem) and is
+# re-checked against them otherwise. If no chain helps, a lesson of the same
+# teacher is evicted back into the queue, up to a budget per attempt.
+
+class ScheduleError(ValueError):
+    pass
+
+SOLVER_ATTEMPTS = 5
+# Evictions allowed per attempt, as a multiple of the periods to place
+SOLVER_EVICTIONS_PER_PERIOD = 5
+
+def _popcount(mask):
+    return bin(mask).count("1")
+
+def _bits(mask):
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+def solve_timetable(n_days, n_periods, lessons, teacher_blocked=None, teacher_max_per_day=None,
+                    max_subject_per_day=None, attempts=SOLVER_ATTEMPTS):
+    """
+    Place lessons on a weekly grid without class or teacher clashes.
+
+    lessons: (key, class_id, teacher_id, periods_per_week) tuples
+    teacher_blocked: teacher_id -> iterable of (day, period) the teacher cannot teach
+    teacher_max_per_day: teacher_id -> most periods the teacher teaches a day
+    max_subject_per_day: most periods of one lesson a class gets a day
+
+    Returns key -> sorted list of (day, period); raises ScheduleError when
+    the demand cannot fit or no attempt finds a timetable.
+    """
+    teacher_blocked = teacher_blocked or {}
+    teacher_max_per_day = teacher_max_per_day or {}
+    n_slots = n_days * n_periods
+    all_slots = (1 << n_slots) - 1
+
+    class_need = {}
+    teacher_need = {}
+    for key, class_id, teacher_id, periods in lessons:
+        class_need[class_id] = class_need.get(class_id, 0) + periods
+        teacher_need[teacher_id] = teacher_need.get(teacher_id, 0) + periods
+
+    teacher_allowed = {}
+    for teacher_id in teacher_need:
+        mask = all_slots
+        for day, period in teacher_blocked.get(teacher_id, ()):
+            mask &= ~(1 << (day * n_periods + period))
+        teacher_allowed[teacher_id] = mask
+
+    # Cheap pigeonhole checks before searching
+    for class_id, need in class_need.items():
+        if need > n_slots:
+            raise ScheduleError(f"Class {class_id} needs {need} periods but the grid has {n_slots}")
+    for teacher_id, need in teacher_need.items():
+        capacity = _popcount(teacher_allowed[teacher_id])
+        if teacher_id in teacher_max_per_day:
+            capacity = min(capacity, teacher_max_per_day[teacher_id] * n_days)
+        if need > capacity:
+            raise ScheduleError(f"Teacher {teacher_id} needs {need} periods but is available for {capacity}")
+    if max_subject_per_day:
+        for key, class_id, teacher_id, periods in lessons:
+            if periods > max_subject_per_day * n_days:
+                raise ScheduleError(f"Lesson {key} needs {periods} periods, more than {max_subject_per_day} a day allows")
+
+    for attempt in range(attempts):
+        solver = _Solver(n_days, n_periods, lessons, teacher_allowed, teacher_max_per_day,
+                         max_subject_per_day, random.Random(attempt))
+        if solver.run():
+            return {
+                lessons[index][0]: sorted((slot // n_periods, slot % n_periods) for slot in slots)
+                for index, slots in enumerate(solver.placed)
+            }
+    raise ScheduleError("No conflict-free timetable found")
+
+class _Solver:
+    def __init__(self, n_days, n_periods, lessons, teacher_allowed, teacher_max_per_day,
+                 max_subject_per_day, rng):
+        self.n_periods = n_periods
+        self.lessons = lessons
+        self.teacher_allowed = teacher_allowed
+        self.teacher_cap = {t: teacher_max_per_day.get(t, n_periods) for t in teacher_allowed}
+        self.subject_cap = max_subject_per_day or n_periods
+        self.rng = rng
+        self.day_masks = [((1 << n_periods) - 1) << (day * n_periods) for day in range(n_days)]
+
+        # Occupancy: (class or teacher, slot) -> lesson index
+        self.class_at = {}
+        self.teacher_at = {}
+        self.class_used = {lesson[1]: 0 for lesson in lessons}
+        self.teacher_used = {t: 0 for t in teacher_allowed}
+        self.teacher_day = {t: [0] * n_days for t in teacher_allowed}
+        self.lesson_day = [[0] * n_days for _ in lessons]
+        self.left = [lesson[3] for lesson in lessons]
+        self.placed = [set() for _ in lessons]
+        self.tie_break = [rng.random() for _ in lessons]
+
+    def open_days(self, counts, cap):
+        mask = 0
+        for day, count in enumerate(counts):
+            if count < cap:
+                mask |= self.day_masks[day]
+        return mask
+
+    def domain(self, index):
+        _, class_id, teacher_id, _ = self.lessons[index]
+        return (~self.class_used[class_id] & ~self.teacher_used[teacher_id] & self.teacher_allowed[teacher_id]
+                & self.open_days(self.teacher_day[teacher_id], self.teacher_cap[teacher_id])
+                & self.open_days(self.lesson_day[index], self.subject_cap))
+
+    def place(self, index, slot):
+        _, class_id, teacher_id, _ = self.lessons[index]
+        day = slot // self.n_periods
+        self.class_at[class_id, slot] = index
+        self.teacher_at[teacher_id, slot] = index
+        self.class_used[class_id] |= 1 << slot
+        self.teacher_used[teacher_id] |= 1 << slot
+        self.teacher_day[teacher_id][day] += 1
+        self.lesson_day[index][day] += 1
+        self.placed[index].add(slot)
+
+    def remove(self, index, slot):
+        _, class_id, teacher_id, _ = self.lessons[index]
+        day = slot // self.n_periods
+        del self.class_at[class_id, slot]
+        del self.teacher_at[teacher_id, slot]
+        self.class_used[class_id] &= ~(1 << slot)
+        self.teacher_used[teacher_id] &= ~(1 << slot)
+        self.teacher_day[teacher_id][day] -= 1
+        self.lesson_day[index][day] -= 1
+        self.placed[index].discard(slot)
+
+    def valid(self, index, slot):
+        _, class_id, teacher_id, _ = self.lessons[index]
+        day = slot // self.n_periods
+        return (self.teacher_allowed[teacher_id] >> slot & 1
+                and self.teacher_day[teacher_id][day] <= self.teacher_cap[teacher_id]
+                and self.lesson_day[index][day] <= self.subject_cap)
+
+    def swap_chain(self, teacher_id, a, b):
+        """
+        Swap slots a and b along the alternating chain that starts at the
+        teacher's lesson in slot a. Returns the moved lessons, or None
+        (with nothing changed) if a moved lesson would break a constraint.
+        """
+        chain = []
+        node, is_teacher, slot = teacher_id, True, a
+        while True:
+            index = (self.teacher_at if is_teacher else self.class_at).get((node, slot))
+            if index is None:
+                break
+            chain.append((index, slot))
+            _, class_id, other_teacher, _ = self.lessons[index]
+            node, is_teacher = (class_id, False) if is_teacher else (other_teacher, True)
+            slot = b if slot == a else a
+
+        for index, slot in chain:
+            self.remove(index, slot)
+        for index, slot in chain:
+            self.place(index, b if slot == a else a)
+        if all(self.valid(index, b if slot == a else a) for index, slot in chain):
+            return chain
+        for index, slot in chain:
+            self.remove(index, b if slot == a else a)
+        for index, slot in chain:
+            self.place(index, slot)
+        return None
+
+    def repair(self, index):
+        """
+        Free a slot for a lesson with an empty domain through a Kempe chain
+        """
+        _, class_id, teacher_id, _ = self.lessons[index]
+        # a: free for the class and allowed for this lesson, taken by the teacher
+        wanted = (~self.class_used[class_id] & self.teacher_allowed[teacher_id]
+                  & self.open_days(self.lesson_day[index], self.subject_cap))
+        # b: free and allowed for the teacher
+        spare = ~self.teacher_used[teacher_id] & self.teacher_allowed[teacher_id]
+        options = [(a, b) for a in _bits(wanted) for b in _bits(spare)]
+        self.rng.shuffle(options)
+        for a, b in options:
+            if self.swap_chain(teacher_id, a, b) is None:
+                continue
+            self.place(index, a)
+            if self.valid(index, a):
+                return True
+            self.remove(index, a)
+            # The teacher's chain now starts in slot b
+            self.swap_chain(teacher_id, b, a)
+        return False
+
+    def evict(self, index):
+        """
+        Last resort for a lesson no chain can help: take a slot from another
+        lesson of the same teacher and put that lesson back in the queue
+        """
+        _, class_id, teacher_id, _ = self.lessons[index]
+        wanted = (~self.class_used[class_id] & self.teacher_allowed[teacher_id]
+                  & self.open_days(self.lesson_day[index], self.subject_cap))
+        options = list(_bits(wanted))
+        self.rng.shuffle(options)
+        for slot in options:
+            day_mask = self.day_masks[slot // self.n_periods]
+            victim_slot = slot
+            if (teacher_id, slot) not in self.teacher_at:
+                # The teacher is free but at the daily limit: bump a lesson of that day
+                taken = [other for other in _bits(self.teacher_used[teacher_id] & day_mask)
+                         if self.teacher_at[teacher_id, other] != index]
+                if not taken:
+                    continue
+                victim_slot = self.rng.choice(taken)
+            victim = self.teacher_at[teacher_id, victim_slot]
+            if victim == index:
+                continue
+            self.remove(victim, victim_slot)
+            self.place(index, slot)
+            if self.valid(index, slot):
+                self.left[victim] += 1
+                return True
+            self.remove(index, slot)
+            self.place(victim, victim_slot)
+        return False
+
+    def pick(self):
+        best = None
+        best_key = None
+        for index, left in enumerate(self.left):
+            if left:
+                key = (_popcount(self.domain(index)) - left, self.tie_break[index])
+                if best_key is None or key < best_key:
+                    best, best_key = index, key
+        return best
+
+    def choose_slot(self, index, domain):
+        teacher_id = self.lessons[index][2]
+        days = self.lesson_day[index]
+        load = self.teacher_day[teacher_id]
+        # Spread a lesson over the week and keep the teacher's days balanced
+        return min(_bits(domain), key=lambda slot: (
+            days[slot // self.n_periods], load[slot // self.n_periods], self.rng.random()
+        ))
+
+    def run(self):
+        evictions = SOLVER_EVICTIONS_PER_PERIOD * sum(self.left)
+        while True:
+            index = self.pick()
+            if index is None:
+                return True
+            domain = self.domain(index)
+            if domain:
+                self.place(index, self.choose_slot(index, domain))
+            elif not self.repair(index):
+                if not evictions or not self.evict(index):
+                    return False
+                evictions -= 1
+            self.left[index] -= 1
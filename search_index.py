@@ -0,0 +1,341 @@
+import heapq
+import os
+import re
+import threading
+import time
+import unicodedata
+from bisect import bisect_left, insort
+from collections import defaultdict
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+import sql_models
+from database import SessionLocal
+
+# In-process trigram indexes over people, subjects, classes and lost and
+# found items for ranked typeahead and global search. They are built at
+# startup; committed ORM writes and Core inserts (the CSV importer) are
+# applied incrementally, the periodic rebuild only picks up writes made by
+# other processes or outside the API. Since the indexes can lag behind
+# those, list filters keep matching with ILIKE on the database.
+SEARCH_INDEX_TTL = float(os.getenv("SEARCH_INDEX_TTL", 600))
+DEFAULT_SEARCH_LIMIT = 10
+
+_WORD = re.compile(r"\w+")
+
+def normalize(text):
+    """
+    Case- and accent-insensitive form of text, as compared by the index
+    """
+    if not text:
+        return ""
+    if text.isascii():
+        return text.lower()
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(char for char in decomposed if not unicodedata.combining(char)).casefold()
+
+def word_grams(word):
+    """
+    Trigrams of a word padded like pg_trgm ("  w", " wo", ..., "d "), so the
+    first one or two characters of a word can be looked up as well
+    """
+    padded = f"  {word} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def _query_grams(word):
+    # Words of three or more characters match anywhere in an indexed word,
+    # shorter ones only at its start
+    if len(word) < 3:
+        return {f"  {word}"[-3:]}
+    return {word[i:i + 3] for i in range(len(word) - 2)}
+
+class TrigramIndex:
+    """
+    Posting sets from trigram to document ids for the text columns of one
+    table. The first text is the display name and sorts results; the others
+    (email, code) are searched too. Names are also kept sorted, so names
+    starting with the query are found by binary search.
+    """
+    def __init__(self, name, key, columns, text=None):
+        self.name = name
+        self.key = key
+        self.columns = columns
+        # Column values of a row -> texts indexed and returned; the values
+        # themselves unless given
+        self.text = text or (lambda *values: values)
+        self.built_at = None
+        self._docs = {}
+        self._postings = defaultdict(set)
+        self._names = []
+        # Changes committed while a rebuild reads the table, replayed onto it
+        self._replay = None
+        # Bumped by invalidate; a build that overlaps one stays stale
+        self._generation = 0
+        self._lock = threading.RLock()
+        self._build_lock = threading.Lock()
+
+    def _add(self, doc_id, values, keep_sorted=True):
+        shown = tuple(self.text(*values))
+        texts = tuple(normalize(value) for value in shown)
+        words = tuple(_WORD.findall(" ".join(texts)))
+        self._docs[doc_id] = (texts, words, shown)
+        for gram in set().union(*map(word_grams, set(words))):
+            self._postings[gram].add(doc_id)
+        if keep_sorted:
+            insort(self._names, (texts[0], doc_id))
+
+    def _remove(self, doc_id):
+        doc = self._docs.pop(doc_id, None)
+        if doc is None:
+            return
+        del self._names[bisect_left(self._names, (doc[0][0], doc_id))]
+        for gram in set().union(*map(word_grams, set(doc[1]))):
+            postings = self._postings.get(gram)
+            if postings is not None:
+                postings.discard(doc_id)
+                if not postings:
+                    del self._postings[gram]
+
+    def build(self, db):
+        """
+        Load every row with one query and replace the index. Searches keep
+        using the old index meanwhile; writes committed during the load are
+        applied to the new one before it is swapped in.
+        """
+        with self._build_lock:
+            with self._lock:
+                self._replay = []
+                generation = self._generation
+            try:
+                self.load(db.execute(select(self.key, *self.columns)).all(), generation)
+            finally:
+                with self._lock:
+                    self._replay = None
+
+    def load(self, rows, generation=None):
+        """
+        Replace the index with (id, *column values) rows. When read before
+        invalidate was called (the generation changed), the index is
+        replaced but stays due for a rebuild.
+        """
+        fresh = TrigramIndex(self.name, self.key, self.columns, self.text)
+        for doc_id, *values in rows:
+            fresh._add(doc_id, values, keep_sorted=False)
+        fresh._names = sorted((doc[0][0], doc_id) for doc_id, doc in fresh._docs.items())
+
+        with self._lock:
+            self._docs, self._postings, self._names = fresh._docs, fresh._postings, fresh._names
+            for doc_id, values in self._replay or ():
+                self._apply(doc_id, values)
+            if generation is None or generation == self._generation:
+                self.built_at = time.monotonic()
+
+    def _refresh(self):
+        db = SessionLocal()
+        try:
+            self.build(db)
+        finally:
+            db.close()
+
+    def ensure_built(self, db):
+        """
+        Build the index on first use; once it is older than SEARCH_INDEX_TTL,
+        rebuild it in the background and serve the current one meanwhile
+        """
+        if self.built_at is None:
+            with self._build_lock:
+                built = self.built_at is not None
+            if not built:
+                self.build(db)
+        elif time.monotonic() - self.built_at > SEARCH_INDEX_TTL and not self._build_lock.locked():
+            self.built_at = time.monotonic()
+            threading.Thread(target=self._refresh, daemon=True).start()
+
+    def _apply(self, doc_id, values):
+        self._remove(doc_id)
+        if values is not None:
+            self._add(doc_id, values)
+
+    def upsert(self, doc_id, values):
+        with self._lock:
+            if self._replay is not None:
+                self._replay.append((doc_id, values))
+            # Writes before the first build are read by that build
+            if self.built_at is not None:
+                self._apply(doc_id, values)
+
+    def delete(self, doc_id):
+        self.upsert(doc_id, None)
+
+    def invalidate(self):
+        with self._lock:
+            self._generation += 1
+            self.built_at = None
+
+    def _candidates(self, words):
+        postings = [self._postings.get(gram, ()) for word in words for gram in _query_grams(word)]
+        postings.sort(key=len)
+        if not postings or not postings[0]:
+            return set()
+        candidates = set(postings[0])
+        for other in postings[1:]:
+            candidates &= other
+            if not candidates:
+                break
+        return candidates
+
+    def _name_prefix(self, needle, limit):
+        start = bisect_left(self._names, (needle,))
+        found = []
+        for name, doc_id in self._names[start:start + limit]:
+            if not name.startswith(needle):
+                break
+            found.append(doc_id)
+        return found
+
+    def ranked(self, db, query, limit=DEFAULT_SEARCH_LIMIT):
+        """
+        Typeahead over all texts: every word of query has to start a word of
+        the row (or occur inside one, from three characters on). Returns up
+        to limit (rank, id, texts) best first. Rows whose name starts with
+        the query rank first, then rows where another text does, then rows
+        where every query word starts a word, then the rest; alphabetical
+        within each group.
+        """
+        needle = normalize(query).strip()
+        words = _WORD.findall(needle)
+        if not words:
+            return []
+        self.ensure_built(db)
+
+        def rank(doc_id):
+            texts, doc_words, _ = self._docs[doc_id]
+            if texts[0].startswith(needle):
+                group = 0
+            elif any(text.startswith(needle) for text in texts[1:]):
+                group = 1
+            elif all(any(word.startswith(w) for word in doc_words) for w in words):
+                group = 2
+            else:
+                group = 3
+            return group, texts[0], doc_id
+
+        with self._lock:
+            best = [(0, self._docs[doc_id][0][0], doc_id) for doc_id in self._name_prefix(needle, limit)]
+            # When limit names start with the query, nothing can rank higher
+            if len(best) < limit:
+                candidates = self._candidates(words)
+                long_words = [w for w in words if len(w) >= 3]
+                if long_words:
+                    # Trigrams can match across positions; keep real substrings only
+                    candidates = [
+                        doc_id for doc_id in candidates
+                        if all(any(w in word for word in self._docs[doc_id][1]) for w in long_words)
+                    ]
+                best = heapq.nsmallest(limit, map(rank, candidates))
+            return [(order, order[2], self._docs[order[2]][2]) for order in best]
+
+    def search(self, db, query, limit=DEFAULT_SEARCH_LIMIT):
+        """
+        Best matches for query as (id, texts), see ranked
+        """
+        return [(doc_id, texts) for _, doc_id, texts in self.ranked(db, query, limit)]
+
+    def stats(self):
+        with self._lock:
+            return {
+                "documents": len(self._docs),
+                "trigrams": len(self._postings),
+                "age_seconds": round(time.monotonic() - self.built_at, 1) if self.built_at is not None else None,
+            }
+
+students = TrigramIndex("students", sql_models.Student.student_id, (sql_models.Student.name, sql_models.Student.email))
+teachers = TrigramIndex("teachers", sql_models.Teacher.teacher_id, (sql_models.Teacher.name, sql_models.Teacher.email))
+subjects = TrigramIndex("subjects", sql_models.Subject.subject_id, (sql_models.Subject.name, sql_models.Subject.code))
+classes = TrigramIndex(
+    "classes", sql_models.Class.class_id, (sql_models.Class.class_number, sql_models.Class.section),
+    text=lambda class_number, section: (f"{class_number}-{section}",)
+)
+lost_and_found = TrigramIndex(
+    "lost_and_found", sql_models.Lost_and_Found.unique_id,
+    (sql_models.Lost_and_Found.item_name, sql_models.Lost_and_Found.description)
+)
+
+# Table name -> index, in the order results of equal rank are listed
+INDEXES = {index.name: index for index in (students, teachers, subjects, classes, lost_and_found)}
+
+def build_all():
+    db = SessionLocal()
+    try:
+        for index in INDEXES.values():
+            index.build(db)
+    finally:
+        db.close()
+
+def search_all(db, query, limit=DEFAULT_SEARCH_LIMIT, names=None):
+    """
+    Best matches across the indexes (all, or those named) as (index name,
+    id, texts), ranked together the same way as within one index
+    """
+    results = []
+    for name, index in INDEXES.items():
+        if names is None or name in names:
+            results += [(order[:2], name, doc_id, texts) for order, doc_id, texts in index.ranked(db, query, limit)]
+    # Stable, so equal ranks keep the INDEXES order
+    results.sort(key=lambda result: result[0])
+    return [result[1:] for result in results[:limit]]
+
+def search_index_stats():
+    return {name: index.stats() for name, index in INDEXES.items()}
+
+# Incremental updates, applied once the writing session commits
+def _pending_changes(session):
+    return session.info.setdefault("search_changes", [])
+
+def _row_values(index, row):
+    return [row.get(column.key) for column in index.columns]
+
+@event.listens_for(Session, "after_flush")
+def _track_flush(session, flush_context):
+    changes = _pending_changes(session)
+    for instance in list(session.new) + list(session.dirty):
+        index = INDEXES.get(getattr(instance, "__tablename__", None))
+        if index is not None:
+            values = [getattr(instance, column.key) for column in index.columns]
+            changes.append((index, getattr(instance, index.key.key), values))
+    for instance in session.deleted:
+        index = INDEXES.get(getattr(instance, "__tablename__", None))
+        if index is not None:
+            changes.append((index, getattr(instance, index.key.key), None))
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_statement(orm_execute_state):
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    table = getattr(orm_execute_state.statement, "table", None)
+    index = INDEXES.get(getattr(table, "name", None))
+    if index is None:
+        return
+    parameters = orm_execute_state.parameters
+    if orm_execute_state.is_insert and parameters:
+        rows = parameters if isinstance(parameters, list) else [parameters]
+        changes = _pending_changes(orm_execute_state.session)
+        changes += [(index, row.get(index.key.key), _row_values(index, row)) for row in rows]
+    else:
+        # Bulk UPDATE/DELETE: the affected rows are unknown, rebuild instead
+        _pending_changes(orm_execute_state.session).append((index, None, None))
+
+@event.listens_for(Session, "after_commit")
+def _apply_commit(session):
+    for index, doc_id, values in session.info.pop("search_changes", ()):
+        if doc_id is None:
+            index.invalidate()
+        elif values is None:
+            index.delete(doc_id)
+        else:
+            index.upsert(doc_id, values)
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back(session):
+    session.info.pop("search_changes", None)
@@ -0,0 +1,95 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from passlib.context import CryptContext
+
+# Password hashing configuration
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+# bcrypt is CPU bound and holds the GIL, so bulk hashing is spread across
+# worker processes. Keep this module free of app imports: worker processes
+# may import it from scratch.
+HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", os.cpu_count() or 1))
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def hash_password(password: str) -> str:
+    return pwd_context.hash(password)
+
+def verify_password(password: str, password_hash: str) -> bool:
+    return pwd_context.verify(password, password_hash)
+
+def get_hash_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=HASH_WORKERS)
+        return _pool
+
+def hash_passwords(passwords):
+    """
+    Hash many passwords in parallel on the process pool, preserving order
+    """
+    if not passwords:
+        return []
+    chunksize = max(1, len(passwords) // (HASH_WORKERS * 4))
+    return list(get_hash_pool().map(hash_password, passwords, chunksize=chunksize))
+
+def shutdown_hash_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+# Async API for request handlers. At most MAX_PENDING_HASHES jobs are handed
+# to the pool at once; further callers wait on the event loop, which keeps the
+# pool queue bounded and gives a queue-depth figure to watch.
+MAX_PENDING_HASHES = int(os.getenv("PASSWORD_HASH_MAX_PENDING", HASH_WORKERS * 4))
+
+_slots = None
+_stats = {"waiting": 0, "running": 0, "completed": 0, "failed": 0}
+
+async def _run_on_pool(fn, *args):
+    global _slots
+    if _slots is None:
+        _slots = asyncio.Semaphore(MAX_PENDING_HASHES)
+
+    _stats["waiting"] += 1
+    try:
+        # A caller cancelled while waiting leaves here too
+        await _slots.acquire()
+    finally:
+        _stats["waiting"] -= 1
+    _stats["running"] += 1
+    try:
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(get_hash_pool(), fn, *args)
+    except BaseException:
+        _stats["failed"] += 1
+        raise
+    finally:
+        _stats["running"] -= 1
+        _slots.release()
+    _stats["completed"] += 1
+    return result
+
+async def hash_password_async(password: str) -> str:
+    return await _run_on_pool(hash_password, password)
+
+async def verify_password_async(password: str, password_hash: str) -> bool:
+    return await _run_on_pool(verify_password, password, password_hash)
+
+def hash_pool_stats() -> dict:
+    return {
+        "workers": HASH_WORKERS,
+        "max_pending": MAX_PENDING_HASHES,
+        "queue_depth": _stats["waiting"] + _stats["running"],
+        "waiting": _stats["waiting"],
+        "running": _stats["running"],
+        "completed": _stats["completed"],
+        "failed": _stats["failed"],
+    }
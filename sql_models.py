@@ -1,9 +1,9 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Date, Time, Float, Boolean, Text, Enum
+from sqlalchemy import Column, Integer, BigInteger, String, ForeignKey, DateTime, Date, Time, Float, Boolean, Text, Enum, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime, date, time
 import enum
 from database import Base
-import uuid
+from ids import uuid7, UUIDKey
 
 # Enum definitions
 class Gender(enum.Enum):
@@ -79,12 +79,12 @@ class ItemStatus(enum.Enum):
     FOUND = "Found"
 
 def generate_uuid():
-    return str(uuid.uuid4())
+    return str(uuid7())
 
 class Teacher(Base):
     __tablename__ = "teachers"
     
-    teacher_id = Column(String(36), primary_key=True, default=generate_uuid)
+    teacher_id = Column(UUIDKey, primary_key=True, default=generate_uuid)
     name = Column(String(255), nullable=False)
     gender = Column(Enum(Gender), nullable=False)
     phone = Column(Integer, nullable=False)
@@ -108,10 +108,10 @@ class Teacher(Base):
 class Class(Base):
     __tablename__ = "classes"
     
-    class_id = Column(String(36), primary_key=True, default=generate_uuid)
+    class_id = Column(UUIDKey, primary_key=True, default=generate_uuid)
     class_number = Column(Integer, nullable=False)
     section = Column(String(1), nullable=False)
-    class_teacher_id = Column(String(36), ForeignKey("teachers.teacher_id"), nullable=False)
+    class_teacher_id = Column(UUIDKey, ForeignKey("teachers.teacher_id"), nullable=False)
     
     # Relationships
     teacher = relationship("Teacher", back_populates="classes")
@@ -126,10 +126,13 @@ class Class(Base):
 
 class Student(Base):
     __tablename__ = "students"
+    __table_args__ = (
+        Index("ix_students_class_roll", "class_id", "roll_no"),
+    )
     
-    student_id = Column(String(36), primary_key=True, default=generate_uuid)
+    student_id = Column(UUIDKey, primary_key=True, default=generate_uuid)
     name = Column(String(255), nullable=False)
-    class_id = Column(String(36), ForeignKey("classes.class_id"), nullable=False)
+    class_id = Column(UUIDKey, ForeignKey("classes.class_id"), nullable=False)
     roll_no = Column(Integer, nullable=False)
     gender = Column(Enum(Gender), nullable=False)
     phone = Column(Integer, nullable=False)
@@ -156,7 +159,7 @@ class Student(Base):
 class Admin(Base):
     __tablename__ = "admins"
     
-    admin_id = Column(String(36), primary_key=True, default=generate_uuid)
+    admin_id = Column(UUIDKey, primary_key=True, default=generate_uuid)
     name = Column(String(255), nullable=False)
     gender = Column(Enum(Gender), nullable=False)
     phone = Column(Integer, nullable=False)
@@ -179,7 +182,7 @@ class Admin(Base):
 class Subject(Base):
     __tablename__ = "subjects"
     
-    subject_id = Column(String(36), primary_key=True, default=generate_uuid)
+    subject_id = Column(UUIDKey, primary_key=True, default=generate_uuid)
     name = Column(String(255), nullable=False)
     code = Column(String(50), nullable=False, unique=True)
     
@@ -192,11 +195,14 @@ class Subject(Base):
 
 class Class_Subject(Base):
     __tablename__ = "class_subjects"
+    __table_args__ = (
+        Index("ix_class_subjects_class_subject", "class_id", "subject_id"),
+    )
     
-    class_sub_id = Column(String(36), primary_key=True, default=generate_uuid)
-    class_id = Column(String(36), ForeignKey("classes.class_id"), nullable=False)
-    subject_id = Column(String(36), ForeignKey("subjects.subject_id"), nullable=False)
-    subject_teacher_id = Column(String(36), ForeignKey("teachers.teacher_id"), nullable=False)
+    class_sub_id = Column(UUIDKey, primary_key=True, default=generate_uuid)
+    class_id = Column(UUIDKey, ForeignKey("classes.class_id"), nullable=False)
+    subject_id = Column(UUIDKey, ForeignKey("subjects.subject_id"), nullable=False)
+    subject_teacher_id = Column(UUIDKey, ForeignKey("teachers.teacher_id"), nullable=False)
     
     # Relationships
     class_ = relationship("Class", back_populates="class_subjects")
@@ -210,10 +216,14 @@ class Class_Subject(Base):
 
 class Attendance(Base):
     __tablename__ = "attendances"
-    
-    attendance_id = Column(String(36), primary_key=True, default=generate_uuid)
-    class_id = Column(String(36), ForeignKey("classes.class_id"), nullable=False)
-    student_id = Column(String(36), ForeignKey("students.student_id"), nullable=False)
+    __table_args__ = (
+        Index("ix_attendances_student_date", "student_id", "date"),
+        Index("ix_attendances_class_date", "class_id", "date"),
+    )
+    
+    attendance_id = Column(UUIDKey, primary_key=True, default=generate_uuid)
+    class_id = Column(UUIDKey, ForeignKey("classes.class_id"), nullable=False)
+    student_id = Column(UUIDKey, ForeignKey("students.student_id"), nullable=False)
     date = Column(Date, nullable=False)
     status = Column(Enum(AttendanceStatus), nullable=False)
     
@@ -224,11 +234,32 @@ class Attendance(Base):
     def __repr__(self):
         return f"<Attendance {self.student_id} on {self.date}: {self.status}>"
 
+class Attendance_Summary(Base):
+    __tablename__ = "attendance_summaries"
+    __table_args__ = (
+        Index("ix_attendance_summaries_date", "date"),
+    )
+    
+    # Per class per day attendance counts, maintained by the attendance
+    # endpoints and rebuilt with attendance_summary.py
+    class_id = Column(UUIDKey, ForeignKey("classes.class_id"), primary_key=True)
+    date = Column(Date, primary_key=True)
+    present = Column(Integer, nullable=False, default=0)
+    absent = Column(Integer, nullable=False, default=0)
+    late = Column(Integer, nullable=False, default=0)
+    excused = Column(Integer, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f"<Attendance_Summary {self.class_id} on {self.date}>"
+
 class Timetable(Base):
     __tablename__ = "timetables"
+    __table_args__ = (
+        Index("ix_timetables_day_start", "day", "start_time"),
+    )
     
-    timetable_id = Column(String(36), primary_key=True, default=generate_uuid)
-    class_sub_id = Column(String(36), ForeignKey("class_subjects.class_sub_id"), nullable=False)
+    timetable_id = Column(UUIDKey, primary_key=True, default=generate_uuid)
+    class_sub_id = Column(UUIDKey, ForeignKey("class_subjects.class_sub_id"), nullable=False)
     day = Column(Enum(DayOfWeek), nullable=False)
     start_time = Column(Time, nullable=False)
     end_time = Column(Time, nullable=False)
@@ -242,9 +273,9 @@ class Timetable(Base):
 class Exams(Base):
     __tablename__ = "exams"
     
-    exam_id = Column(String(36), primary_key=True, default=generate_uuid)
-    class_id = Column(String(36), ForeignKey("classes.class_id"), nullable=False)
-    subject_id = Column(String(36), ForeignKey("subjects.subject_id"), nullable=False)
+    exam_id = Column(UUIDKey, primary_key=True, default=generate_uuid)
+    class_id = Column(UUIDKey, ForeignKey("classes.class_id"), nullable=False)
+    subject_id = Column(UUIDKey, ForeignKey("subjects.subject_id"), nullable=False)
     date = Column(Date, nullable=False)
     name = Column(String(255), nullable=False)
     total_marks = Column(Integer, nullable=False)
@@ -259,10 +290,13 @@ class Exams(Base):
 
 class Grade(Base):
     __tablename__ = "grades"
+    __table_args__ = (
+        Index("ix_grades_student_exam", "student_id", "exam_id"),
+    )
     
-    grades_id = Column(String(36), primary_key=True, default=generate_uuid)
-    student_id = Column(String(36), ForeignKey("students.student_id"), nullable=False)
-    exam_id = Column(String(36), ForeignKey("exams.exam_id"), nullable=False)
+    grades_id = Column(UUIDKey, primary_key=True, default=generate_uuid)
+    student_id = Column(UUIDKey, ForeignKey("students.student_id"), nullable=False)
+    exam_id = Column(UUIDKey, ForeignKey("exams.exam_id"), nullable=False)
     marks = Column(Float, nullable=False)
     grade = Column(String(2), nullable=False)
     
@@ -276,11 +310,11 @@ class Grade(Base):
 class Assignment(Base):
     __tablename__ = "assignments"
     
-    assignment_id = Column(String(36), primary_key=True, default=generate_uuid)
-    class_sub_id = Column(String(36), ForeignKey("class_subjects.class_sub_id"), nullable=False)
+    assignment_id = Column(UUIDKey, primary_key=True, default=generate_uuid)
+    class_sub_id = Column(UUIDKey, ForeignKey("class_subjects.class_sub_id"), nullable=False)
     created_time = Column(DateTime, default=datetime.now)
     title = Column(String(255), nullable=False)
-    dueDate = Column(DateTime, nullable=False)
+    dueDate = Column(DateTime, nullable=False, index=True)
     description = Column(Text, nullable=True)
     type = Column(Enum(AssignmentType), nullable=False)
     
@@ -294,9 +328,9 @@ class Assignment(Base):
 class Assignment_grading(Base):
     __tablename__ = "assignment_gradings"
     
-    grading_id = Column(String(36), primary_key=True, default=generate_uuid)
-    assignment_id = Column(String(36), ForeignKey("assignments.assignment_id"), nullable=False)
-    student_id = Column(String(36), ForeignKey("students.student_id"), nullable=False)
+    grading_id = Column(UUIDKey, primary_key=True, default=generate_uuid)
+    assignment_id = Column(UUIDKey, ForeignKey("assignments.assignment_id"), nullable=False)
+    student_id = Column(UUIDKey, ForeignKey("students.student_id"), nullable=False)
     feedback = Column(Text, nullable=True)
     grade = Column(String(2), nullable=True)
     marks = Column(Integer, nullable=True)
@@ -311,17 +345,24 @@ class Assignment_grading(Base):
 
 class Notification(Base):
     __tablename__ = "notifications"
+    __table_args__ = (
+        # Feed reads: one range per audience, newest first
+        Index("ix_notifications_recipient_class_seq", "recipient", "class_id", "feed_seq"),
+        Index("ux_notifications_feed_seq", "feed_seq", unique=True),
+    )
     
-    notification_id = Column(String(36), primary_key=True, default=generate_uuid)
+    notification_id = Column(UUIDKey, primary_key=True, default=generate_uuid)
     title = Column(String(255), nullable=False)
     content = Column(Text, nullable=False)
     type = Column(Enum(NotificationType), nullable=False)
     recipient = Column(Enum(RecipientType), nullable=False)
-    class_id = Column(String(36), ForeignKey("classes.class_id"), nullable=True)
+    class_id = Column(UUIDKey, ForeignKey("classes.class_id"), nullable=True)
     created_at = Column(DateTime, default=datetime.now)
     creator_type = Column(Enum(CreatorType), nullable=False)
-    admin_id = Column(String(36), ForeignKey("admins.admin_id"), nullable=True)
-    teacher_id = Column(String(36), ForeignKey("teachers.teacher_id"), nullable=True)
+    admin_id = Column(UUIDKey, ForeignKey("admins.admin_id"), nullable=True)
+    teacher_id = Column(UUIDKey, ForeignKey("teachers.teacher_id"), nullable=True)
+    # Position in the feed, in commit order; assigned by notification_feed
+    feed_seq = Column(BigInteger, nullable=True)
     
     # Relationships
     class_ = relationship("Class", back_populates="notifications")
@@ -334,13 +375,13 @@ class Notification(Base):
 class Leave_Application(Base):
     __tablename__ = "leave_applications"
     
-    leave_id = Column(String(36), primary_key=True, default=generate_uuid)
-    student_id = Column(String(36), ForeignKey("students.student_id"), nullable=False)
+    leave_id = Column(UUIDKey, primary_key=True, default=generate_uuid)
+    student_id = Column(UUIDKey, ForeignKey("students.student_id"), nullable=False)
     title = Column(String(255), nullable=False)
     type = Column(Enum(LeaveType), nullable=False)
     start_date = Column(Date, nullable=False)
     end_date = Column(Date, nullable=False)
-    status = Column(Enum(LeaveStatus), nullable=False, default=LeaveStatus.PENDING)
+    status = Column(Enum(LeaveStatus), nullable=False, default=LeaveStatus.PENDING, index=True)
     reason = Column(Text, nullable=True)
     applied_at = Column(DateTime, default=datetime.now)
     
@@ -353,9 +394,9 @@ class Leave_Application(Base):
 class Feedback(Base):
     __tablename__ = "feedbacks"
     
-    feedback_id = Column(String(36), primary_key=True, default=generate_uuid)
-    student_id = Column(String(36), ForeignKey("students.student_id"), nullable=False)
-    teacher_id = Column(String(36), ForeignKey("teachers.teacher_id"), nullable=False)
+    feedback_id = Column(UUIDKey, primary_key=True, default=generate_uuid)
+    student_id = Column(UUIDKey, ForeignKey("students.student_id"), nullable=False)
+    teacher_id = Column(UUIDKey, ForeignKey("teachers.teacher_id"), nullable=False)
     title = Column(String(255), nullable=False)
     feedback_type = Column(Enum(FeedbackType), nullable=False)
     feedback_text = Column(Text, nullable=False)
@@ -371,9 +412,9 @@ class Feedback(Base):
 class Extra_Credit(Base):
     __tablename__ = "extra_credits"
     
-    credit_id = Column(String(36), primary_key=True, default=generate_uuid)
-    student_id = Column(String(36), ForeignKey("students.student_id"), nullable=False)
-    admin_id = Column(String(36), ForeignKey("admins.admin_id"), nullable=False)
+    credit_id = Column(UUIDKey, primary_key=True, default=generate_uuid)
+    student_id = Column(UUIDKey, ForeignKey("students.student_id"), nullable=False)
+    admin_id = Column(UUIDKey, ForeignKey("admins.admin_id"), nullable=False)
     grade = Column(String(2), nullable=False)
     
     # Relationships
@@ -386,8 +427,8 @@ class Extra_Credit(Base):
 class Lost_and_Found(Base):
     __tablename__ = "lost_and_found"
     
-    unique_id = Column(String(36), primary_key=True, default=generate_uuid)
-    admin_id = Column(String(36), ForeignKey("admins.admin_id"), nullable=False)
+    unique_id = Column(UUIDKey, primary_key=True, default=generate_uuid)
+    admin_id = Column(UUIDKey, ForeignKey("admins.admin_id"), nullable=False)
     item_name = Column(String(255), nullable=False)
     description = Column(Text, nullable=True)
     location = Column(String(255), nullable=False)
@@ -399,3 +440,13 @@ class Lost_and_Found(Base):
     
     def __repr__(self):
         return f"<Lost_and_Found {self.item_name}: {self.status}>"
+
+class Sequence(Base):
+    __tablename__ = "sequences"
+    
+    # Named counters handed out in commit order, see notification_feed
+    name = Column(String(50), primary_key=True)
+    value = Column(BigInteger, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f"<Sequence {self.name}: {self.value}>"
@@ -0,0 +1,75 @@
+import os
+import shutil
+import tempfile
+import uuid
+from datetime import date
+
+import pytest
+
+# Tests never touch the configured database: the app is imported against a
+# throwaway SQLite file and every test then runs on a fresh one of its own
+_TEST_DIR = tempfile.mkdtemp(prefix="school-sphere-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_TEST_DIR, 'import.db')}"
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+
+import database
+import sql_models
+from database import SessionLocal
+from main import app
+
+
+def pytest_sessionfinish(session):
+    shutil.rmtree(_TEST_DIR, ignore_errors=True)
+
+
+@pytest.fixture(autouse=True)
+def test_engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}", connect_args={"check_same_thread": False})
+    sql_models.Base.metadata.create_all(bind=engine)
+    SessionLocal.configure(bind=engine)
+    yield engine
+    SessionLocal.configure(bind=database.engine)
+    engine.dispose()
+
+
+@pytest.fixture
+def api():
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    yield session
+    session.close()
+
+
+def add_teacher(db, name="Teacher"):
+    teacher = sql_models.Teacher(
+        name=name, gender=sql_models.Gender.FEMALE, phone=1234567890, email=f"{uuid.uuid4().hex}@school.test",
+        status=sql_models.Status.ACTIVE, address="Address", password_hash="x", date_of_birth=date(1985, 1, 1),
+    )
+    db.add(teacher)
+    db.flush()
+    return teacher
+
+
+def add_class(db, teacher, class_number=1, section="A"):
+    school_class = sql_models.Class(class_number=class_number, section=section, class_teacher_id=teacher.teacher_id)
+    db.add(school_class)
+    db.flush()
+    return school_class
+
+
+def add_student(db, school_class, roll_no, name="Student"):
+    student = sql_models.Student(
+        name=name, class_id=school_class.class_id, roll_no=roll_no, gender=sql_models.Gender.MALE,
+        phone=1234567890, email=f"{uuid.uuid4().hex}@school.test", status=sql_models.StudentStatus.ACTIVE,
+        address="Address", password_hash="x", date_of_birth=date(2010, 1, 1),
+    )
+    db.add(student)
+    db.flush()
+    return student
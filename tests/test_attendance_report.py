@@ -0,0 +1,28 @@
+from datetime import date
+
+import sql_models
+from conftest import add_teacher, add_class, add_student
+
+
+def test_class_report_weights_late_and_excused_days(api, db):
+    school_class = add_class(db, add_teacher(db))
+    student = add_student(db, school_class, 1)
+    statuses = ["PRESENT", "PRESENT", "LATE", "EXCUSED", "ABSENT"]
+    for day, status in enumerate(statuses, start=1):
+        db.add(sql_models.Attendance(
+            class_id=school_class.class_id, student_id=student.student_id, date=date(2024, 3, day),
+            status=sql_models.AttendanceStatus[status],
+        ))
+    db.commit()
+
+    response = api.get(
+        f"/attendance/report/class/{school_class.class_id}",
+        params={"late_weight": 0.5, "excused_weight": 0.25},
+    )
+    assert response.status_code == 200
+    report = response.json()
+    row = report["students"][0]
+    assert (row["total_days"], row["present"], row["late"], row["excused"], row["absent"]) == (5, 2, 1, 1, 1)
+    # (2 + 0.5 + 0.25) of 5 days
+    assert row["attendance_rate"] == 55.0
+    assert report["class_rate"] == 55.0
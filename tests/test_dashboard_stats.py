@@ -0,0 +1,22 @@
+from datetime import date
+
+import main
+
+
+def test_stats_read_before_a_write_are_not_cached(api, monkeypatch):
+    main.dashboard_cache.clear()
+    execute = main.execute
+
+    async def write_during_read(db, statement):
+        result = await execute(db, statement)
+        # A commit to a counted table lands while the figures are read
+        main.invalidate_dashboard_stats({"students"})
+        return result
+
+    monkeypatch.setattr(main, "execute", write_during_read)
+    assert api.get("/dashboard/stats").status_code == 200
+    assert main.dashboard_cache.get(date.today()) is None
+
+    monkeypatch.setattr(main, "execute", execute)
+    stats = api.get("/dashboard/stats").json()
+    assert main.dashboard_cache.get(date.today()) == stats
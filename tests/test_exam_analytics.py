@@ -0,0 +1,21 @@
+from exam_analytics import compute
+
+
+def test_ranks_share_ties_and_percentiles():
+    result = compute("e1", 100, ["a", "b", "c", "d"], [90.0, 70.0, 90.0, 50.0])
+    ranks = {row["student_id"]: (row["rank"], row["percentile"]) for row in result["students"]}
+    assert ranks == {"a": (1, 75.0), "c": (1, 75.0), "b": (3, 37.5), "d": (4, 12.5)}
+    assert result["mean"] == 75.0
+    assert result["median"] == 80.0
+    assert [b["count"] for b in result["histogram"]][5:] == [1, 0, 1, 0, 2]
+
+
+def test_empty_exam():
+    result = compute("e1", 100, [], [])
+    assert result["count"] == 0 and result["mean"] is None and result["students"] == []
+
+
+def test_zero_total_marks():
+    result = compute("e1", 0, ["a", "b"], [0.0, 0.0])
+    assert result["histogram"] == [{"lower": 0.0, "upper": 0.0, "count": 2}]
+    assert result["mean_percentage"] is None
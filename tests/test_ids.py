@@ -0,0 +1,37 @@
+import uuid
+
+from sqlalchemy import Column, MetaData, Table, create_engine, insert, select
+
+import ids
+from ids import UUIDKey, uuid7
+
+
+def test_uuid7_version_and_order():
+    keys = [uuid7() for _ in range(1000)]
+    assert all(key.version == 7 and key.variant == uuid.RFC_4122 for key in keys)
+    # Time-ordered: text and byte order both follow generation order
+    assert [str(key) for key in keys] == sorted(str(key) for key in keys)
+    assert len(set(keys)) == len(keys)
+
+
+def test_binary_uuid_key_round_trip(monkeypatch):
+    monkeypatch.setattr(ids, "BINARY_UUID_KEYS", True)
+    key = str(uuid7())
+    column_type = UUIDKey()
+    assert column_type.process_bind_param(key, None) == uuid.UUID(key).bytes
+    assert column_type.process_bind_param(key.upper(), None) == uuid.UUID(key).bytes
+    assert column_type.process_result_value(uuid.UUID(key).bytes, None) == key
+    # Not a UUID: binds as NULL, so lookups by it find nothing
+    assert column_type.process_bind_param("not-a-uuid", None) is None
+
+    # Created with the flag on, so the column is BINARY(16)
+    table = Table("keys", MetaData(), Column("key", UUIDKey(), primary_key=True))
+    engine = create_engine("sqlite://")
+    table.create(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(table).values(key=key))
+        assert conn.execute(select(table.c.key)).scalar_one() == key
+        assert conn.execute(select(table.c.key).where(table.c.key == key)).scalar_one() == key
+        assert conn.execute(select(table.c.key).where(table.c.key == "not-a-uuid")).first() is None
+        # Stored as 16 raw bytes
+        assert conn.exec_driver_sql("SELECT key FROM keys").scalar_one() == uuid.UUID(key).bytes
@@ -0,0 +1,42 @@
+from datetime import datetime, timedelta
+
+import importer
+import sql_models
+
+HEADER = "name,gender,phone,email,address,password,date_of_birth\n"
+
+
+def teacher_row(name, email):
+    return f"{name},M,1234567890,{email},Address,secret,1980-01-01\n"
+
+
+def test_email_of_a_failed_batch_can_be_imported_later(db, tmp_path, monkeypatch):
+    monkeypatch.setattr(importer, "IMPORT_BATCH_SIZE", 1)
+    calls = []
+
+    def failing_first_batch(db, batch, state):
+        table, rows, errors, claimed = importer._import_teacher_batch(db, batch, state)
+        calls.append(batch)
+        if len(calls) == 1:
+            # NOT NULL violation: the INSERT fails and the batch is rolled back
+            rows = [dict(row, name=None) for row in rows]
+        return table, rows, errors, claimed
+
+    path = tmp_path / "teachers.csv"
+    path.write_text(HEADER + teacher_row("First", "same@example.com") + teacher_row("Again", "same@example.com"))
+    job = importer.create_job("teachers")
+    importer._run_import(job["job_id"], str(path), importer.TeacherCreate, failing_first_batch)
+
+    job = importer.get_job(job["job_id"])
+    assert (job["status"], job["created"], job["failed"]) == ("done", 1, 1)
+    assert [teacher.name for teacher in db.query(sql_models.Teacher)] == ["Again"]
+
+
+def test_finished_jobs_expire():
+    old = importer.create_job("teachers")
+    running = importer.create_job("teachers")
+    importer._update_job(old["job_id"], status="done", finished_at=datetime.now() - importer.FINISHED_JOB_TTL - timedelta(seconds=1))
+
+    importer.create_job("teachers")
+    assert importer.get_job(old["job_id"]) is None
+    assert importer.get_job(running["job_id"]) is not None
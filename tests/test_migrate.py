@@ -0,0 +1,37 @@
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+import sql_models
+from conftest import add_teacher
+from migrate import copy_database
+
+
+def add_notification(db, teacher):
+    notification = sql_models.Notification(
+        title="Notice", content="Content", type=sql_models.NotificationType.NEWS,
+        recipient=sql_models.RecipientType.ALL, creator_type=sql_models.CreatorType.TEACHER,
+        teacher_id=teacher.teacher_id,
+    )
+    db.add(notification)
+    db.commit()
+    return notification
+
+
+def test_copy_into_freshly_created_database(tmp_path):
+    source_url = f"sqlite:///{tmp_path / 'source.db'}"
+    source = create_engine(source_url)
+    sql_models.Base.metadata.create_all(bind=source)
+    with Session(bind=source) as db:
+        add_notification(db, add_teacher(db))
+    source.dispose()
+
+    target = create_engine(f"sqlite:///{tmp_path / 'target.db'}")
+    sql_models.Base.metadata.create_all(bind=target)
+    copy_database(source_url, bind=target)
+
+    with Session(bind=target) as db:
+        assert db.scalars(select(sql_models.Notification.feed_seq)).all() == [1]
+        # The feed counter was copied too, so new notifications continue after it
+        teacher = db.scalars(select(sql_models.Teacher)).one()
+        assert add_notification(db, teacher).feed_seq == 2
+    target.dispose()
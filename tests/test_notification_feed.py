@@ -0,0 +1,40 @@
+from datetime import datetime, timedelta
+
+import notification_feed
+import sql_models
+from conftest import add_teacher, add_class, add_student
+
+
+def add_notification(db, teacher, title, created_at):
+    db.add(sql_models.Notification(
+        title=title, content="Content", type=sql_models.NotificationType.NEWS,
+        recipient=sql_models.RecipientType.STUDENTS, creator_type=sql_models.CreatorType.TEACHER,
+        teacher_id=teacher.teacher_id, created_at=created_at,
+    ))
+    db.commit()
+
+
+def test_since_cursor_follows_commit_order(api, db):
+    teacher = add_teacher(db)
+    student = add_student(db, add_class(db, teacher), 1)
+    now = datetime.now()
+    add_notification(db, teacher, "first", now)
+
+    page = api.get("/notifications/feed", params={"student_id": student.student_id}).json()
+    assert "first" in [item["title"] for item in page["items"]]
+
+    # Committed after the poll but stamped earlier, e.g. by a worker whose clock is behind
+    add_notification(db, teacher, "late", now - timedelta(minutes=5))
+    newer = api.get("/notifications/feed", params={"student_id": student.student_id, "since": page["since"]}).json()
+    assert [item["title"] for item in newer["items"]] == ["late"]
+
+
+def test_head_follows_the_feed_from_now(db):
+    teacher = add_teacher(db)
+    student = add_student(db, add_class(db, teacher), 1)
+    add_notification(db, teacher, "before", datetime.now())
+    since = notification_feed.head(db)
+
+    add_notification(db, teacher, "after", datetime.now())
+    page = notification_feed.feed(db, notification_feed.student_audience(student), since=since)
+    assert [item.title for item in page["items"]] == ["after"]
@@ -0,0 +1,47 @@
+import asyncio
+
+from notification_push import LocalBroker
+
+
+def test_publish_reaches_subscribers_of_the_topic_only():
+    async def run():
+        broker = LocalBroker()
+        students = broker.subscribe({"Students", "class:1"})
+        teachers = broker.subscribe({"Teachers"})
+        broker.publish("class:1", "for class 1")
+        broker.publish("class:2", "for class 2")
+        await asyncio.sleep(0)
+        assert students.queue.get_nowait() == "for class 1"
+        assert students.queue.empty() and teachers.queue.empty()
+
+    asyncio.run(run())
+
+
+def test_subscriber_with_full_queue_is_dropped():
+    async def run():
+        broker = LocalBroker(queue_size=2)
+        slow = broker.subscribe({"All"})
+        for i in range(3):
+            broker.publish("All", i)
+        await asyncio.sleep(0)
+        # Buffered messages are discarded; None tells the stream to end
+        assert slow.queue.get_nowait() is None
+        assert slow.queue.empty()
+        assert broker.stats()["subscriptions"] == 0
+        assert broker.stats()["dropped"] == 1
+
+    asyncio.run(run())
+
+
+def test_unsubscribe_stops_delivery():
+    async def run():
+        broker = LocalBroker()
+        subscription = broker.subscribe({"All", "class:1"})
+        broker.unsubscribe(subscription)
+        broker.unsubscribe(subscription)
+        broker.publish("All", "message")
+        await asyncio.sleep(0)
+        assert subscription.queue.empty()
+        assert broker.stats()["subscriptions"] == 0 and broker.stats()["topics"] == 0
+
+    asyncio.run(run())
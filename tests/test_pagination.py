@@ -0,0 +1,18 @@
+import pytest
+from datetime import date
+from fastapi import HTTPException
+import sql_models
+from pagination import encode_cursor, decode_cursor
+
+
+def test_cursor_round_trip():
+    columns = [sql_models.Attendance.date, sql_models.Attendance.attendance_id]
+    row = sql_models.Attendance(attendance_id="abc", date=date(2024, 1, 31))
+    cursor = encode_cursor(row, columns)
+    assert decode_cursor(cursor, columns) == [date(2024, 1, 31), "abc"]
+
+
+def test_invalid_cursor_rejected():
+    with pytest.raises(HTTPException) as exc:
+        decode_cursor("not-a-cursor", [sql_models.Student.student_id])
+    assert exc.value.status_code == 400
@@ -0,0 +1,42 @@
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from query_profiler import QueryProfile, statement_pattern, QUERY_REPEAT_THRESHOLD, _current
+
+
+def test_statement_pattern_collapses_placeholder_lists():
+    assert statement_pattern("SELECT *\n  FROM students WHERE id IN (?, ?, ?)") == "SELECT * FROM students WHERE id IN (...)"
+    assert statement_pattern("SELECT * FROM students WHERE id IN (%(id_1)s, %(id_2)s)") == "SELECT * FROM students WHERE id IN (...)"
+    assert statement_pattern("SELECT count(?) FROM students") == "SELECT count(...) FROM students"
+
+
+def test_repeated_statements_and_server_timing():
+    profile = QueryProfile()
+    profile.record("SELECT * FROM classes", 2.0)
+    for i in range(QUERY_REPEAT_THRESHOLD):
+        # Expanded IN lists of different lengths are the same pattern
+        profile.record(f"SELECT * FROM teachers WHERE teacher_id IN ({', '.join('?' * (i + 1))})", 1.0)
+    assert profile.count == QUERY_REPEAT_THRESHOLD + 1
+    assert profile.slowest == "SELECT * FROM classes"
+    assert profile.repeated() == [("SELECT * FROM teachers WHERE teacher_id IN (...)", QUERY_REPEAT_THRESHOLD)]
+    assert profile.server_timing() == (
+        f'db;dur={2.0 + QUERY_REPEAT_THRESHOLD:.2f};desc="{QUERY_REPEAT_THRESHOLD + 1} queries", '
+        f'db-slowest;dur=2.00, db-repeated;desc="1 statements, up to {QUERY_REPEAT_THRESHOLD}x"'
+    )
+
+
+def test_failed_statement_leaves_no_start_time():
+    engine = create_engine("sqlite://")
+    profile = QueryProfile()
+    token = _current.set(profile)
+    try:
+        with engine.connect() as conn:
+            with pytest.raises(OperationalError):
+                conn.execute(text("SELECT * FROM missing"))
+            assert conn.info["query_started"] == []
+            conn.execute(text("SELECT 1"))
+            assert conn.info["query_started"] == []
+    finally:
+        _current.reset(token)
+    assert profile.count == 1
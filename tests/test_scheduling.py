@@ -0,0 +1,66 @@
+import uuid
+
+import pytest
+
+import sql_models
+from conftest import add_teacher, add_class
+from scheduling import solve_timetable, ScheduleError
+
+
+def test_solver_places_every_lesson_without_clashes():
+    # Every teacher teaches every class: 9 of the 10 slots for each
+    lessons = [
+        (f"{class_id}-{teacher_id}", class_id, teacher_id, 3)
+        for class_id in ("c1", "c2", "c3") for teacher_id in ("t1", "t2", "t3")
+    ]
+    solution = solve_timetable(2, 5, lessons, teacher_blocked={"t1": [(0, 0)]}, max_subject_per_day=2)
+
+    class_slots, teacher_slots = set(), set()
+    for key, class_id, teacher_id, periods in lessons:
+        slots = solution[key]
+        assert len(slots) == periods
+        for day in (0, 1):
+            assert sum(1 for slot_day, _ in slots if slot_day == day) <= 2
+        for slot in slots:
+            assert (class_id, slot) not in class_slots
+            assert (teacher_id, slot) not in teacher_slots
+            class_slots.add((class_id, slot))
+            teacher_slots.add((teacher_id, slot))
+    assert ("t1", (0, 0)) not in teacher_slots
+
+
+def test_solver_rejects_infeasible_demand():
+    with pytest.raises(ScheduleError):
+        solve_timetable(2, 5, [("a", "c1", "t1", 6), ("b", "c1", "t2", 5)])
+    with pytest.raises(ScheduleError):
+        solve_timetable(2, 5, [("a", "c1", "t1", 3)], teacher_max_per_day={"t1": 1})
+
+
+def test_generate_dry_run_saves_nothing(api, db):
+    teacher = add_teacher(db)
+    school_class = add_class(db, teacher)
+    subject = sql_models.Subject(name="Maths", code=uuid.uuid4().hex[:10])
+    db.add(subject)
+    db.flush()
+    class_subject = sql_models.Class_Subject(
+        class_id=school_class.class_id, subject_id=subject.subject_id, subject_teacher_id=teacher.teacher_id
+    )
+    db.add(class_subject)
+    db.commit()
+    request = {
+        "days": ["Monday", "Tuesday"],
+        "periods": [{"start_time": "09:00", "end_time": "09:45"}, {"start_time": "10:00", "end_time": "10:45"}],
+        "lessons": [{"class_sub_id": class_subject.class_sub_id, "periods_per_week": 3}],
+    }
+
+    response = api.post("/timetable/generate", params={"dry_run": True}, json=request)
+    assert response.status_code == 200
+    result = response.json()
+    assert result["created"] == 0 and len(result["entries"]) == 3
+    saved = db.query(sql_models.Timetable).filter(sql_models.Timetable.class_sub_id == class_subject.class_sub_id)
+    assert saved.count() == 0
+
+    response = api.post("/timetable/generate", json=request)
+    assert response.status_code == 201
+    assert response.json()["created"] == 3
+    assert saved.count() == 3
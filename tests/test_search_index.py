@@ -0,0 +1,64 @@
+import sql_models
+from search_index import TrigramIndex
+
+
+def make_index():
+    index = TrigramIndex("students", sql_models.Student.student_id, (sql_models.Student.name, sql_models.Student.email))
+    index.load([
+        ("1", "Anna Bell", "anna@school.test"),
+        ("2", "Hannah Smith", "hsmith@school.test"),
+        ("3", "Zoë Ångström", "zoe@school.test"),
+        ("4", "Bella Anders", "bella@school.test"),
+    ])
+    return index
+
+
+def test_typeahead_ranks_name_prefixes_first():
+    index = make_index()
+    assert [doc_id for doc_id, _ in index.search(None, "an")] == ["1", "4", "3"]
+    assert [doc_id for doc_id, _ in index.search(None, "ann")] == ["1", "2"]
+    assert [doc_id for doc_id, _ in index.search(None, "zoe ang")] == ["3"]
+    assert index.search(None, "an", limit=1) == [("1", ("Anna Bell", "anna@school.test"))]
+
+
+def test_incremental_updates():
+    index = make_index()
+    index.upsert("2", ("Hannah Jones", "hjones@school.test"))
+    index.delete("1")
+    index.upsert("5", ("Ann Smithers", "ann@school.test"))
+    assert [doc_id for doc_id, _ in index.search(None, "smi")] == ["5"]
+    assert [doc_id for doc_id, _ in index.search(None, "hannah")] == ["2"]
+
+
+def test_text_function_formats_classes():
+    index = TrigramIndex(
+        "classes", sql_models.Class.class_id, (sql_models.Class.class_number, sql_models.Class.section),
+        text=lambda class_number, section: (f"{class_number}-{section}",)
+    )
+    index.load([("c1", 10, "A"), ("c2", 10, "B"), ("c3", 9, "A")])
+    assert index.search(None, "10-b") == [("c2", ("10-B",))]
+    assert [doc_id for doc_id, _ in index.search(None, "10")] == ["c1", "c2"]
+
+
+def test_build_overlapping_invalidate_stays_stale():
+    index = make_index()
+
+    class Rows:
+        def __init__(self, invalidate=False):
+            self.invalidate = invalidate
+
+        def execute(self, statement):
+            if self.invalidate:
+                # A bulk UPDATE commits while the rebuild reads the table
+                index.invalidate()
+            return self
+
+        def all(self):
+            return [("1", "Anna Bell", "anna@school.test")]
+
+    index.build(Rows(invalidate=True))
+    assert index.stats()["documents"] == 1
+    assert index.built_at is None
+
+    index.build(Rows())
+    assert index.built_at is not None
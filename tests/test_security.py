@@ -0,0 +1,36 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import security
+
+
+def fail():
+    raise ValueError("bad hash")
+
+
+def test_pool_stats_count_cancelled_waiters_and_failures(monkeypatch):
+    monkeypatch.setattr(security, "_stats", {"waiting": 0, "running": 0, "completed": 0, "failed": 0})
+    executor = ThreadPoolExecutor(1)
+    monkeypatch.setattr(security, "get_hash_pool", lambda: executor)
+
+    async def run():
+        # No free slot: the caller waits until it is cancelled
+        monkeypatch.setattr(security, "_slots", asyncio.Semaphore(0))
+        waiter = asyncio.create_task(security._run_on_pool(fail))
+        await asyncio.sleep(0)
+        assert security.hash_pool_stats()["waiting"] == 1
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+        monkeypatch.setattr(security, "_slots", asyncio.Semaphore(1))
+        with pytest.raises(ValueError):
+            await security._run_on_pool(fail)
+        assert await security._run_on_pool(str, 1) == "1"
+
+    asyncio.run(run())
+    executor.shutdown()
+    stats = security.hash_pool_stats()
+    assert (stats["waiting"], stats["running"], stats["completed"], stats["failed"]) == (0, 0, 1, 1)